@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import argparse
+import logging
 from src.gomoku.game.game import Game
 from src.gomoku.config import config
 
@@ -14,6 +15,7 @@ def main():
     if args.depth != config.ai_max_depth:
         config._config['ai']['max_depth'] = args.depth
     
+    logging.basicConfig(level=config.log_level, format='%(message)s')
     game = Game()
     game.play()
 
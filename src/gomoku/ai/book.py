@@ -0,0 +1,316 @@
+"""Opening book: best moves of known positions, looked up without searching.
+
+Positions are keyed by a Zobrist hash canonicalised over the 8 symmetries
+of the board, so one entry covers every rotation and reflection of a
+position. The book is a sorted binary file that is memory-mapped and
+binary-searched, so a lookup costs a handful of reads.
+
+Build or extend a book with ``python -m src.gomoku.ai.book``.
+"""
+import argparse
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from ..board.board import Board
+from ..board.player import PlayerType
+from ..board.zobrist import get_zobrist_table
+from ..game.records import BLACK_WIN, WHITE_WIN, read_records
+from .evaluator import PositionEvaluator
+from .batch_eval import BatchEvaluator
+from .search import MinimaxSearch
+from .candidates import CandidateSet
+from .ordering import MoveOrderer
+from .transposition import TranspositionTable
+from src.gomoku.config import config
+
+Move = Tuple[int, int]
+
+MAGIC = b'GMKBOOK1'
+# Header: magic, board size, number of entries
+HEADER = struct.Struct('<8sII')
+# Entry: canonical key, move row and column in the canonical frame, weight
+ENTRY = struct.Struct('<QBBH')
+MAX_WEIGHT = 0xFFFF
+
+
+def symmetry_maps(size: int) -> List[List[List[Move]]]:
+    """maps[s][row][col]: where each of the 8 board symmetries sends a cell."""
+    last = size - 1
+    transforms = [
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - r, c),
+        lambda r, c: (last - c, last - r),
+    ]
+    return [[[transform(r, c) for c in range(size)] for r in range(size)] for transform in transforms]
+
+
+class Canonicaliser:
+    """Symmetry-canonical position keys and the cell mappings that go with them."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.maps = symmetry_maps(size)
+        self.inverse = [[[None] * size for _ in range(size)] for _ in self.maps]
+        for s, cells in enumerate(self.maps):
+            for r in range(size):
+                for c in range(size):
+                    tr, tc = cells[r][c]
+                    self.inverse[s][tr][tc] = (r, c)
+        self.keys = get_zobrist_table(size).keys
+
+    def key(self, board: Board) -> Tuple[int, int]:
+        """(canonical key, symmetry) of a position: the smallest key over all symmetries."""
+        bits = board.bits
+        stones = [(r, c, value) for value in (1, 2) for r, c in bits.iter_cells(bits.masks[value])]
+        best = None
+        for s, cells in enumerate(self.maps):
+            key = 0
+            for r, c, value in stones:
+                tr, tc = cells[r][c]
+                key ^= self.keys[tr][tc][value]
+            if best is None or key < best[0]:
+                best = (key, s)
+        return best
+
+    def to_canonical(self, move: Move, symmetry: int) -> Move:
+        return self.maps[symmetry][move[0]][move[1]]
+
+    def from_canonical(self, move: Move, symmetry: int) -> Move:
+        return self.inverse[symmetry][move[0]][move[1]]
+
+
+class OpeningBook:
+    """Read-only view of a book file.
+
+    Entries are sorted by key, with the moves of one position ordered by
+    decreasing weight, so the first match of a binary search is the best
+    move.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.count = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an opening book")
+        self.canon = Canonicaliser(self.size)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Tuple[int, Move, int]]:
+        """Every (canonical key, canonical move, weight) entry in file order."""
+        for index in range(self.count):
+            key, row, col, weight = ENTRY.unpack_from(self._data, HEADER.size + index * ENTRY.size)
+            yield key, (row, col), weight
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+    def entries(self, key: int) -> List[Tuple[Move, int]]:
+        """(canonical move, weight) pairs stored for a canonical key, best first."""
+        data = self._data
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if struct.unpack_from('<Q', data, HEADER.size + mid * ENTRY.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        result = []
+        for index in range(lo, self.count):
+            entry_key, row, col, weight = ENTRY.unpack_from(data, HEADER.size + index * ENTRY.size)
+            if entry_key != key:
+                break
+            result.append(((row, col), weight))
+        return result
+
+    def moves(self, board: Board) -> List[Tuple[Move, int]]:
+        """Book moves for ``board`` in its own frame, best first."""
+        if board.size != self.size:
+            return []
+        key, symmetry = self.canon.key(board)
+        return [(self.canon.from_canonical(move, symmetry), weight)
+                for move, weight in self.entries(key)]
+
+    def lookup(self, board: Board) -> Optional[Move]:
+        """The best playable book move for ``board``, or None."""
+        for move, _ in self.moves(board):
+            if board.is_valid_move(*move):
+                return move
+        return None
+
+
+class BookBuilder:
+    """Collects weighted moves per canonical position and writes a book file."""
+
+    def __init__(self, size: int = 15):
+        self.size = size
+        self.canon = Canonicaliser(size)
+        # Canonical key -> canonical move -> weight
+        self.positions: Dict[int, Dict[Move, int]] = {}
+
+    def add(self, board: Board, move: Move, weight: int = 1) -> None:
+        """Record ``move`` as a book move of the position on ``board``."""
+        key, symmetry = self.canon.key(board)
+        moves = self.positions.setdefault(key, {})
+        move = self.canon.to_canonical(move, symmetry)
+        moves[move] = min(MAX_WEIGHT, moves.get(move, 0) + weight)
+
+    def add_game(self, moves: Iterable[Move], winner: Optional[int] = None) -> None:
+        """Record every move of a game, or only the winner's moves when ``winner`` is given."""
+        board = Board(self.size)
+        for move in moves:
+            value = board.current_player.type.value
+            if winner is None or value == winner:
+                self.add(board, move)
+            if not board.make_move(*move):
+                raise ValueError(f"Illegal move {move} in game record")
+
+    def add_book(self, book: OpeningBook) -> None:
+        """Merge the entries of an existing book."""
+        for key, move, weight in book:
+            moves = self.positions.setdefault(key, {})
+            moves[move] = min(MAX_WEIGHT, moves.get(move, 0) + weight)
+
+    def write(self, path: Path) -> int:
+        """Write the book sorted by key; returns the number of entries."""
+        entries = []
+        for key, moves in self.positions.items():
+            for move, weight in moves.items():
+                entries.append((key, -weight, move))
+        entries.sort()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.size, len(entries)))
+            for key, weight, (row, col) in entries:
+                f.write(ENTRY.pack(key, row, col, -weight))
+        return len(entries)
+
+
+class SearchBookGenerator:
+    """Fills a BookBuilder from fixed-depth searches of the opening tree.
+
+    Every distinct single-stone opening (up to symmetry) gets White's best
+    reply among the eight neighbouring cells, as the first-move rule
+    requires. From there, the ``breadth`` most promising Black replies are
+    expanded and White's best move is searched, for ``plies`` White moves.
+    """
+
+    def __init__(self, builder: BookBuilder, depth: int = 4, breadth: int = 8, plies: int = 2):
+        self.builder = builder
+        self.depth = depth
+        self.breadth = breadth
+        self.plies = plies
+        self.board = Board(builder.size)
+        self.evaluator = PositionEvaluator(self.board)
+        self.batch_evaluator = BatchEvaluator(self.board, self.evaluator)
+        self.candidates = CandidateSet(self.board, config.ai_candidate_radius)
+        self.orderer = MoveOrderer(self.board)
+        self.tt = TranspositionTable(config.ai_tt_size)
+        self.searched = 0
+
+    def run(self, log=print) -> None:
+        seen = set()
+        size = self.builder.size
+        for r in range(size):
+            for c in range(size):
+                self.board.make_move(r, c)
+                key, _ = self.builder.canon.key(self.board)
+                if key not in seen:
+                    seen.add(key)
+                    self._expand_white(1, log)
+                self.board.undo_move()
+
+    def _expand_white(self, ply: int, log) -> None:
+        if ply == 1:
+            row, col, _ = self.board.move_history[0]
+            moves = [(row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                     if (dr or dc) and self.board.is_valid_move(row + dr, col + dc)]
+        else:
+            moves = None
+        move = self.search_move(moves)
+        self.searched += 1
+        if move is None:
+            return
+        self.builder.add(self.board, move)
+        log(f"{self.searched:5d} {[(r, c) for r, c, _ in self.board.move_history]} -> {move}")
+        if ply >= self.plies:
+            return
+        self.board.make_move(*move)
+        replies = self.orderer.order(self.candidates.moves(), 0)[:self.breadth]
+        for reply in replies:
+            self.board.make_move(*reply)
+            self._expand_white(ply + 1, log)
+            self.board.undo_move()
+        self.board.undo_move()
+
+    def search_move(self, moves: Optional[List[Move]] = None) -> Optional[Move]:
+        """Best move for the side to move, optionally among ``moves`` only."""
+        maximizing = self.board.current_player.type == PlayerType.WHITE
+        search = MinimaxSearch(self.board, self.evaluator.evaluate, self.depth, tt=self.tt,
+                               candidates=self.candidates, orderer=self.orderer,
+                               batch_evaluator=self.batch_evaluator)
+        if moves is None:
+            return search.minimax(self.depth, float('-inf'), float('inf'), maximizing)[1]
+        best = None
+        for move in moves:
+            # Each move is a root move: its reply is searched as ply 1 of the search
+            self.board.make_move(*move)
+            score, _ = search.minimax(self.depth - 1, float('-inf'), float('inf'), not maximizing)
+            self.board.undo_move()
+            if best is None or (score > best[0] if maximizing else score < best[0]):
+                best = (score, move)
+        return best[1] if best else None
+
+
+def read_games(path: Path) -> Iterable[List[Move]]:
+    """Games from a text file: one game per line, moves as 0-based ``row,col`` pairs."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield [tuple(int(x) for x in move.split(',')) for move in line.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build an opening book')
+    parser.add_argument('--out', type=Path, default=config.ai_book_path, help='Book file to write')
+    parser.add_argument('--extend', action='store_true', help='Keep the entries of an existing book')
+    parser.add_argument('--depth', type=int, default=4, help='Search depth per book position')
+    parser.add_argument('--plies', type=int, default=2, help='White moves per opening line')
+    parser.add_argument('--breadth', type=int, default=8, help='Black replies expanded per position')
+    parser.add_argument('--games', type=Path, help='Add the moves of a game-record file instead of searching')
+    parser.add_argument('--records', type=Path,
+                        help="Add the winner's moves of the games in a binary record file instead of searching")
+    args = parser.parse_args()
+
+    builder = BookBuilder(config.board_size)
+    if args.extend and args.out.exists():
+        book = OpeningBook(args.out)
+        builder.add_book(book)
+        book.close()
+    if args.games:
+        for moves in read_games(args.games):
+            builder.add_game(moves)
+    if args.records:
+        for record in read_records(args.records):
+            builder.add_game(record.moves, record.result if record.result in (BLACK_WIN, WHITE_WIN) else None)
+    if not args.games and not args.records:
+        SearchBookGenerator(builder, args.depth, args.breadth, args.plies).run()
+    count = builder.write(args.out)
+    print(f"Wrote {count} entries for {len(builder.positions)} positions to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+from typing import List, Tuple
+from ..board.board import Board
+
+class CandidateSet:
+    """Empty cells within ``radius`` (Chebyshev distance) of any stone.
+
+    Every cell keeps a count of the stones in its neighbourhood. The counts
+    and a bitmask of candidate cells are updated from the board's make/undo
+    deltas, so undoing a move restores the previous set exactly and reading
+    the candidates never scans the board.
+    """
+
+    def __init__(self, board: Board, radius: int = 2):
+        self.board = board
+        self.radius = radius
+        size = board.size
+        self.neighbours: List[List[List[Tuple[int, int]]]] = [
+            [[(r + dr, c + dc)
+              for dr in range(-radius, radius + 1)
+              for dc in range(-radius, radius + 1)
+              if (dr or dc) and 0 <= r + dr < size and 0 <= c + dc < size]
+             for c in range(size)]
+            for r in range(size)]
+        self.resync()
+        board.add_listener(self)
+        self.attached = True
+
+    def detach(self) -> None:
+        """Stop following the board's moves, e.g. once its game is over."""
+        if self.attached:
+            self.board.remove_listener(self)
+            self.attached = False
+
+    def resync(self) -> None:
+        """Recount every neighbourhood from the board's stones."""
+        size = self.board.size
+        self.counts = [[0] * size for _ in range(size)]
+        self.mask = 0
+        bits = self.board.bits
+        for r, c in bits.iter_cells(bits.occupied):
+            for nr, nc in self.neighbours[r][c]:
+                self.counts[nr][nc] += 1
+        for r in range(size):
+            for c in range(size):
+                if self.counts[r][c]:
+                    self.mask |= 1 << bits.index(r, c)
+        self.mask &= bits.empty
+
+    def on_place(self, row: int, col: int, value: int) -> None:
+        counts = self.counts
+        stride = self.board.bits.stride
+        occupied = self.board.bits.occupied
+        mask = self.mask & ~(1 << (row * stride + col))
+        for r, c in self.neighbours[row][col]:
+            counts[r][c] += 1
+            if counts[r][c] == 1 and not occupied >> (r * stride + c) & 1:
+                mask |= 1 << (r * stride + c)
+        self.mask = mask
+
+    def on_remove(self, row: int, col: int, value: int) -> None:
+        counts = self.counts
+        stride = self.board.bits.stride
+        mask = self.mask
+        for r, c in self.neighbours[row][col]:
+            counts[r][c] -= 1
+            if counts[r][c] == 0:
+                mask &= ~(1 << (r * stride + c))
+        if counts[row][col]:
+            mask |= 1 << (row * stride + col)
+        self.mask = mask
+
+    def moves(self) -> List[Tuple[int, int]]:
+        """Candidate moves in row-major order."""
+        return list(self.board.bits.iter_cells(self.mask))
+
+    def __len__(self) -> int:
+        return bin(self.mask).count('1')
+
+    def __contains__(self, move: Tuple[int, int]) -> bool:
+        return bool(self.mask >> self.board.bits.index(*move) & 1)
@@ -1,75 +1,108 @@
-from typing import Tuple
 from ..board.board import Board
+from .patterns import FIVE, STONE_SCORES, get_pattern_table
+
+# Score of a single stone of a five; the threshold for a won position
+WIN_SCORE = STONE_SCORES[FIVE]
+# Upper bound on memoised line scores before the cache is flushed
+LINE_CACHE_LIMIT = 1 << 20
+
+
+def score_line(black: int, white: int, length: int) -> int:
+    """Score one line, given as per-player bit masks, from White's point of view."""
+    table = get_pattern_table()
+    return table.line_score(white, black, length) - table.line_score(black, white, length)
+
 
 class PositionEvaluator:
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, incremental: bool = True):
+        """Create an evaluator for ``board``.
+
+        In incremental mode the evaluator keeps a score per board line and
+        listens to the board's make/undo deltas, so only the four lines
+        through a changed cell are rescored and ``evaluate()`` is O(1).
+        Lines are read from the board's bitboard and scored with the
+        pattern table, memoised by line contents. Otherwise every call falls back to the full-board
+        scan.
+        """
         self.board = board
-    
+        self.incremental = incremental
+        self.lines = board.bits.lines
+        self.cell_lines = [[[line_id for line_id, _ in board.bits.cell_lines[r][c]]
+                            for c in range(board.size)] for r in range(board.size)]
+        # Line contents (black bits, white bits, length) packed into one int -> line score
+        self._line_cache = {}
+        self.line_scores = [0] * len(self.lines)
+        self.total = 0
+        self.attached = incremental
+        if incremental:
+            self.resync()
+            board.add_listener(self)
+
     def evaluate(self) -> int:
         """Evaluate the current board position."""
+        if self.incremental:
+            return self.total
+        return self.evaluate_full()
+
+    def resync(self) -> None:
+        """Rescore every line, e.g. after the board array was edited directly."""
+        self.board.sync()
+        for line_id in range(len(self.lines)):
+            self.line_scores[line_id] = self._score_line(line_id)
+        self.total = sum(self.line_scores)
+
+    def detach(self) -> None:
+        """Stop following the board's moves, e.g. once its game is over."""
+        if self.attached:
+            self.board.remove_listener(self)
+            self.attached = False
+
+    def verify(self) -> bool:
+        """Check the incremental score against the full-board scan."""
+        return self.total == self.evaluate_full()
+
+    def on_place(self, row: int, col: int, value: int) -> None:
+        self._update_cell(row, col)
+
+    def on_remove(self, row: int, col: int, value: int) -> None:
+        self._update_cell(row, col)
+
+    def _update_cell(self, row: int, col: int) -> None:
+        for line_id in self.cell_lines[row][col]:
+            new_score = self._score_line(line_id)
+            self.total += new_score - self.line_scores[line_id]
+            self.line_scores[line_id] = new_score
+
+    def _score_line(self, line_id: int) -> int:
+        bits = self.board.bits
+        black = bits.line_bits[1][line_id]
+        white = bits.line_bits[2][line_id]
+        length = bits.line_lengths[line_id]
+        key = black | white << 16 | length << 32
+        score = self._line_cache.get(key)
+        if score is None:
+            if len(self._line_cache) >= LINE_CACHE_LIMIT:
+                self._line_cache.clear()
+            score = score_line(black, white, length)
+            self._line_cache[key] = score
+        return score
+
+    def evaluate_full(self) -> int:
+        """Evaluate the current board position by scanning every line (reference mode).
+
+        Lines are read straight from the board array instead of the bitboard,
+        so this is an independent check of the incremental score.
+        """
+        board = self.board.board.tolist()
         score = 0
-        directions = [(1,0), (0,1), (1,1), (1,-1)]  # horizontal, vertical, diagonal
-        
-        # Evaluate for both players
-        for player in [1, 2]:
-            multiplier = 1 if player == 2 else -1  # AI is player 2
-            
-            for i in range(self.board.size):
-                for j in range(self.board.size):
-                    if self.board.board[i][j] == player:
-                        # Check each direction
-                        for dr, dc in directions:
-                            # Count consecutive pieces
-                            count = 1
-                            blocked = 0
-                            
-                            # Check forward
-                            for k in range(1, 5):
-                                r, c = i + dr*k, j + dc*k
-                                if 0 <= r < self.board.size and 0 <= c < self.board.size:
-                                    if self.board.board[r][c] == player:
-                                        count += 1
-                                    elif self.board.board[r][c] != 0:
-                                        blocked += 1
-                                        break
-                                    else:
-                                        break
-                                else:
-                                    blocked += 1
-                                    break
-                            
-                            # Check backward
-                            for k in range(1, 5):
-                                r, c = i - dr*k, j - dc*k
-                                if 0 <= r < self.board.size and 0 <= c < self.board.size:
-                                    if self.board.board[r][c] == player:
-                                        count += 1
-                                    elif self.board.board[r][c] != 0:
-                                        blocked += 1
-                                        break
-                                    else:
-                                        break
-                                else:
-                                    blocked += 1
-                                    break
-                            
-                            # Score based on consecutive pieces and blocked ends
-                            if count >= 5:
-                                score += 100000 * multiplier  # Win
-                            elif count == 4:
-                                if blocked == 0:
-                                    score += 10000 * multiplier  # Open four
-                                elif blocked == 1:
-                                    score += 1000 * multiplier  # Blocked four
-                            elif count == 3:
-                                if blocked == 0:
-                                    score += 1000 * multiplier  # Open three
-                                elif blocked == 1:
-                                    score += 100 * multiplier  # Blocked three
-                            elif count == 2:
-                                if blocked == 0:
-                                    score += 100 * multiplier  # Open two
-                                elif blocked == 1:
-                                    score += 10 * multiplier  # Blocked two
-        
-        return score 
\ No newline at end of file
+        for cells in self.lines:
+            black = white = 0
+            for pos, (r, c) in enumerate(cells):
+                value = board[r][c]
+                if value == 1:
+                    black |= 1 << pos
+                elif value == 2:
+                    white |= 1 << pos
+            if black or white:
+                score += score_line(black, white, len(cells))
+        return score
@@ -0,0 +1,114 @@
+from typing import List, Optional, Tuple
+from ..board.board import Board
+from .patterns import FIVE, FOUR, OPEN_THREE, PATTERN_SCORES, REACH, get_pattern_table, window_key
+
+Move = Tuple[int, int]
+
+# Tiers used to rank moves before the history/pattern ordering
+TT_TIER = 4
+WIN_TIER = 3
+BLOCK_TIER = 2
+KILLER_TIER = 1
+
+
+class MoveOrderer:
+    """Ranks the moves of a node so alpha-beta finds cutoffs early.
+
+    Moves are tried in this order: the transposition table / PV move,
+    moves that complete five, moves that stop the opponent's five, the
+    killer moves of the current ply, and then the rest ranked by the
+    history table with a cheap local pattern score as tie-breaker.
+    """
+
+    def __init__(self, board: Board, max_ply: int = 64):
+        self.board = board
+        self.max_ply = max_ply
+        self.killers: List[List[Optional[Move]]] = [[None, None] for _ in range(max_ply)]
+        # history[player value][row][col]: accumulated cutoff credit
+        self.history = [[[0] * board.size for _ in range(board.size)] for _ in range(3)]
+        self.patterns = get_pattern_table()
+
+    def new_search(self) -> None:
+        """Forget killers and age the history table before a new search."""
+        self.killers = [[None, None] for _ in range(self.max_ply)]
+        for table in self.history:
+            for row in table:
+                for c in range(len(row)):
+                    row[c] >>= 1
+
+    def order(self, moves: List[Move], ply: int, tt_move: Optional[Move] = None) -> List[Move]:
+        """Return ``moves`` sorted from most to least promising."""
+        player = self.board.current_player.type.value
+        history = self.history[player]
+        killers = self.killers[ply] if ply < self.max_ply else (None, None)
+        keyed = []
+        for move in moves:
+            attack, defence, wins, blocks = self.threat_score(move, player)
+            if move == tt_move:
+                tier = TT_TIER
+            elif wins:
+                tier = WIN_TIER
+            elif blocks:
+                tier = BLOCK_TIER
+            elif move == killers[0] or move == killers[1]:
+                tier = KILLER_TIER
+            else:
+                tier = 0
+            keyed.append((tier, history[move[0]][move[1]], attack + defence, move))
+        keyed.sort(key=lambda item: item[:3], reverse=True)
+        return [item[3] for item in keyed]
+
+    def record_cutoff(self, move: Move, ply: int, depth: int) -> None:
+        """Credit a move that caused a beta cutoff for the side to move."""
+        if ply < self.max_ply:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        player = self.board.current_player.type.value
+        self.history[player][move[0]][move[1]] += depth * depth
+
+    def threat_score(self, move: Move, player: int) -> Tuple[int, int, bool, bool]:
+        """Local pattern score of playing ``move`` for ``player``.
+
+        Returns (attack, defence, wins, blocks): the pattern scores the move
+        creates for ``player``, the pattern scores the opponent would get on
+        the same cell, and whether it completes five / stops the opponent's
+        five. Both sides are read from the pattern table.
+        """
+        bits = self.board.bits
+        key_classes = self.patterns.key_classes
+        outside = self.patterns.outside
+        own_bits = bits.line_bits[player]
+        opp_bits = bits.line_bits[3 - player]
+        row, col = move
+        attack = defence = 0
+        wins = blocks = False
+        for line_id, pos in bits.cell_lines[row][col]:
+            edge = outside[bits.line_lengths[line_id]]
+            own = own_bits[line_id] << REACH
+            opp = opp_bits[line_id] << REACH
+            shape = key_classes[window_key(own, opp | edge, pos)]
+            wins |= shape == FIVE
+            attack += PATTERN_SCORES[shape]
+            shape = key_classes[window_key(opp, own | edge, pos)]
+            blocks |= shape == FIVE
+            defence += PATTERN_SCORES[shape]
+        return attack, defence, wins, blocks
+
+    def is_forcing(self, move: Move, player: int) -> bool:
+        """Whether ``move`` makes an open three or better for ``player``, or takes
+        a cell where the opponent would make a four."""
+        bits = self.board.bits
+        key_classes = self.patterns.key_classes
+        outside = self.patterns.outside
+        own_bits = bits.line_bits[player]
+        opp_bits = bits.line_bits[3 - player]
+        for line_id, pos in bits.cell_lines[move[0]][move[1]]:
+            edge = outside[bits.line_lengths[line_id]]
+            own = own_bits[line_id] << REACH
+            opp = opp_bits[line_id] << REACH
+            if (key_classes[window_key(own, opp | edge, pos)] >= OPEN_THREE
+                    or key_classes[window_key(opp, own | edge, pos)] >= FOUR):
+                return True
+        return False
@@ -0,0 +1,212 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from ..board.board import Board
+from ..board.player import PlayerType
+from .evaluator import PositionEvaluator
+from .batch_eval import BatchEvaluator
+from .search import MinimaxSearch, SearchTimeout, mate_score
+from .progress import ProgressTracker
+from .rules import GameRules
+from .candidates import CandidateSet
+from .ordering import MoveOrderer
+from .transposition import TranspositionTable
+from src.gomoku.config import config
+
+Move = Tuple[int, int]
+History = List[Tuple[int, int, int]]
+
+# Per-process state of a pool worker
+_shared_alpha = None
+_worker = None
+
+
+class _WorkerState:
+    """A private board and search helpers kept alive between tasks in one worker."""
+
+    def __init__(self, history: History):
+        self.board = Board()
+        for row, col, value in history:
+            self.board.push((row, col), value)
+        self.history = list(history)
+        self.evaluator = PositionEvaluator(self.board)
+        self.batch_evaluator = BatchEvaluator(self.board, self.evaluator) if config.ai_batch_eval else None
+        self.candidates = CandidateSet(self.board, config.ai_candidate_radius)
+        self.orderer = MoveOrderer(self.board)
+        self.tt = TranspositionTable(config.ai_tt_size)
+
+    def set_position(self, history: History) -> None:
+        """Bring the private board to ``history`` by undoing/replaying the difference."""
+        common = 0
+        while (common < len(self.history) and common < len(history)
+               and self.history[common] == history[common]):
+            common += 1
+        while len(self.board.move_history) > common:
+            self.board.pop()
+        for row, col, value in history[common:]:
+            self.board.push((row, col), value)
+        self.history = list(history)
+
+
+def _init_worker(shared_alpha) -> None:
+    global _shared_alpha
+    _shared_alpha = shared_alpha
+
+
+def _ping() -> bool:
+    return True
+
+
+def _search_root_move(history: History, move: Move, depth: int,
+                      deadline: Optional[float]) -> Tuple[Move, Optional[float], float, int, int]:
+    """Search one root move in a worker.
+
+    Returns (move, score or None if the deadline passed, bound used, leaf nodes,
+    nodes). The shared bound is the best root score so far from the point of
+    view of the side to move (negated for Black), and the score is exact
+    when it beats the bound it was searched with.
+    """
+    global _worker
+    if _worker is None:
+        _worker = _WorkerState(history)
+    else:
+        _worker.set_position(history)
+    board = _worker.board
+    maximizing = board.current_player.type == PlayerType.WHITE
+    sign = 1 if maximizing else -1
+    # One below the best score so far, so a move that ties it is scored exactly and
+    # ties are broken by root order as in the serial search (scores are integers)
+    bound = _shared_alpha.value - 1
+    # Searched as the subtree below ply 1 of a depth ``depth`` search, so plies match a serial search
+    search = MinimaxSearch(board, _worker.evaluator.evaluate, depth, tt=_worker.tt,
+                           candidates=_worker.candidates, orderer=_worker.orderer,
+                           deadline=deadline, batch_evaluator=_worker.batch_evaluator,
+                           quiescence_depth=config.ai_quiescence_depth,
+                           quiescence_nodes=config.ai_quiescence_nodes,
+                           lmr_moves=config.ai_lmr_moves,
+                           null_move_reduction=config.ai_null_move_reduction)
+    base = len(board.move_history)
+    score = None
+    try:
+        side = board.current_player.value
+        board.push(move)
+        if board.bits.check_win(move[0], move[1], side):
+            score = mate_score(side, 1)
+        elif maximizing:
+            score, _ = search.minimax(depth - 1, bound, float('inf'), False)
+        else:
+            score, _ = search.minimax(depth - 1, float('-inf'), -bound, True)
+    except SearchTimeout:
+        score = None
+    finally:
+        while len(board.move_history) > base:
+            board.pop()
+    if score is not None:
+        with _shared_alpha.get_lock():
+            if sign * score > _shared_alpha.value:
+                _shared_alpha.value = sign * score
+    return move, score, bound, search.nodes_evaluated, search.nodes
+
+
+class ParallelRootSearch:
+    """Root-split search: every root move is searched by a worker process.
+
+    Workers publish the best score found so far through a shared value and
+    read it as their bound when they start a root move, so later root moves
+    are searched with a tighter window. Exposes the same result attributes
+    as MinimaxSearch (``best_root``, ``root_scores``, ``nodes_evaluated``, ``nodes``).
+    """
+
+    def __init__(self, board: Board, pool: 'RootSearchPool', depth: int,
+                 candidates: Optional[CandidateSet] = None,
+                 orderer: Optional[MoveOrderer] = None,
+                 deadline: Optional[float] = None,
+                 progress: Optional[ProgressTracker] = None):
+        self.board = board
+        self.pool = pool
+        self.depth = depth
+        self.rules = GameRules(board, candidates)
+        self.orderer = orderer
+        self.deadline = deadline
+        self.progress = progress
+        self.nodes_evaluated = 0
+        self.nodes = 0
+        # Counted inside the worker processes and not collected
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.eval_time = 0.0
+        self.qnodes = 0
+        self.lmr_reductions = 0
+        self.lmr_researches = 0
+        self.null_tries = 0
+        self.null_cutoffs = 0
+        self.root_scores: Dict[Move, float] = {}
+        self.best_root: Optional[Tuple[float, Move]] = None
+        self.maximizing = True  # Whether the side to move at the root is White
+
+    def search(self, root_order: Optional[List[Move]] = None) -> Tuple[float, Move]:
+        """Search all root moves in parallel. Raises SearchTimeout like MinimaxSearch."""
+        moves = self.rules.get_valid_moves()
+        if not moves:
+            return 0, None
+        if self.orderer is not None:
+            moves = self.orderer.order(moves, 0)
+        if root_order:
+            preferred = [move for move in root_order if move in moves]
+            moves = preferred + [move for move in moves if move not in preferred]
+        rank = {move: i for i, move in enumerate(moves)}
+        self.maximizing = self.board.current_player.type == PlayerType.WHITE
+        sign = 1 if self.maximizing else -1
+        history = [(r, c, p.type.value) for r, c, p in self.board.move_history]
+
+        self.pool.shared_alpha.value = float('-inf')
+        futures = [self.pool.executor.submit(_search_root_move, history, move, self.depth, self.deadline)
+                   for move in moves]
+        # Rank results by score, then exactness, then root order for a deterministic choice
+        best_key = None
+        timed_out = False
+        for future in as_completed(futures):
+            move, score, bound, leaves, nodes = future.result()
+            self.nodes_evaluated += leaves
+            self.nodes += nodes
+            if self.progress is not None:
+                self.progress.add_nodes(nodes)
+            if score is None:
+                timed_out = True
+                continue
+            self.root_scores[move] = score
+            key = (sign * score, sign * score > bound, -rank[move])
+            if best_key is None or key > best_key:
+                best_key = key
+                self.best_root = (score, move)
+            if self.progress is not None:
+                best_score, best_move = self.best_root
+                self.progress.update(len(self.root_scores), self.depth, best_move, best_score)
+        if timed_out:
+            raise SearchTimeout()
+        return self.best_root
+
+    def ranked_root_moves(self) -> List[Move]:
+        """Root moves searched so far, best first for the side to move."""
+        return sorted(self.root_scores, key=self.root_scores.get, reverse=self.maximizing)
+
+    def get_pv(self) -> List[Move]:
+        return [self.best_root[1]] if self.best_root else []
+
+
+class RootSearchPool:
+    """A process pool plus the shared root bound used by ParallelRootSearch."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.shared_alpha = multiprocessing.Value('d', float('-inf'))
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(self.shared_alpha,))
+
+    def warm_up(self) -> None:
+        """Start every worker process ahead of the first search."""
+        for future in [self.executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
@@ -0,0 +1,185 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.gomoku.config import config
+
+# Pattern classes of a stone along one line, weakest first
+NONE = 0
+TWO = 1          # Two moves from a four
+OPEN_TWO = 2     # Two moves from an open four
+THREE = 3        # One move from a four
+OPEN_THREE = 4   # One move from an open four
+FOUR = 5         # One move from five, with a single completing cell
+OPEN_FOUR = 6    # Two or more completing cells: five cannot be stopped
+FIVE = 7
+PATTERN_NAMES = ['none', 'two', 'open two', 'three', 'open three', 'four', 'open four', 'five']
+
+# Score of a whole shape and the number of stones it is made of. Every stone
+# of a shape scores ``PATTERN_SCORES // PATTERN_STONES``, so a shape counts
+# once however many stones it has.
+PATTERN_SCORES = [0, 12, 120, 120, 1200, 1200, 12000, 500000]
+PATTERN_STONES = [1, 2, 2, 3, 3, 4, 4, 5]
+STONE_SCORES = [score // stones for score, stones in zip(PATTERN_SCORES, PATTERN_STONES)]
+
+REACH = 4  # A window holds the stone and REACH cells on either side
+# A window's eight neighbour cells in code order: offsets -4..-1, then +1..+4
+OFFSETS = list(range(-REACH, 0)) + list(range(1, REACH + 1))
+# Neighbour codes, from the point of view of the stone's owner
+EMPTY, OWN, BLOCKED = 0, 1, 2  # BLOCKED: an opponent stone or off the board
+WINDOW_BITS = 2 * REACH + 1
+WINDOW_MASK = (1 << WINDOW_BITS) - 1
+MAX_LINE = 64  # Longest line the scalar lookups accept
+
+# Bump when the classification changes so stale disk caches are rebuilt
+TABLE_VERSION = 2
+
+
+@lru_cache(maxsize=None)
+def _classify(codes: Tuple[int, ...]) -> int:
+    """Pattern class of the centre stone of a window of neighbour codes.
+
+    Shapes are defined by how many moves they are from five through the
+    centre stone, so split shapes such as ``X_XX`` are classed like
+    ``XXX``. Every five through the centre lies inside the window, so the
+    window is enough to decide the class.
+    """
+    cells = dict(zip(OFFSETS, codes))
+    cells[0] = OWN
+    if _run_through_centre(cells) >= 5:
+        return FIVE
+    completions = 0
+    best = NONE
+    for k, code in enumerate(codes):
+        if code != EMPTY:
+            continue
+        grown = codes[:k] + (OWN,) + codes[k + 1:]
+        after = _classify(grown)
+        if after == FIVE:
+            completions += 1
+        else:
+            best = max(best, after)
+    if completions >= 2:
+        return OPEN_FOUR
+    if completions == 1:
+        return FOUR
+    # One more stone turns an open four into an open three, a four into a three, ...
+    return {OPEN_FOUR: OPEN_THREE, FOUR: THREE, OPEN_THREE: OPEN_TWO, THREE: TWO}.get(best, NONE)
+
+
+def _run_through_centre(cells: Dict[int, int]) -> int:
+    count = 1
+    for step in (1, -1):
+        offset = step
+        while abs(offset) <= REACH and cells[offset] == OWN:
+            count += 1
+            offset += step
+    return count
+
+
+def build_tables() -> Dict[str, np.ndarray]:
+    """Compute the pattern tables from scratch.
+
+    ``classes`` is indexed by the base-3 window index. ``key_classes`` is
+    the same table indexed by the packed key ``own | blocked << 9`` of two
+    9-bit windows (see ``window_key``); the centre bit is ignored and cells
+    set in both windows read as own.
+    """
+    classes = np.zeros(3 ** len(OFFSETS), dtype=np.int8)
+    for index in range(len(classes)):
+        codes = tuple((index // 3 ** k) % 3 for k in range(len(OFFSETS)))
+        classes[index] = _classify(codes)
+    window = 2 * REACH + 1
+    bit_positions = np.array([offset + REACH for offset in OFFSETS])
+    keys = np.arange(1 << (2 * window), dtype=np.int64)
+    own = (keys[:, None] >> bit_positions) & 1
+    blocked = (keys[:, None] >> (bit_positions + window)) & 1
+    digits = np.where(own == 1, OWN, np.where(blocked == 1, BLOCKED, EMPTY))
+    key_classes = classes[digits @ (3 ** np.arange(len(OFFSETS)))]
+    return {'version': np.array([TABLE_VERSION]), 'classes': classes, 'key_classes': key_classes}
+
+
+def load_tables(path: Optional[Path] = None) -> Dict[str, np.ndarray]:
+    """Read the pattern tables from ``path``, building and saving them if needed."""
+    if path is not None and path.exists():
+        try:
+            with np.load(path) as data:
+                if int(data['version'][0]) == TABLE_VERSION:
+                    return {name: data[name] for name in data.files}
+        except (OSError, ValueError, KeyError):
+            pass  # Unreadable or stale cache: rebuild it below
+    tables = build_tables()
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(path, **tables)
+        except OSError:
+            pass  # A read-only location only costs a rebuild next time
+    return tables
+
+
+class PatternTable:
+    """Lookup tables from a stone's line window to its pattern class and score.
+
+    Built once per process (see ``get_pattern_table``) from the on-disk
+    cache. ``classes``/``stone_scores`` are NumPy arrays indexed by the
+    base-3 window index for vectorized use; ``key_classes``/``key_scores``
+    are plain lists indexed by ``window_key`` for the scalar paths.
+
+    Scalar lookups work on padded lines: a line's bit masks shifted up by
+    REACH, with the REACH cells beyond either end marked as blocked
+    (``outside[length]``), so every cell has a full window.
+    """
+
+    def __init__(self, tables: Dict[str, np.ndarray]):
+        self.classes = tables['classes'].astype(np.int64)
+        self.stone_scores = np.array(STONE_SCORES, dtype=np.int64)[self.classes]
+        self.key_classes: List[int] = tables['key_classes'].tolist()
+        self.key_scores: List[int] = [STONE_SCORES[c] for c in self.key_classes]
+        self.outside = [((1 << (length + 2 * REACH)) - 1) & ~(((1 << length) - 1) << REACH)
+                        for length in range(MAX_LINE + 1)]
+
+    def line_classes(self, own: int, opponent: int, length: int) -> List[Tuple[int, int]]:
+        """(position, class) of every stone of ``own`` on one line."""
+        padded_own = own << REACH
+        padded_blocked = opponent << REACH | self.outside[length]
+        result = []
+        stones = own
+        while stones:
+            pos = (stones & -stones).bit_length() - 1
+            stones &= stones - 1
+            result.append((pos, self.key_classes[window_key(padded_own, padded_blocked, pos)]))
+        return result
+
+    def line_score(self, own: int, opponent: int, length: int) -> int:
+        """Summed stone scores of ``own`` on one line."""
+        padded_own = own << REACH
+        padded_blocked = opponent << REACH | self.outside[length]
+        key_scores = self.key_scores
+        score = 0
+        stones = own
+        while stones:
+            pos = (stones & -stones).bit_length() - 1
+            stones &= stones - 1
+            score += key_scores[window_key(padded_own, padded_blocked, pos)]
+        return score
+
+
+def window_key(padded_own: int, padded_blocked: int, pos: int) -> int:
+    """Packed table key of the window centred on cell ``pos`` of a padded line.
+
+    The cell itself is not part of the key, so the same key gives the class
+    of a stone already at ``pos`` or of one about to be played there.
+    """
+    return (padded_own >> pos & WINDOW_MASK) | (padded_blocked >> pos & WINDOW_MASK) << WINDOW_BITS
+
+
+_table: Optional[PatternTable] = None
+
+
+def get_pattern_table() -> PatternTable:
+    """The process-wide pattern table, loaded from the configured cache file."""
+    global _table
+    if _table is None:
+        _table = PatternTable(load_tables(config.ai_pattern_cache))
+    return _table
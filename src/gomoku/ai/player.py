@@ -1,21 +1,77 @@
-from typing import Tuple
+from typing import List, Optional, Tuple
+import logging
 import time
 import random
 from ..board.board import Board
 from ..board.player import Player, PlayerType
 from .evaluator import PositionEvaluator
-from .search import MinimaxSearch
+from .batch_eval import BatchEvaluator
+from .search import MATE_BOUND, MinimaxSearch, SearchTimeout
 from .progress import ProgressTracker
+from .transposition import TranspositionTable
+from .candidates import CandidateSet
+from .ordering import MoveOrderer
+from .parallel import ParallelRootSearch, RootSearchPool
+from .threats import ThreatSolver
+from .book import OpeningBook
+from .ponder import Ponderer
+from .stats import SearchStats, move_metrics
+from ..game.time_manager import TimeManager
 from src.gomoku.config import config
 
+logger = logging.getLogger(__name__)
+
+# Assumed ratio between the durations of consecutive depths until two have been timed
+DEFAULT_DEPTH_GROWTH = 5.0
+# Half-width of the first aspiration window around the previous depth's score;
+# it grows fourfold on every failure and opens fully past ASPIRATION_MAX
+ASPIRATION_WINDOW = 150
+ASPIRATION_MAX = 20000
+# Share of the soft time budget spent before starting another depth: less when
+# the reply is forced or the best move has held for three depths, more for
+# every change of the best move over the last three depths
+FORCED_TIME_SCALE = 0.2
+STABLE_TIME_SCALE = 0.6
+UNSTABLE_TIME_SCALE = 1.0
+
 class AIPlayer:
-    def __init__(self, board: Board, depth: int = 3, time_limit: float = 10.0):
+    def __init__(self, board: Board, depth: int = 3, time_limit: float = 10.0,
+                 workers: Optional[int] = None, ponder: Optional[bool] = None,
+                 clock: Optional[TimeManager] = None):
         self.board = board
         self.depth = depth
         self.time_limit = time_limit  # Time limit in seconds
-        self.player = Player(PlayerType.WHITE)  # AI is always white
-        self.evaluator = PositionEvaluator(board)
+        # Game clock the time per move is budgeted from; without one every
+        # move gets ``time_limit``
+        self.clock = clock
+        self.player = Player(PlayerType.WHITE)  # Side in a human game; get_move plays the side to move
+        self.evaluator = PositionEvaluator(board, incremental=config.ai_incremental_eval)
+        self.batch_evaluator = BatchEvaluator(board, self.evaluator) if config.ai_batch_eval else None
         self.progress = ProgressTracker()
+        # Kept across depths and moves; keys cover the whole position
+        self.tt = TranspositionTable(config.ai_tt_size)
+        self.candidates = CandidateSet(board, config.ai_candidate_radius)
+        self.orderer = MoveOrderer(board)
+        # Proves forced wins/defences ahead of the full-width search
+        self.threat_solver = ThreatSolver(
+            board, max_nodes=config.ai_threat_max_nodes,
+            max_threes=config.ai_threat_max_threes) if config.ai_threat_search else None
+        self.book = OpeningBook(config.ai_book_path) if config.ai_book and config.ai_book_path.exists() else None
+        # Root-parallel search when more than one worker is configured
+        self.workers = workers if workers is not None else config.ai_workers
+        self.pool: Optional[RootSearchPool] = None
+        # Searches the opponent's likely replies between moves, sharing the TT
+        ponder = config.ai_ponder if ponder is None else ponder
+        self.ponderer = Ponderer(self.tt, depth, replies=config.ai_ponder_replies,
+                                 candidate_radius=config.ai_candidate_radius,
+                                 quiescence_depth=config.ai_quiescence_depth,
+                                 quiescence_nodes=config.ai_quiescence_nodes,
+                                 lmr_moves=config.ai_lmr_moves,
+                                 null_move_reduction=config.ai_null_move_reduction) if ponder else None
+        self.last_pv: List[Tuple[int, int]] = []  # Principal variation of the last search
+        # depth, nodes, time, move and score of every depth the last search completed
+        self.iterations: List[dict] = []
+        self.stats = SearchStats()  # Statistics of the last move
         self.first_move_made = False
         self.last_score = None  # Store the last evaluation score
     
@@ -32,106 +88,307 @@ class AIPlayer:
         self.last_score = None  # No score for first move
         return 7, 7  # Fallback to center
     
-    def _search_with_time_limit(self, start_depth: int = 2) -> Tuple[float, Tuple[int, int]]:
-        """Perform iterative deepening search with time limit and early cutoff."""
+    def _search_with_time_limit(self, start_depth: int = 2,
+                                time_limit: Optional[float] = None,
+                                root_order: Optional[List[Tuple[int, int]]] = None,
+                                soft_limit: Optional[float] = None) -> Tuple[float, Tuple[int, int]]:
+        """Perform iterative deepening search with time limit and early cutoff.
+        
+        Every iteration runs against a hard deadline and aborts mid-search
+        when it passes; the best root move searched to full depth is kept.
+        Each depth is seeded with the previous depth's root move ranking
+        (the PV move first) and the transposition table, and no new depth is
+        started when its predicted duration exceeds the remaining budget.
+        ``time_limit`` defaults to the player's per-move limit; ``root_order``
+        seeds the first depth, e.g. from a pondered search. With
+        ``soft_limit`` set, no new depth is started once the time used passes
+        it, scaled by ``_time_scale``.
+        """
         best_score = float('-inf')
         best_move = None
-        current_depth = start_depth
+        current_depth = min(start_depth, self.depth)  # A depth-1 player still searches
         start_time = time.time()
+        deadline = start_time + (self.time_limit if time_limit is None else time_limit)
         max_depth = self.depth  # Use the configured depth
         win_threshold = config.win_score_threshold
         lose_threshold = config.lose_score_threshold
+        iteration_times = []
+        self.iterations = []
         
-        print(f"\nStarting AI search at depth {current_depth}...")
+        stats = self.stats
+        self.tt.reset_stats()
+        self.orderer.new_search()
         
-        # First try to get at least one move at minimum depth
-        try:
-            search = MinimaxSearch(
-                self.board,
-                lambda: self.evaluator.evaluate(),
-                current_depth
-            )
-            
-            def evaluator_with_progress():
-                self.progress.increment_nodes()
-                return self.evaluator.evaluate()
-            
-            search.evaluator = evaluator_with_progress
+        logger.debug("Starting AI search at depth %d", current_depth)
+        
+        while current_depth <= max_depth:
+            if self.workers > 1:
+                search = ParallelRootSearch(
+                    self.board,
+                    self._get_pool(),
+                    current_depth,
+                    candidates=self.candidates,
+                    orderer=self.orderer,
+                    deadline=deadline,
+                    progress=self.progress
+                )
+            else:
+                search = MinimaxSearch(
+                    self.board,
+                    self.evaluator.evaluate,
+                    current_depth,
+                    tt=self.tt,
+                    candidates=self.candidates,
+                    orderer=self.orderer,
+                    deadline=deadline,
+                    batch_evaluator=self.batch_evaluator,
+                    progress=self.progress,
+                    quiescence_depth=config.ai_quiescence_depth,
+                    quiescence_nodes=config.ai_quiescence_nodes,
+                    lmr_moves=config.ai_lmr_moves,
+                    null_move_reduction=config.ai_null_move_reduction
+                )
+            iteration_start = time.time()
+            try:
+                # Scores alternate with the parity of the depth, so the window is
+                # centred on the last depth of the same parity
+                previous = self.iterations[-2]['score'] if len(self.iterations) >= 2 else None
+                score, move = self._aspiration_search(search, root_order, previous)
+            except SearchTimeout:
+                stats.add_search(search)
+                stats.timed_out = True
+                if search.best_root is not None:
+                    best_score, best_move = search.best_root
+                    logger.debug("Depth %d stopped at the deadline; best fully searched root move: %s (%s)",
+                                 current_depth, best_move, best_score)
+                else:
+                    logger.debug("Depth %d stopped at the deadline before a root move finished", current_depth)
+                break
+            except Exception:
+                logger.exception("Search failed at depth %d", current_depth)
+                if best_move is None:
+                    valid_moves = self.board.get_valid_moves()
+                    if valid_moves:
+                        best_move = valid_moves[0]
+                        best_score = 0
+                        logger.warning("Using fallback move: %s", best_move)
+                break
+            iteration_times.append(time.time() - iteration_start)
+            stats.add_search(search)
             
-            score, move = search.search()
             if move:
                 best_score = score
                 best_move = move
-                print(f"✓ Initial depth {current_depth} completed:")
-                print(f"  - Best move: {move}")
-                print(f"  - Score: {score}")
-                print(f"  - Time used: {time.time() - start_time:.2f}s")
+                self.iterations.append({'depth': current_depth, 'nodes': search.nodes,
+                                        'time': iteration_times[-1], 'move': move, 'score': score})
+                stats.depth = current_depth
+                stats.depth_times.append((current_depth, iteration_times[-1]))
+                self.progress.update(len(search.root_scores), current_depth, move, score)
+                self.last_pv = search.get_pv()
+                logger.debug("Depth %d completed: move %s, score %s, PV %s, %d nodes, %.2fs used",
+                             current_depth, move, score, self.last_pv, search.nodes,
+                             time.time() - start_time)
                 # Early cutoff if score is decisive
                 if best_score >= win_threshold or best_score <= lose_threshold:
-                    print(f"Early cutoff: Decisive score ({best_score}) found at depth {current_depth}.")
-                    return best_score, best_move
-        except Exception as e:
-            print(f"× Error at initial depth {current_depth}: {str(e)}")
-            valid_moves = self.board.get_valid_moves()
-            if valid_moves:
-                best_move = valid_moves[0]
-                print(f"Using fallback move: {best_move}")
-            return 0, best_move
-        
-        # Now try deeper searches if we have time
-        while time.time() - start_time < self.time_limit and current_depth < max_depth:
-            current_depth += 1
-            print(f"\nTrying depth {current_depth}...")
+                    logger.debug("Decisive score %s at depth %d, stopping search", best_score, current_depth)
+                    break
             
-            try:
-                search = MinimaxSearch(
-                    self.board,
-                    lambda: self.evaluator.evaluate(),
-                    current_depth
-                )
-                search.evaluator = evaluator_with_progress
-                
-                score, move = search.search()
-                if move:
-                    best_score = score
-                    best_move = move
-                    print(f"✓ Depth {current_depth} completed:")
-                    print(f"  - Best move: {move}")
-                    print(f"  - Score: {score}")
-                    print(f"  - Time used: {time.time() - start_time:.2f}s")
-                    # Early cutoff if score is decisive
-                    if best_score >= win_threshold or best_score <= lose_threshold:
-                        print(f"Early cutoff: Decisive score ({best_score}) found at depth {current_depth}.")
-                        break
-                    time_left = self.time_limit - (time.time() - start_time)
-                    if time_left < 2.0:
-                        print(f"\nNot enough time ({time_left:.2f}s) for depth {current_depth + 1}, stopping search.")
-                        break
-                    print(f"\nTime remaining: {time_left:.2f}s, attempting depth {current_depth + 1}...")
-            except Exception as e:
-                print(f"× Error at depth {current_depth}: {str(e)}")
+            # Seed the next depth with this depth's root ranking
+            root_order = search.ranked_root_moves()
+            
+            if soft_limit is not None:
+                used = time.time() - start_time
+                target = soft_limit * self._time_scale(search)
+                if current_depth < max_depth and used >= target:
+                    logger.debug("Depth %d done after %.2fs of a %.2fs target, stopping search",
+                                 current_depth, used, target)
+                    break
+            
+            # Only start the next depth if it is expected to finish in time
+            time_left = deadline - time.time()
+            if len(iteration_times) >= 2 and iteration_times[-2] > 0:
+                growth = max(1.0, iteration_times[-1] / iteration_times[-2])
+            else:
+                growth = DEFAULT_DEPTH_GROWTH
+            predicted = iteration_times[-1] * growth
+            if current_depth < max_depth and predicted > time_left:
+                logger.debug("Depth %d predicted to take %.2fs with %.2fs left, stopping search",
+                             current_depth + 1, predicted, time_left)
                 break
+            current_depth += 1
         
+        stats.tt_probes += self.tt.probes
+        stats.tt_hits += self.tt.hits
         if best_move:
-            print(f"\nFinal decision:")
-            print(f"- Best move: {best_move}")
-            print(f"- Score: {best_score}")
-            print(f"- Search depth: {current_depth}")
-            print(f"- Total time: {time.time() - start_time:.2f}s")
+            stats.score = best_score
         else:
-            print("\nWARNING: No valid move found!")
-            best_move = (7, 7)
+            best_move = self._fallback_move(root_order)
+            logger.warning("No root move searched in time, playing %s", best_move)
         
         return best_score, best_move
     
+    def _fallback_move(self, root_order: Optional[List[Tuple[int, int]]]) -> Tuple[int, int]:
+        """A legal move when no root move was searched: the TT move, the earlier
+        ranking's first move, else the first candidate in move order."""
+        entry = self.tt.probe(self.board.hash)
+        preferred = [entry[4]] if entry is not None and entry[4] is not None else []
+        preferred += (root_order or [])[:1]
+        for move in preferred:
+            if self.board.is_valid_move(*move):
+                return move
+        moves = self.candidates.moves() or self.board.get_valid_moves()
+        return self.orderer.order(moves, 0)[0]
+    
+    def _time_scale(self, search: MinimaxSearch) -> float:
+        """Share of the soft budget to use, from the depths completed so far."""
+        if self._forced_reply(search):
+            return FORCED_TIME_SCALE
+        moves = [iteration['move'] for iteration in self.iterations[-3:]]
+        changes = sum(a != b for a, b in zip(moves, moves[1:]))
+        if changes:
+            return 1.0 + UNSTABLE_TIME_SCALE * changes
+        return STABLE_TIME_SCALE if len(moves) == 3 else 1.0
+    
+    def _forced_reply(self, search: MinimaxSearch) -> bool:
+        """Whether the opponent threatens five or every root move but the best loses."""
+        if self.board.bits.five_cells(3 - self.board.current_player.value):
+            return True
+        sign = 1 if search.maximizing else -1
+        scores = sorted((sign * score for score in search.root_scores.values()), reverse=True)
+        return len(scores) >= 2 and scores[0] > -MATE_BOUND and scores[1] <= -MATE_BOUND
+    
+    def _aspiration_search(self, search: MinimaxSearch, root_order: Optional[List[Tuple[int, int]]],
+                           previous: Optional[float]) -> Tuple[float, Tuple[int, int]]:
+        """Search inside a window around an earlier depth's score, widening it until the score falls inside."""
+        if previous is None or self.workers > 1 or abs(previous) >= MATE_BOUND:
+            return search.search(root_order)
+        delta = ASPIRATION_WINDOW
+        alpha, beta = previous - delta, previous + delta
+        while True:
+            score, move = search.search(root_order, alpha, beta)
+            if alpha < score < beta:
+                return score, move
+            self.stats.researches += 1
+            logger.debug("Depth %d failed %s the window (%s, %s) with %s, searching again",
+                         search.depth, 'low' if score <= alpha else 'high', alpha, beta, score)
+            delta *= 4
+            if score <= alpha:
+                alpha = score - delta if delta <= ASPIRATION_MAX else float('-inf')
+            else:
+                beta = score + delta if delta <= ASPIRATION_MAX else float('inf')
+            root_order = search.ranked_root_moves() or root_order
+    
+    def _solve_threats(self, time_limit: float) -> Optional[Tuple[int, int]]:
+        """Run the threat solver; returns its move when it proves a forced result."""
+        if self.threat_solver is None:
+            return None
+        start = time.time()
+        result = self.threat_solver.solve(min(config.ai_threat_time_limit, time_limit / 2))
+        self.stats.add_threat_solve(result is not None, self.threat_solver.nodes, time.time() - start)
+        if result is None:
+            return None
+        kind, move = result
+        stats = self.threat_solver.get_stats()
+        logger.debug("Threat solver: forced %s with %s (%d/%d hits, %d nodes, %.2fs in total)",
+                     kind, move, stats['hits'], stats['calls'], stats['nodes'], stats['time'])
+        return move
+    
+    def _get_pool(self) -> RootSearchPool:
+        """Start the worker processes on first use."""
+        if self.pool is None:
+            self.pool = RootSearchPool(self.workers)
+            self.pool.warm_up()
+        return self.pool
+    
+    def start_pondering(self) -> None:
+        """Search the opponent's likely replies until the next ``get_move``.
+
+        Call after the AI's move has been played on the board. The reply
+        predicted by the last principal variation is searched first.
+        """
+        if self.ponderer is None:
+            return
+        last = self.board.move_history[-1][:2] if self.board.move_history else None
+        predicted = None
+        if len(self.last_pv) >= 2 and self.last_pv[0] == last:
+            predicted = self.last_pv[1]
+        self.ponderer.start(self.board, predicted)
+    
+    def _pondered_search(self, time_limit: float,
+                         soft_limit: Optional[float] = None) -> Tuple[float, Tuple[int, int]]:
+        """Search, reusing the pondered result for this position when there is one."""
+        result = self.ponderer.result(self.board) if self.ponderer is not None else None
+        if result is None:
+            return self._search_with_time_limit(time_limit=time_limit, soft_limit=soft_limit)
+        depth, score, move, ranking = result
+        self.stats.source = 'ponder'
+        if depth >= self.depth and self.board.is_valid_move(*move):
+            logger.debug("Ponder hit: %s (%s) searched to depth %d", move, score, depth)
+            self.progress.update(0, depth, move, score)
+            self.last_pv = [move]
+            self.stats.depth = depth
+            self.stats.score = score
+            return score, move
+        logger.debug("Ponder hit at depth %d, continuing from depth %d", depth, depth + 1)
+        return self._search_with_time_limit(start_depth=depth + 1, time_limit=time_limit,
+                                            root_order=ranking, soft_limit=soft_limit)
+    
+    def close(self) -> None:
+        """Stop pondering and the search worker processes, if any, release the book and detach from the board."""
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        self.evaluator.detach()
+        self.candidates.detach()
+    
     def get_move(self) -> Tuple[int, int]:
-        """Get the next move for the AI player."""
-        print("\nAI is thinking...")
-        self.progress = ProgressTracker()
+        """Get the next move for the AI player.
+        
+        The statistics of the move are kept in ``stats``, logged and added
+        to the process-wide ``move_metrics``.
+        """
+        start = time.time()
+        # The pondering thread shares the transposition table, so stop it first
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        self.progress.start(len(self.candidates.moves()))
+        self.stats = SearchStats()
+        self.stats.source, move = self._choose_move(start)
+        self.stats.move = move
+        self.stats.time = time.time() - start
+        move_metrics.observe(self.stats)
+        logger.info("AI %s", self.stats.summary())
+        return move
+    
+    def time_budget(self) -> Tuple[Optional[float], float]:
+        """(soft, hard) seconds for the move to play; soft is None without a clock.
+
+        With a clock, both are capped at ``time_limit``.
+        """
+        if self.clock is None:
+            return None, self.time_limit
+        soft, hard = self.clock.allocate(self.board.current_player.type, len(self.board.move_history))
+        return min(soft, self.time_limit), min(hard, self.time_limit)
+    
+    def _choose_move(self, start: float) -> Tuple[str, Tuple[int, int]]:
+        """(source, move): the book, the first-move rule, the threat solver or the search."""
+        # Known openings are played straight from the book
+        if self.book is not None:
+            move = self.book.lookup(self.board)
+            if move is not None:
+                return 'book', move
+        
+        # Black opens in the centre
+        if not self.board.move_history:
+            return 'first_move', (self.board.size // 2, self.board.size // 2)
         
         # Special handling for first white move (must be within one space of black's first move)
         if len(self.board.move_history) == 1:
-            print("First white move - applying one-space rule")
             last_row, last_col, _ = self.board.move_history[0]
             valid_moves = []
             
@@ -146,12 +403,19 @@ class AIPlayer:
             
             if valid_moves:
                 # Choose a random valid move from the surrounding positions
-                move = random.choice(valid_moves)
-                print(f"Selected first white move: {move}")
-                return move
-            else:
-                print("No valid surrounding moves found, falling back to normal move selection")
+                return 'first_move', random.choice(valid_moves)
+            logger.debug("No valid surrounding moves found, falling back to normal move selection")
+        
+        # Forcing sequences first: a proven win or the only defence skips the search
+        soft, hard = self.time_budget()
+        move = self._solve_threats(hard if soft is None else soft)
+        if move is not None:
+            return 'threats', move
         
         # Normal move selection for other moves
-        score, move = self._search_with_time_limit()
-        return move 
\ No newline at end of file
+        if soft is not None:
+            logger.debug("Clock budget: %.2fs soft, %.2fs hard", soft, hard)
+        elapsed = time.time() - start
+        score, move = self._pondered_search(hard - elapsed,
+                                            soft_limit=None if soft is None else soft - elapsed)
+        return self.stats.source, move
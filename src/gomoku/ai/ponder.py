@@ -0,0 +1,119 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+from ..board.board import Board
+from .evaluator import PositionEvaluator
+from .batch_eval import BatchEvaluator
+from .search import MinimaxSearch, SearchTimeout
+from .candidates import CandidateSet
+from .ordering import MoveOrderer
+from .transposition import TranspositionTable
+
+Move = Tuple[int, int]
+# (depth, score, best move, root moves ranked best first) of a pondered position
+PonderResult = Tuple[int, float, Move, List[Move]]
+
+
+class Ponderer:
+    """Searches the opponent's likely replies in a background thread.
+
+    The thread works on a private copy of the board, so the game's Board is
+    never touched, and writes into the shared transposition table, which
+    the caller must not use until ``stop()`` has returned. Replies are
+    deepened round-robin: every reply is searched at depth ``d`` before any
+    is searched at ``d + 1``, so a cancelled ponder still leaves comparable
+    results for all of them.
+    """
+
+    def __init__(self, tt: TranspositionTable, depth: int = 3, start_depth: int = 2,
+                 replies: int = 4, candidate_radius: int = 2, quiescence_depth: int = 0,
+                 quiescence_nodes: int = 0, lmr_moves: int = 0, null_move_reduction: int = 0):
+        self.tt = tt
+        self.depth = depth
+        self.start_depth = start_depth
+        self.replies = replies
+        self.candidate_radius = candidate_radius
+        self.quiescence_depth = quiescence_depth
+        self.quiescence_nodes = quiescence_nodes
+        self.lmr_moves = lmr_moves
+        self.null_move_reduction = null_move_reduction
+        # Position hash after a reply -> deepest finished result
+        self.results: Dict[int, PonderResult] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self.hits = 0
+        self.misses = 0
+
+    def start(self, board: Board, predicted: Optional[Move] = None) -> None:
+        """Start pondering the position on ``board`` (opponent to move).
+
+        ``predicted`` is searched first, typically the reply from the last
+        principal variation.
+        """
+        self.stop()
+        self.results = {}
+        history = [(r, c, p.type.value) for r, c, p in board.move_history]
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(board.size, history, predicted, self._cancel),
+                                        name='gomoku-ponder', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Cancel pondering and wait for the thread to leave the search."""
+        if self._thread is not None:
+            self._cancel.set()
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def result(self, board: Board) -> Optional[PonderResult]:
+        """The pondered result for the position on ``board``, if any; counts hits and misses."""
+        found = self.results.get(board.hash)
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+    def _run(self, size: int, history: List[Tuple[int, int, int]], predicted: Optional[Move],
+             cancel: threading.Event) -> None:
+        board = Board(size)
+        for row, col, value in history:
+            board.push((row, col), value)
+        evaluator = PositionEvaluator(board)
+        batch_evaluator = BatchEvaluator(board, evaluator)
+        candidates = CandidateSet(board, self.candidate_radius)
+        orderer = MoveOrderer(board)
+
+        replies = orderer.order(candidates.moves(), 0)
+        if predicted in replies:
+            replies.remove(predicted)
+            replies.insert(0, predicted)
+        replies = replies[:self.replies]
+
+        rankings: Dict[Move, Optional[List[Move]]] = {reply: None for reply in replies}
+        for depth in range(self.start_depth, self.depth + 1):
+            orderer.new_search()
+            for reply in replies:
+                if cancel.is_set():
+                    return
+                board.push(reply)
+                try:
+                    search = MinimaxSearch(board, evaluator.evaluate, depth, tt=self.tt,
+                                           candidates=candidates, orderer=orderer,
+                                           batch_evaluator=batch_evaluator, cancel=cancel,
+                                           quiescence_depth=self.quiescence_depth,
+                                           quiescence_nodes=self.quiescence_nodes,
+                                           lmr_moves=self.lmr_moves,
+                                           null_move_reduction=self.null_move_reduction)
+                    score, move = search.search(rankings[reply])
+                    if move is not None:
+                        ranking = search.ranked_root_moves()
+                        rankings[reply] = ranking
+                        self.results[board.hash] = (depth, score, move, ranking)
+                except SearchTimeout:
+                    return
+                finally:
+                    board.pop()
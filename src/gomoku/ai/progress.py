@@ -2,6 +2,12 @@ import time
 from typing import Tuple, Optional
 
 class ProgressTracker:
+    """Progress of one AI move, updated by the search and read by the UI.
+
+    The search thread writes plain attributes and readers on other threads
+    only take snapshots, so no locking is needed.
+    """
+
     def __init__(self):
         self.start_time = 0
         self.nodes_evaluated = 0
@@ -20,7 +26,6 @@ class ProgressTracker:
         self.current_depth = 0
         self.best_move = None
         self.best_score = float('-inf')
-        print("\nAI is thinking...")
     
     def update(self, move: int, depth: int, best_move: Tuple[int, int], score: float):
         """Update progress information."""
@@ -33,13 +38,35 @@ class ProgressTracker:
         """Increment the node counter."""
         self.nodes_evaluated += 1
     
+    def add_nodes(self, count: int):
+        """Add a batch of searched nodes to the counter."""
+        self.nodes_evaluated += count
+    
+    def nodes_per_second(self) -> float:
+        elapsed = time.time() - self.start_time
+        return self.nodes_evaluated / elapsed if elapsed > 0 else 0.0
+    
+    def snapshot(self) -> dict:
+        """Current progress as a JSON-serialisable dict."""
+        return {
+            'depth': self.current_depth,
+            'move': self.current_move,
+            'total_moves': self.total_moves,
+            'best_move': list(self.best_move) if self.best_move else None,
+            'best_score': self.best_score if self.best_move else None,
+            'nodes': self.nodes_evaluated,
+            'nodes_per_second': round(self.nodes_per_second()),
+            'elapsed': round(time.time() - self.start_time, 2),
+            'message': self.get_progress_message(),
+        }
+    
     def get_progress_message(self) -> str:
         """Get the current progress message."""
         elapsed = time.time() - self.start_time
         return (f"Move {self.current_move}/{self.total_moves} "
                 f"(Depth {self.current_depth}) "
                 f"Best: {self.best_move} Score: {self.best_score:.0f} "
-                f"Nodes: {self.nodes_evaluated} Time: {elapsed:.1f}s")
+                f"Nodes: {self.nodes_evaluated} ({self.nodes_per_second():.0f}/s) Time: {elapsed:.1f}s")
     
     def finish(self, best_move: Tuple[int, int]) -> str:
         """Get the final result message."""
@@ -1,9 +1,14 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from ..board.board import Board
+from .candidates import CandidateSet
 
 class GameRules:
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, candidates: Optional[CandidateSet] = None, radius: int = 2):
         self.board = board
+        # Incrementally maintained candidate moves; without one the
+        # neighbourhood is recomputed from the bitboard on every call
+        self.candidates = candidates
+        self.radius = candidates.radius if candidates is not None else radius
         self.first_move_played = False
         self.first_white_move_played = False
     
@@ -28,35 +33,14 @@ class GameRules:
         return self._get_constrained_moves()
     
     def _get_constrained_moves(self) -> List[Tuple[int, int]]:
-        """Get moves within the constrained area around existing pieces."""
-        # Find the bounds of current moves
-        min_row = max_row = min_col = max_col = None
-        
-        for i in range(self.board.size):
-            for j in range(self.board.size):
-                if self.board.board[i][j] != 0:
-                    if min_row is None:
-                        min_row = max_row = i
-                        min_col = max_col = j
-                    else:
-                        min_row = min(min_row, i)
-                        max_row = max(max_row, i)
-                        min_col = min(min_col, j)
-                        max_col = max(max_col, j)
+        """Get empty cells within ``radius`` of an existing piece."""
+        bits = self.board.bits
+        occupied = bits.occupied
         
         # If no moves yet, return all empty moves
-        if min_row is None:
-            return [(i, j) for i in range(self.board.size) 
-                   for j in range(self.board.size)
-                   if self.board.board[i][j] == 0]
-        
-        # Expand the bounds by 2 in each direction
-        min_row = max(0, min_row - 2)
-        max_row = min(self.board.size - 1, max_row + 2)
-        min_col = max(0, min_col - 2)
-        max_col = min(self.board.size - 1, max_col + 2)
+        if not occupied:
+            return list(bits.iter_cells(bits.full))
         
-        # Return only empty moves within the expanded bounds
-        return [(i, j) for i in range(min_row, max_row + 1)
-                for j in range(min_col, max_col + 1)
-                if self.board.board[i][j] == 0] 
\ No newline at end of file
+        if self.candidates is not None:
+            return self.candidates.moves()
+        return list(bits.iter_cells(bits.dilate(occupied, self.radius) & ~occupied))
@@ -1,64 +1,453 @@
-from typing import Tuple, Callable
+import threading
+import time
+from typing import Dict, List, Tuple, Callable, Optional
 from ..board.board import Board
+from ..board.player import PlayerType
 from .rules import GameRules
+from .candidates import CandidateSet
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER
+from .ordering import MoveOrderer
+from .batch_eval import BatchEvaluator
+from .progress import ProgressTracker
+from .patterns import OPEN_THREE, OPEN_FOUR
+from .threats import ThreatSolver
+
+# The clock is read once every this many nodes
+NODE_CHECK_INTERVAL = 256
+# Score of a five made at the root; a five made n plies later scores MATE_SCORE - n
+MATE_SCORE = 10_000_000
+# Scores at least this large (in absolute value) are wins found by the search
+MATE_BOUND = MATE_SCORE - 1000
+# Shallowest remaining depths at which late moves are reduced and null moves tried
+LMR_MIN_DEPTH = 4
+NULL_MOVE_MIN_DEPTH = 3
+# Plies taken off a late move; even, because scores swing with the parity of the depth
+LMR_REDUCTION = 2
+
+
+def mate_score(winner: int, ply: int) -> int:
+    """Score of a five made by ``winner`` (1 or 2) at ``ply``, from White's point of view."""
+    return MATE_SCORE - ply if winner == 2 else ply - MATE_SCORE
+
+
+def _to_tt(score: float, ply: int) -> float:
+    """Make a win's score relative to the node at ``ply`` so it is valid wherever the position recurs."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _from_tt(score: float, ply: int) -> float:
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the deadline has passed or it was cancelled."""
+
 
 class MinimaxSearch:
-    def __init__(self, board: Board, evaluator: Callable[[], int], depth: int = 3):
+    def __init__(self, board: Board, evaluator: Callable[[], int], depth: int = 3,
+                 tt: Optional[TranspositionTable] = None,
+                 candidates: Optional[CandidateSet] = None,
+                 orderer: Optional[MoveOrderer] = None,
+                 deadline: Optional[float] = None,
+                 batch_evaluator: Optional[BatchEvaluator] = None,
+                 cancel: Optional[threading.Event] = None,
+                 progress: Optional[ProgressTracker] = None,
+                 quiescence_depth: int = 0,
+                 quiescence_nodes: int = 0,
+                 lmr_moves: int = 0,
+                 null_move_reduction: int = 0):
         self.board = board
         self.evaluator = evaluator
         self.depth = depth
         self.nodes_evaluated = 0
-        self.rules = GameRules(board)
-    
-    def search(self) -> Tuple[float, Tuple[int, int]]:
-        """Perform minimax search with alpha-beta pruning."""
-        # AI is always player 2 (white)
-        return self.minimax(self.depth, float('-inf'), float('inf'), True)
-    
+        self.nodes = 0  # All visited nodes, used to amortise clock checks
+        self._next_clock_check = NODE_CHECK_INTERVAL
+        self.rules = GameRules(board, candidates)
+        self.tt = tt
+        self.orderer = orderer
+        self.deadline = deadline  # Absolute time.time() after which the search aborts
+        # Scores all children of depth-1 nodes at once instead of one make/evaluate/undo each
+        self.batch_evaluator = batch_evaluator
+        # Set from another thread to abort the search like a passed deadline
+        self.cancel = cancel
+        # Receives node counts and finished root moves as the search runs
+        self.progress = progress
+        self._reported_nodes = 0
+        # Forcing plies searched past the horizon (0 = static leaves) and the
+        # quiescence nodes allowed below one horizon node before its leaves turn static
+        self.quiescence_depth = quiescence_depth
+        self.quiescence_nodes = quiescence_nodes
+        self._qnode_limit = 0
+        # Moves searched to full depth before quiet moves are reduced (0 = no reductions)
+        self.lmr_moves = lmr_moves
+        # Depth reduction of the null-move search (0 = no null moves)
+        self.null_move_reduction = null_move_reduction
+        self.threats = ThreatSolver(board) if quiescence_depth or null_move_reduction else None
+        # Counters read into SearchStats
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.eval_time = 0.0
+        self.qnodes = 0  # Quiescence nodes, also counted in nodes
+        self.lmr_reductions = 0  # Moves searched LMR_REDUCTION plies shallower
+        self.lmr_researches = 0  # Reduced moves that beat alpha and were searched again
+        self.null_tries = 0
+        self.null_cutoffs = 0  # Nodes cut off by a null-move search
+        self.root_order: Optional[List[Tuple[int, int]]] = None
+        self.root_scores: Dict[Tuple[int, int], float] = {}
+        # (score, move) of the best root move searched to full depth so far
+        self.best_root: Optional[Tuple[float, Tuple[int, int]]] = None
+        self.maximizing = True  # Whether the side to move at the root is White
+
+    def search(self, root_order: Optional[List[Tuple[int, int]]] = None, alpha: float = float('-inf'),
+               beta: float = float('inf')) -> Tuple[float, Tuple[int, int]]:
+        """Perform an alpha-beta search for the side to move.
+
+        Scores are from White's point of view, so White maximizes and Black
+        minimizes; ``alpha`` and ``beta`` give the window the same way, and a
+        score at or outside the window is only a bound. ``root_order`` lists
+        root moves to try first, in order (typically the previous iteration's
+        ranking). If the deadline passes, the board is restored and
+        SearchTimeout is raised; ``best_root`` then holds the best root move
+        that was searched completely, if any.
+        """
+        self.root_order = root_order
+        self.root_scores = {}
+        self.best_root = None
+        base = len(self.board.move_history)
+        self.maximizing = self.board.current_player.type == PlayerType.WHITE
+        try:
+            return self.minimax(self.depth, alpha, beta, self.maximizing)
+        except SearchTimeout:
+            while len(self.board.move_history) > base:
+                self.board.pop()
+            raise
+        finally:
+            self._report_nodes()
+
+    def ranked_root_moves(self) -> List[Tuple[int, int]]:
+        """Root moves searched so far, best first for the side to move."""
+        return sorted(self.root_scores, key=self.root_scores.get, reverse=self.maximizing)
+
+    def _count_cutoff(self, index: int) -> None:
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+    def _report_nodes(self) -> None:
+        if self.progress is not None:
+            self.progress.add_nodes(self.nodes - self._reported_nodes)
+            self._reported_nodes = self.nodes
+
+    def _report_root(self, total: int) -> None:
+        """Publish the root moves finished so far and the best of them."""
+        if self.progress is not None and self.best_root is not None:
+            score, move = self.best_root
+            self.progress.total_moves = total
+            self.progress.update(len(self.root_scores), self.depth, move, score)
+
+    def get_pv(self) -> List[Tuple[int, int]]:
+        """Principal variation from the root, read back from the transposition table."""
+        pv = []
+        if self.tt is None:
+            return pv
+        for _ in range(self.depth):
+            entry = self.tt.probe(self.board.hash)
+            if entry is None or entry[4] is None or not self.board.make_move(*entry[4]):
+                break
+            pv.append(entry[4])
+        for _ in pv:
+            self.board.pop()
+        return pv
+
     def minimax(self, depth: int, alpha: float, beta: float, maximizing: bool) -> Tuple[float, Tuple[int, int]]:
-        """Minimax algorithm with alpha-beta pruning."""
+        """Value of the position from White's point of view, for callers that keep White-relative windows.
+
+        ``maximizing`` must be whether White is to move; the search itself is
+        negamax on scores relative to the side to move.
+        """
+        ply = self.depth - depth
+        if maximizing:
+            return self.negamax(depth, alpha, beta, ply)
+        score, move = self.negamax(depth, -beta, -alpha, ply)
+        return -score, move
+
+    def negamax(self, depth: int, alpha: float, beta: float, ply: int,
+                null_ok: bool = True) -> Tuple[float, Tuple[int, int]]:
+        """Alpha-beta negamax with principal variation search.
+
+        Scores are relative to the side to move. The first move is searched
+        with the full window and the others with a null window around
+        alpha, re-searched with the full window when they fail high. With
+        ``lmr_moves`` set, quiet moves after the first ``lmr_moves`` are
+        first searched LMR_REDUCTION plies shallower and only searched fully
+        if they beat alpha. With ``null_move_reduction`` set, null-window nodes first let
+        the opponent move twice; if that still fails high the node is cut.
+        """
+        self._count_node()
         if depth == 0:
-            self.nodes_evaluated += 1
-            return self.evaluator(), None
-        
+            if self.quiescence_depth:
+                self._qnode_limit = self.qnodes + self.quiescence_nodes
+                return self.quiesce(alpha, beta, ply, 0), None
+            return self._evaluate(), None
+
+        # Transposition table lookup; never cut at the root, which must return a move
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        if self.tt is not None:
+            entry = self.tt.probe(self.board.hash)
+            if entry is not None:
+                _, tt_depth, tt_score, tt_flag, tt_move = entry
+                tt_score = _from_tt(tt_score, ply)
+                if tt_depth >= depth and ply > 0:
+                    if tt_flag == EXACT:
+                        return tt_score, tt_move
+                    if tt_flag == LOWER:
+                        alpha = max(alpha, tt_score)
+                    elif tt_flag == UPPER:
+                        beta = min(beta, tt_score)
+                    if beta <= alpha:
+                        return tt_score, tt_move
+
         valid_moves = self.rules.get_valid_moves()
         if not valid_moves:
             return 0, None
-        
+        side = self.board.current_player.value
+        wins = self.board.bits.five_cells(side)
+        if wins:
+            # A five ends the game, so the node is decided without searching:
+            # no other move can beat winning right now
+            move = next(self.board.bits.iter_cells(wins))
+            best_eval = MATE_SCORE - (ply + 1)
+            if ply == 0:
+                self.best_root = (self._absolute(best_eval), move)
+                self.root_scores[move] = self._absolute(best_eval)
+            self._store(depth, ply, best_eval, float('-inf'), float('inf'), move)
+            return best_eval, move
+        if null_ok and self._try_null_move(depth, alpha, beta, ply, side):
+            self.board.pass_turn()
+            try:
+                # A reduction past the horizon searches the reply as a horizon node
+                reduced = max(0, depth - 1 - self.null_move_reduction)
+                score = -self.negamax(reduced, -beta, -beta + 1, ply + 1, False)[0]
+            finally:
+                self.board.pass_turn()
+            if score >= beta:
+                self.null_cutoffs += 1
+                # A win found after passing is not a win of this position
+                return (beta if score >= MATE_BOUND else score), None
+        if depth == 1 and ply > 0 and self.batch_evaluator is not None and not self._facing_four(side):
+            # Every child is scored in one pass, so there is nothing to order
+            best_eval, best_move = self._search_frontier(valid_moves, alpha, beta, ply)
+            if self.quiescence_depth:
+                self._store(depth, ply, best_eval, alpha_orig, beta_orig, best_move)
+            else:
+                # The value is exact whatever the window was
+                self._store(depth, ply, best_eval, float('-inf'), float('inf'), best_move)
+            return best_eval, best_move
+
+        if self.orderer is not None:
+            valid_moves = self.orderer.order(valid_moves, ply, tt_move)
+        elif tt_move in valid_moves:
+            # Try the stored best move first
+            valid_moves.remove(tt_move)
+            valid_moves.insert(0, tt_move)
+        if ply == 0 and self.root_order:
+            preferred = [move for move in self.root_order if move in valid_moves]
+            valid_moves = preferred + [move for move in valid_moves if move not in preferred]
+
+        best_eval = float('-inf')
         best_move = None
-        if maximizing:
-            max_eval = float('-inf')
-            for move in valid_moves:
-                # Save current state
-                current_player = self.board.current_player
-                # Make move
-                self.board.make_move(*move)
-                eval, _ = self.minimax(depth - 1, alpha, beta, False)
-                # Undo move
-                self.board.board[move[0]][move[1]] = 0
-                self.board.current_player = current_player
-                if eval > max_eval:
-                    max_eval = eval
-                    best_move = move
-                alpha = max(alpha, eval)
-                if beta <= alpha:
-                    break
-            return max_eval, best_move
+        reduce_from = (self.lmr_moves if self.lmr_moves and self.orderer is not None
+                       and depth >= LMR_MIN_DEPTH and ply > 0 else len(valid_moves))
+        for index, move in enumerate(valid_moves):
+            reduced = index >= reduce_from and not self.orderer.is_forcing(move, side)
+            self.board.push(move)
+            if index == 0:
+                eval = -self.negamax(depth - 1, -beta, -alpha, ply + 1)[0]
+            else:
+                if reduced:
+                    self.lmr_reductions += 1
+                    eval = -self.negamax(depth - 1 - LMR_REDUCTION, -alpha - 1, -alpha, ply + 1)[0]
+                    if eval > alpha:
+                        self.lmr_researches += 1
+                if not reduced or eval > alpha:
+                    eval = -self.negamax(depth - 1, -alpha - 1, -alpha, ply + 1)[0]
+                if alpha < eval < beta:
+                    eval = -self.negamax(depth - 1, -beta, -alpha, ply + 1)[0]
+            self.board.pop()
+            if eval > best_eval:
+                best_eval = eval
+                best_move = move
+                if ply == 0:
+                    self.best_root = (self._absolute(eval), move)
+            if ply == 0:
+                self.root_scores[move] = self._absolute(eval)
+                self._report_root(len(valid_moves))
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                self._count_cutoff(index)
+                if self.orderer is not None:
+                    self.orderer.record_cutoff(move, ply, depth)
+                break
+
+        self._store(depth, ply, best_eval, alpha_orig, beta_orig, best_move)
+        return best_eval, best_move
+
+    def _try_null_move(self, depth: int, alpha: float, beta: float, ply: int, side: int) -> bool:
+        """Whether a null move may be tried: deep enough, off the principal variation, the static
+        score already reaches beta, and the opponent has no four or open three to exploit the pass."""
+        if (not self.null_move_reduction or depth < NULL_MOVE_MIN_DEPTH or ply == 0
+                or beta - alpha != 1 or abs(beta) >= MATE_BOUND or self._evaluate() < beta):
+            return False
+        opponent = 3 - side
+        if self.board.bits.five_cells(opponent):
+            return False
+        if self.threats.threat_cells(opponent, OPEN_FOUR):
+            return False
+        self.null_tries += 1
+        return True
+
+    def _absolute(self, score: float) -> float:
+        """A root-relative score from White's point of view."""
+        return score if self.maximizing else -score
+
+    def quiesce(self, alpha: float, beta: float, ply: int, qply: int) -> float:
+        """Value of a horizon node after playing out its forcing moves, relative to the side to move.
+
+        A four must be blocked, so a single four is answered with its block
+        and a double four is a loss. Otherwise the side to move plays a
+        forcing move: one of its own fours or open threes, or a block of the
+        opponent's open three. It may also stand pat on the static score,
+        unless the opponent has an open three.
+        The extension stops after ``quiescence_depth`` plies, or once
+        ``quiescence_nodes`` nodes were searched below the horizon node;
+        from then on leaves are scored statically.
+        """
+        self._count_node()
+        self.qnodes += 1
+        bits = self.board.bits
+        side = self.board.current_player.value
+        if bits.five_cells(side):
+            return MATE_SCORE - (ply + 1)
+        blocks = bits.five_cells(3 - side)
+        if blocks & (blocks - 1):
+            return (ply + 2) - MATE_SCORE  # Two fives to stop: one of them completes
+        if qply >= self.quiescence_depth or self.qnodes >= self._qnode_limit:
+            return self._evaluate()
+        if blocks:
+            moves = list(bits.iter_cells(blocks))
+            best = float('-inf')
         else:
-            min_eval = float('inf')
-            for move in valid_moves:
-                # Save current state
-                current_player = self.board.current_player
-                # Make move
-                self.board.make_move(*move)
-                eval, _ = self.minimax(depth - 1, alpha, beta, True)
-                # Undo move
-                self.board.board[move[0]][move[1]] = 0
-                self.board.current_player = current_player
-                if eval < min_eval:
-                    min_eval = eval
-                    best_move = move
-                beta = min(beta, eval)
-                if beta <= alpha:
+            moves, threatened = self._forcing_moves(side)
+            # An open three of the opponent becomes an open four next move, so it must be answered
+            best = float('-inf') if threatened else self._evaluate()
+            if best >= beta:
+                return best
+            alpha = max(alpha, best)
+        for move in moves:
+            self.board.push(move)
+            score = -self.quiesce(-beta, -alpha, ply + 1, qply + 1)
+            self.board.pop()
+            best = max(best, score)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best
+
+    def _forcing_moves(self, side: int) -> Tuple[List[Tuple[int, int]], bool]:
+        """Moves making a four or an open three, and blocks of the opponent's open threes, strongest
+        first, and whether the opponent has an open three."""
+        ranked = {move: shape + 8 * fours for move, shape, fours, _ in self.threats.threat_cells(side)}
+        threatened = False
+        for move, _, _, _ in self.threats.threat_cells(3 - side, OPEN_FOUR):
+            # The opponent would make an open four here
+            ranked[move] = max(ranked.get(move, 0), OPEN_THREE)
+            threatened = True
+        return sorted(ranked, key=ranked.get, reverse=True), threatened
+
+    def _facing_four(self, side: int) -> bool:
+        """Whether the opponent of ``side`` has a four, so the position is not quiet."""
+        return self.quiescence_depth > 0 and self.board.bits.five_cells(3 - side) != 0
+
+    def _count_node(self) -> None:
+        self.nodes += 1
+        if self.nodes >= self._next_clock_check:
+            self._next_clock_check = self.nodes + NODE_CHECK_INTERVAL
+            self._report_nodes()
+            if self.deadline is not None and time.time() >= self.deadline:
+                raise SearchTimeout()
+            if self.cancel is not None and self.cancel.is_set():
+                raise SearchTimeout()
+
+    def _evaluate(self) -> int:
+        """Static score relative to the side to move."""
+        self.nodes_evaluated += 1
+        start = time.perf_counter()
+        score = self.evaluator()
+        self.eval_time += time.perf_counter() - start
+        return score if self.board.current_player.value == 2 else -score
+
+    def _store(self, depth: int, ply: int, best_eval: float, alpha_orig: float, beta_orig: float,
+               best_move: Optional[Tuple[int, int]]) -> None:
+        """Save a node's result in the transposition table with its bound type."""
+        if self.tt is None:
+            return
+        if best_eval <= alpha_orig:
+            flag = UPPER
+        elif best_eval >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(self.board.hash, depth, _to_tt(best_eval, ply), flag, best_move)
+
+    def _search_frontier(self, valid_moves: List[Tuple[int, int]], alpha: float, beta: float,
+                         ply: int) -> Tuple[float, Tuple[int, int]]:
+        """Value of a depth-1 node from one batched evaluation of all its children.
+
+        Without quiescence the static scores are the children's exact values.
+        With it, a child's static score bounds its quiescence value from
+        above, since the opponent may stand pat, unless the move makes a four
+        or an open three the opponent must answer. So those children are
+        played out first, then the others from the best static score down,
+        until no child left can beat the best value found or one reaches beta.
+        """
+        side = self.board.current_player.value
+        start = time.perf_counter()
+        scores = self.batch_evaluator.evaluate_children(valid_moves, side)
+        self.eval_time += time.perf_counter() - start
+        self.nodes_evaluated += len(valid_moves)
+        self.nodes += len(valid_moves)
+        if side == 1:
+            scores = -scores
+        if not self.quiescence_depth:
+            index = int(scores.argmax())
+            best_eval = int(scores[index])
+            best_move = valid_moves[index]
+        else:
+            forcing = {move for move, _, _, _ in self.threats.threat_cells(side)}
+            order = sorted(range(len(valid_moves)), key=lambda i: (valid_moves[i] not in forcing, -scores[i]))
+            best_eval, best_move = float('-inf'), None
+            for index in order:
+                move = valid_moves[index]
+                if move not in forcing and scores[index] <= best_eval:
+                    break
+                self.board.push(move)
+                self._qnode_limit = self.qnodes + self.quiescence_nodes
+                eval = -self.quiesce(-beta, -alpha, ply + 1, 0)
+                self.board.pop()
+                if eval > best_eval:
+                    best_eval, best_move = eval, move
+                alpha = max(alpha, eval)
+                if alpha >= beta:
                     break
-            return min_eval, best_move 
\ No newline at end of file
+        if self.orderer is not None and best_eval >= beta:
+            self.orderer.record_cutoff(best_move, ply, 1)
+        return best_eval, best_move
@@ -0,0 +1,262 @@
+"""Per-move search statistics and their running aggregates.
+
+``SearchStats`` describes how one AI move was found. ``MoveMetrics``
+folds every move into process-wide totals and a latency distribution and
+renders them in the Prometheus text format.
+"""
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Where a move came from
+SOURCES = ['book', 'first_move', 'threats', 'ponder', 'search']
+
+# Upper bounds in seconds of the move latency histogram
+LATENCY_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+LATENCY_QUANTILES = [0.5, 0.9, 0.99]
+
+
+class SearchStats:
+    """Counters of one AI move.
+
+    Node, cutoff and evaluation counts come from the minimax iterations;
+    ``cutoffs`` only covers nodes whose moves are searched one by one,
+    since batched frontier nodes have no move order. Root-parallel searches
+    run in other processes and only report their node counts.
+    """
+
+    def __init__(self):
+        self.source = 'search'
+        self.move: Optional[Tuple[int, int]] = None
+        self.score: Optional[float] = None
+        self.depth = 0  # Deepest completed iteration
+        self.time = 0.0  # Wall time of the whole move
+        self.nodes = 0
+        self.evaluations = 0  # Leaf positions scored
+        self.qnodes = 0  # Quiescence nodes past the horizon, included in nodes
+        self.lmr_reductions = 0  # Late moves searched at reduced depth
+        self.lmr_researches = 0  # Reduced moves searched again at full depth
+        self.null_tries = 0
+        self.null_cutoffs = 0  # Nodes pruned by a null-move search
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0  # Cutoffs caused by the first move searched
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.eval_time = 0.0
+        self.depth_times: List[Tuple[int, float]] = []  # (depth, seconds) per completed iteration
+        self.timed_out = False  # The last iteration was stopped at the deadline
+        self.researches = 0  # Root searches repeated after failing outside the aspiration window
+        # Threat solver runs before the search, whether or not they proved a result
+        self.threat_calls = 0
+        self.threat_hits = 0
+        self.threat_nodes = 0
+        self.threat_time = 0.0
+
+    def add_search(self, search) -> None:
+        """Add the counters of one finished or aborted search iteration."""
+        self.nodes += search.nodes
+        self.evaluations += search.nodes_evaluated
+        self.qnodes += search.qnodes
+        self.lmr_reductions += search.lmr_reductions
+        self.lmr_researches += search.lmr_researches
+        self.null_tries += search.null_tries
+        self.null_cutoffs += search.null_cutoffs
+        self.cutoffs += search.cutoffs
+        self.first_move_cutoffs += search.first_move_cutoffs
+        self.eval_time += search.eval_time
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Fraction of cutoffs that came from the first move: a measure of move ordering."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def eval_share(self) -> float:
+        """Fraction of the move's time spent evaluating positions."""
+        return self.eval_time / self.time if self.time > 0 else 0.0
+
+    def add_threat_solve(self, hit: bool, nodes: int, seconds: float) -> None:
+        """Add one threat solver run."""
+        self.threat_calls += 1
+        self.threat_hits += int(hit)
+        self.threat_nodes += nodes
+        self.threat_time += seconds
+
+    @property
+    def threat_hit_rate(self) -> float:
+        return self.threat_hits / self.threat_calls if self.threat_calls else 0.0
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.time if self.time > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'source': self.source,
+            'move': list(self.move) if self.move else None,
+            'score': self.score,
+            'depth': self.depth,
+            'time': self.time,
+            'nodes': self.nodes,
+            'nps': self.nps,
+            'evaluations': self.evaluations,
+            'qnodes': self.qnodes,
+            'lmr_reductions': self.lmr_reductions,
+            'lmr_researches': self.lmr_researches,
+            'null_tries': self.null_tries,
+            'null_cutoffs': self.null_cutoffs,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoff_rate,
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'tt_hit_rate': self.tt_hit_rate,
+            'eval_share': self.eval_share,
+            'depth_times': [list(row) for row in self.depth_times],
+            'timed_out': self.timed_out,
+            'researches': self.researches,
+            'threat_calls': self.threat_calls,
+            'threat_hits': self.threat_hits,
+            'threat_hit_rate': self.threat_hit_rate,
+            'threat_nodes': self.threat_nodes,
+            'threat_time': self.threat_time,
+        }
+
+    def summary(self) -> str:
+        """One-line description for the log."""
+        text = f"{self.source} move {self.move} in {self.time:.2f}s"
+        if self.source in ('search', 'ponder') and self.nodes:
+            depths = ' '.join(f"d{depth}:{seconds:.2f}s" for depth, seconds in self.depth_times)
+            text += (f", score {self.score}, depth {self.depth}{' (timed out)' if self.timed_out else ''}"
+                     f", {self.nodes} nodes ({self.nps:.0f}/s, {self.qnodes} quiescence), {self.cutoffs} cutoffs "
+                     f"({self.first_move_cutoff_rate:.1%} first move), TT {self.tt_hits}/{self.tt_probes} "
+                     f"({self.tt_hit_rate:.1%}), {self.researches} re-searches, LMR {self.lmr_researches}/"
+                     f"{self.lmr_reductions} re-searched, null move {self.null_cutoffs}/{self.null_tries} cut, "
+                     f"eval {self.eval_share:.1%} of time [{depths}]")
+        if self.threat_calls:
+            text += (f", threats {self.threat_hits}/{self.threat_calls} proved "
+                     f"({self.threat_nodes} nodes, {self.threat_time:.2f}s)")
+        return text
+
+
+class MoveMetrics:
+    """Running totals over every AI move of the process, safe to update from several threads."""
+
+    def __init__(self, window: int = 1000):
+        self.lock = threading.Lock()
+        self.moves: Dict[str, int] = {source: 0 for source in SOURCES}
+        self.counters = {'nodes': 0, 'evaluations': 0, 'qnodes': 0, 'cutoffs': 0,
+                         'first_move_cutoffs': 0, 'tt_probes': 0, 'tt_hits': 0, 'timeouts': 0,
+                         'lmr_reductions': 0, 'lmr_researches': 0, 'null_tries': 0, 'null_cutoffs': 0,
+                         'threat_calls': 0, 'threat_hits': 0, 'threat_nodes': 0}
+        self.eval_time = 0.0
+        self.threat_time = 0.0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.depth_sum = 0
+        # Latencies of the most recent moves, for quantiles
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, stats: SearchStats) -> None:
+        with self.lock:
+            self.moves[stats.source] = self.moves.get(stats.source, 0) + 1
+            self.counters['nodes'] += stats.nodes
+            self.counters['evaluations'] += stats.evaluations
+            self.counters['qnodes'] += stats.qnodes
+            for name in ('lmr_reductions', 'lmr_researches', 'null_tries', 'null_cutoffs',
+                         'threat_calls', 'threat_hits', 'threat_nodes'):
+                self.counters[name] += getattr(stats, name)
+            self.counters['cutoffs'] += stats.cutoffs
+            self.counters['first_move_cutoffs'] += stats.first_move_cutoffs
+            self.counters['tt_probes'] += stats.tt_probes
+            self.counters['tt_hits'] += stats.tt_hits
+            self.counters['timeouts'] += int(stats.timed_out)
+            self.eval_time += stats.eval_time
+            self.threat_time += stats.threat_time
+            self.depth_sum += stats.depth
+            self.latency_sum += stats.time
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if stats.time <= bound:
+                    self.latency_buckets[i] += 1
+            self.recent.append(stats.time)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency quantile over the recent window, or None before the first move."""
+        with self.lock:
+            latencies = sorted(self.recent)
+        return _quantile(latencies, q)
+
+    def render(self) -> str:
+        """The aggregates in the Prometheus text exposition format."""
+        with self.lock:
+            moves = dict(self.moves)
+            counters = dict(self.counters)
+            total = sum(moves.values())
+            buckets = list(self.latency_buckets)
+            latency_sum = self.latency_sum
+            eval_time = self.eval_time
+            threat_time = self.threat_time
+            depth_sum = self.depth_sum
+            recent = sorted(self.recent)
+        lines = format_metric('gomoku_ai_moves_total', 'counter', 'AI moves by how they were found',
+                              [({'source': source}, count) for source, count in moves.items()])
+        for name, help_text in [('nodes', 'Search nodes visited'),
+                                ('evaluations', 'Leaf positions evaluated'),
+                                ('qnodes', 'Quiescence nodes searched past the horizon'),
+                                ('cutoffs', 'Alpha-beta cutoffs'),
+                                ('first_move_cutoffs', 'Cutoffs caused by the first move searched'),
+                                ('tt_probes', 'Transposition table probes'),
+                                ('tt_hits', 'Transposition table hits'),
+                                ('timeouts', 'Moves whose last iteration hit the deadline'),
+                                ('lmr_reductions', 'Late moves searched at reduced depth'),
+                                ('lmr_researches', 'Reduced moves searched again at full depth'),
+                                ('null_tries', 'Null-move searches'),
+                                ('null_cutoffs', 'Nodes pruned by a null-move search'),
+                                ('threat_calls', 'Threat solver runs'),
+                                ('threat_hits', 'Threat solver runs that proved a forced result'),
+                                ('threat_nodes', 'Threat solver nodes')]:
+            lines += format_metric(f'gomoku_ai_{name}_total', 'counter', help_text,
+                                   [({}, counters[name])])
+        lines += format_metric('gomoku_ai_eval_seconds_total', 'counter', 'Time spent evaluating positions',
+                               [({}, eval_time)])
+        lines += format_metric('gomoku_ai_threat_seconds_total', 'counter', 'Time spent in the threat solver',
+                               [({}, threat_time)])
+        lines += format_metric('gomoku_ai_depth_sum', 'counter', 'Sum of completed search depths',
+                               [({}, depth_sum)])
+        samples = [({'le': str(bound)}, count) for bound, count in zip(LATENCY_BUCKETS, buckets)]
+        samples.append(({'le': '+Inf'}, total))
+        lines += format_metric('gomoku_ai_move_seconds', 'histogram', 'AI move latency',
+                               samples, suffixes=['_bucket'] * len(samples))
+        lines += [f'gomoku_ai_move_seconds_sum {latency_sum}', f'gomoku_ai_move_seconds_count {total}']
+        # Quantiles, sum and count all cover the same recent window
+        samples = [({'quantile': str(q)}, _quantile(recent, q)) for q in LATENCY_QUANTILES if recent]
+        samples += [({}, sum(recent)), ({}, len(recent))]
+        lines += format_metric('gomoku_ai_move_latency_seconds', 'summary',
+                               f'AI move latency over the last {self.recent.maxlen} moves',
+                               samples, suffixes=[''] * (len(samples) - 2) + ['_sum', '_count'])
+        return '\n'.join(lines) + '\n'
+
+
+def _quantile(latencies: List[float], q: float) -> Optional[float]:
+    """Quantile of sorted latencies, or None when there are none."""
+    if not latencies:
+        return None
+    return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+
+def format_metric(name: str, kind: str, help_text: str, samples: List[Tuple[dict, float]],
+                  suffixes: Optional[List[str]] = None) -> List[str]:
+    """Prometheus text lines of one metric family."""
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    for i, (labels, value) in enumerate(samples):
+        suffix = suffixes[i] if suffixes else ''
+        label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+        lines.append(f'{name}{suffix}{{{label_text}}} {value}' if label_text else f'{name}{suffix} {value}')
+    return lines
+
+
+# Every AIPlayer of the process reports here
+move_metrics = MoveMetrics()
@@ -0,0 +1,271 @@
+import time
+from typing import Dict, List, Optional, Tuple
+from ..board.board import Board
+from .patterns import FIVE, OPEN_FOUR, FOUR, OPEN_THREE, REACH, get_pattern_table, window_key
+
+Move = Tuple[int, int]
+
+
+def _in_line(a: Move, b: Move) -> bool:
+    """Whether two cells lie on a common line within a five's reach of each other."""
+    dr, dc = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return (dr == 0 or dc == 0 or dr == dc) and max(dr, dc) <= REACH
+
+
+class ThreatBudgetExceeded(Exception):
+    """Raised inside the solver when its node or time budget runs out."""
+
+
+class ThreatSolver:
+    """Narrow search over forcing moves that proves wins the main search cannot see.
+
+    The attacker only plays moves that make a four (VCF, victory by
+    continuous fours) or, at most ``max_threes`` times per line, an open
+    three (VCT). The defender's replies are then limited to the cells that
+    stop the threat plus its own counter-fours, so the tree stays small
+    enough to search far deeper than the full-width search. Each call is
+    bounded by ``max_nodes`` and a deadline; running out of budget means
+    "no proof".
+    """
+
+    def __init__(self, board: Board, max_nodes: int = 20000, max_depth: int = 16,
+                 max_threes: int = 2):
+        self.board = board
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth  # Attacker moves per sequence
+        self.max_threes = max_threes  # Open threes per sequence; 0 searches fours only
+        self.patterns = get_pattern_table()
+        self.nodes = 0
+        self.deadline: Optional[float] = None
+        # (depth searched, winning line or None) of attacker-to-move positions during one call
+        self._memo: Dict[Tuple[int, int, int], Tuple[int, Optional[List[Move]]]] = {}
+        self.calls = 0
+        self.hits = 0
+        self.total_nodes = 0
+        self.total_time = 0.0
+
+    def solve(self, time_limit: float) -> Optional[Tuple[str, Move]]:
+        """Look for a forced result for the side to move.
+
+        Returns ('win', move) when the side to move has a forced win,
+        ('defence', move) when it must stop an opponent's five or its only
+        refutation of an opponent's VCF, and None otherwise.
+        """
+        start = time.time()
+        self.calls += 1
+        self.nodes = 0
+        self.deadline = start + time_limit
+        self._memo = {}
+        me = self.board.current_player.type.value
+        result = None
+        try:
+            result = self._solve(me)
+        finally:
+            self.total_nodes += self.nodes
+            self.total_time += time.time() - start
+        if result is not None:
+            self.hits += 1
+        return result
+
+    def _solve(self, me: int) -> Optional[Tuple[str, Move]]:
+        opponent = 3 - me
+        wins = self.five_cells(me)
+        if wins:
+            return 'win', wins[0]
+        losses = self.five_cells(opponent)
+        if losses:
+            return 'defence', losses[0]
+        try:
+            line = self.find_win(me, 0)
+            if line is not None:
+                return 'win', line[0]
+            threat = self.find_win(opponent, 0)
+            if threat is not None:
+                defence = self._only_defence(me, threat)
+                if defence is not None:
+                    return 'defence', defence
+            if self.max_threes:
+                line = self.find_win(me, self.max_threes)
+                if line is not None:
+                    return 'win', line[0]
+        except ThreatBudgetExceeded:
+            pass
+        return None
+
+    def find_win(self, attacker: int, threes: int = 0) -> Optional[List[Move]]:
+        """Winning line (attacker and defender moves alternating) for ``attacker`` to move.
+
+        ``threes`` is the number of open threes the line may use; 0 is a VCF.
+        """
+        return self._attack(attacker, threes, self.max_depth)
+
+    def _only_defence(self, me: int, threat: List[Move]) -> Optional[Move]:
+        """The single move among the threat's cells and our fours that stops the opponent's VCF."""
+        opponent = 3 - me
+        candidates = list(threat)
+        for move, _, fours, _ in self.threat_cells(me):
+            if fours and move not in candidates:
+                candidates.append(move)
+        refutations = []
+        for move in candidates:
+            self._play(move, me)
+            try:
+                refuted = self._attack(opponent, 0, self.max_depth) is None
+            finally:
+                self.board.pop()
+            if refuted:
+                refutations.append(move)
+                if len(refutations) > 1:
+                    return None
+        return refutations[0] if refutations else None
+
+    def _attack(self, attacker: int, threes: int, depth: int) -> Optional[List[Move]]:
+        self._count_node()
+        key = (self.board.hash, attacker, threes)
+        known = self._memo.get(key)
+        # A win holds at any depth; a failure only for depths it was searched to
+        if known is not None and (known[1] is not None or known[0] >= depth):
+            return known[1]
+        line = self._attack_moves(attacker, threes, depth)
+        self._memo[key] = (depth, line)
+        return line
+
+    def _attack_moves(self, attacker: int, threes: int, depth: int) -> Optional[List[Move]]:
+        defender = 3 - attacker
+        wins = self.five_cells(attacker)
+        if wins:
+            return [wins[0]]
+        if depth == 0:
+            return None
+        forced = self.five_cells(defender)
+        if len(forced) > 1:
+            return None
+        moves = []
+        for move, best, fours, open_threes in self.threat_cells(attacker):
+            if forced and move != forced[0]:
+                continue
+            if best >= OPEN_FOUR or fours >= 2:
+                return [move]  # The defender cannot stop two fives
+            if fours:
+                moves.append((2, open_threes, move))
+            elif threes and best == OPEN_THREE:
+                moves.append((1, open_threes, move))
+        moves.sort(reverse=True)
+
+        for kind, _, move in moves:
+            self._play(move, attacker)
+            try:
+                if kind == 2:
+                    line = self._defend_four(attacker, threes, depth)
+                else:
+                    line = self._defend_three(move, attacker, threes, depth)
+            finally:
+                self.board.pop()
+            if line is not None:
+                return [move] + line
+        return None
+
+    def _defend_four(self, attacker: int, threes: int, depth: int) -> Optional[List[Move]]:
+        blocks = self.five_cells(attacker)
+        if len(blocks) > 1:
+            return [blocks[0]]  # Unstoppable: any block leaves another five
+        return self._after_defence(blocks[0], attacker, threes, depth)
+
+    def _defend_three(self, three: Move, attacker: int, threes: int,
+                      depth: int) -> Optional[List[Move]]:
+        """Every defence to the open three at ``three`` must fail.
+
+        The defences are the cells on the three's lines that would give the
+        attacker a four, plus the defender's counter-fours.
+        """
+        defender = 3 - attacker
+        defences = [move for move, _, fours, _ in self.threat_cells(attacker)
+                    if fours and _in_line(move, three)]
+        defences += [move for move, _, fours, _ in self.threat_cells(defender)
+                     if fours and move not in defences]
+        longest = None
+        for move in defences:
+            line = self._after_defence(move, attacker, threes - 1, depth)
+            if line is None:
+                return None
+            if longest is None or len(line) > len(longest):
+                longest = line
+        return longest
+
+    def _after_defence(self, move: Move, attacker: int, threes: int,
+                       depth: int) -> Optional[List[Move]]:
+        self._play(move, 3 - attacker)
+        try:
+            line = self._attack(attacker, threes, depth - 1)
+        finally:
+            self.board.pop()
+        return None if line is None else [move] + line
+
+    def five_cells(self, side: int) -> List[Move]:
+        """Empty cells where ``side`` completes five."""
+        bits = self.board.bits
+        return list(bits.iter_cells(bits.five_cells(side)))
+
+    def threat_cells(self, side: int, min_shape: int = OPEN_THREE) -> List[Tuple[Move, int, int, int]]:
+        """(move, best class, lines with a four, lines with an open three) for ``side``.
+
+        Lists every empty cell where ``side`` would make at least ``min_shape``
+        (an open three by default). Only lines already holding two of
+        ``side``'s stones can give an open three, and three for a four, so
+        the scan goes line by line and skips the rest.
+        """
+        bits = self.board.bits
+        key_classes = self.patterns.key_classes
+        outside = self.patterns.outside
+        opp_lines = bits.line_bits[3 - side]
+        three_stones = min_shape >= FOUR
+        cells: Dict[Move, List[int]] = {}
+        for line_id, own in enumerate(bits.line_bits[side]):
+            rest = own & (own - 1)
+            if rest == 0 or (three_stones and rest & (rest - 1) == 0):
+                continue
+            opp = opp_lines[line_id]
+            length = bits.line_lengths[line_id]
+            near = own
+            for k in range(1, REACH + 1):
+                near |= own << k | own >> k
+            near &= ((1 << length) - 1) & ~(own | opp)
+            padded_own = own << REACH
+            padded_blocked = opp << REACH | outside[length]
+            line = bits.lines[line_id]
+            while near:
+                pos = (near & -near).bit_length() - 1
+                near &= near - 1
+                shape = key_classes[window_key(padded_own, padded_blocked, pos)]
+                if shape < min_shape:
+                    continue
+                entry = cells.setdefault(line[pos], [0, 0, 0])
+                entry[0] = max(entry[0], shape)
+                if shape >= FOUR:
+                    entry[1] += 1
+                else:
+                    entry[2] += 1
+        return [(move, best, fours, threes) for move, (best, fours, threes) in cells.items()]
+
+    def _play(self, move: Move, side: int) -> None:
+        self.board.push(move, side)
+
+    def _count_node(self) -> None:
+        self.nodes += 1
+        if self.nodes > self.max_nodes or (self.nodes & 63 == 0 and self.deadline is not None
+                                            and time.time() >= self.deadline):
+            raise ThreatBudgetExceeded()
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+    def get_stats(self) -> dict:
+        """Get the solver statistics."""
+        return {
+            'calls': self.calls,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate,
+            'nodes': self.total_nodes,
+            'time': self.total_time,
+        }
@@ -0,0 +1,83 @@
+from typing import Optional, Tuple
+
+# Bound flags for stored scores
+EXACT = 0
+LOWER = 1  # Score is a lower bound (search failed high)
+UPPER = 2  # Score is an upper bound (search failed low)
+
+# Entry layout: (key, depth, score, flag, best_move)
+Entry = Tuple[int, int, float, int, Optional[Tuple[int, int]]]
+
+
+class TranspositionTable:
+    """Fixed-size transposition table keyed by Zobrist hash.
+
+    Every bucket has two slots: a depth-preferred slot that keeps the
+    deepest result seen for that bucket and an always-replace slot that
+    keeps the most recent one.
+    """
+
+    def __init__(self, size: int = 1 << 18):
+        # Round down to a power of two so the bucket index is a simple mask
+        buckets = 1
+        while buckets * 2 <= max(1, size):
+            buckets *= 2
+        self.size = buckets
+        self.mask = buckets - 1
+        self.deep: list = [None] * buckets
+        self.recent: list = [None] * buckets
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key: int) -> Optional[Entry]:
+        """Look up a position. Returns the stored entry or None."""
+        self.probes += 1
+        index = key & self.mask
+        entry = self.deep[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.recent[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, score: float, flag: int,
+              best_move: Optional[Tuple[int, int]]) -> None:
+        """Store a search result for a position."""
+        self.stores += 1
+        index = key & self.mask
+        entry = (key, depth, score, flag, best_move)
+        deep = self.deep[index]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            self.deep[index] = entry
+        else:
+            self.recent[index] = entry
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of probes that found the position."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def get_stats(self) -> dict:
+        """Get the table statistics."""
+        return {
+            'size': self.size,
+            'probes': self.probes,
+            'hits': self.hits,
+            'stores': self.stores,
+            'hit_rate': self.hit_rate,
+        }
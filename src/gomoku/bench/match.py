@@ -0,0 +1,285 @@
+"""Headless engine-vs-engine matches with an SPRT stop.
+
+Run with ``python -m src.gomoku.bench.match``. Two engine configurations
+play every opening of an opening file twice, once with each colour, in
+parallel worker processes. After each game a sequential probability ratio
+test checks whether engine A is at least ``--elo1`` Elo stronger than B
+(H1) or at most ``--elo0`` (H0), and the match stops as soon as either is
+accepted. The report gives the Elo difference of A over B and the time per
+move and nodes per second of each side.
+
+Engines are given as comma-separated ``key=value`` settings: ``depth`` and
+``time_limit`` go to the AIPlayer, every other key overrides the ``ai``
+section of ``config.yaml`` (e.g. ``batch_eval=false``).
+"""
+import argparse
+import json
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..board.board import Board
+from ..ai.player import AIPlayer
+from ..ai.book import read_games
+from src.gomoku.config import config, engine_config, parse_engine
+
+Move = Tuple[int, int]
+
+DEFAULT_OPENINGS = Path(__file__).parent.parent.parent.parent / 'data' / 'openings.txt'
+
+
+class Engine:
+    """An AIPlayer with its own board and config overrides, and its move statistics."""
+
+    def __init__(self, settings: Dict[str, object]):
+        self.settings = settings
+        self.board = Board(config.board_size)
+        with engine_config(settings):
+            self.ai = AIPlayer(self.board,
+                               depth=settings.get('depth', config.ai_max_depth),
+                               time_limit=settings.get('time_limit', config.ai_time_limit),
+                               workers=1, ponder=False)
+        self.moves = 0
+        self.time = 0.0
+        self.nodes = 0
+        self.search_time = 0.0  # Time of the moves that searched, for nodes per second
+
+    def play(self, move: Move) -> None:
+        self.board.make_move(*move)
+
+    def get_move(self) -> Move:
+        with engine_config(self.settings):
+            move = self.ai.get_move()
+        stats = self.ai.stats
+        self.moves += 1
+        self.time += stats.time
+        if stats.nodes:
+            self.nodes += stats.nodes
+            self.search_time += stats.time
+        return move
+
+    def close(self) -> None:
+        self.ai.close()
+
+
+def play_game(opening: List[Move], black: Dict[str, object], white: Dict[str, object],
+              seed: int = 0) -> dict:
+    """Play one game from ``opening``; returns the winner (1, 2 or 0 for a draw) and per-side stats."""
+    random.seed(seed)
+    engines = {1: Engine(black), 2: Engine(white)}
+    reference = Board(config.board_size)
+    winner = 0
+    try:
+        for move in opening:
+            reference.make_move(*move)
+            for engine in engines.values():
+                engine.play(move)
+        while len(reference.move_history) < reference.size * reference.size:
+            side = reference.current_player.type.value
+            row, col = engines[side].get_move()
+            if not reference.make_move(row, col):
+                winner = 3 - side  # An illegal move loses
+                break
+            for engine in engines.values():
+                engine.play((row, col))
+            if reference.check_win(row, col):
+                winner = side
+                break
+    finally:
+        for engine in engines.values():
+            engine.close()
+    return {
+        'winner': winner,
+        'moves': [(r, c) for r, c, _ in reference.move_history],
+        'sides': {side: {'moves': e.moves, 'time': e.time, 'nodes': e.nodes, 'search_time': e.search_time}
+                  for side, e in engines.items()},
+    }
+
+
+def _play_pair_game(index: int, opening: List[Move], a: dict, b: dict) -> Tuple[int, bool, dict]:
+    """Game ``index`` of the schedule: even games give A Black, odd games give A White."""
+    a_black = index % 2 == 0
+    result = play_game(opening, a if a_black else b, b if a_black else a, seed=index)
+    return index, a_black, result
+
+
+def elo(score: float) -> float:
+    """Elo difference that corresponds to an expected score."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def expected_score(elo_diff: float) -> float:
+    return 1 / (1 + 10 ** (-elo_diff / 400))
+
+
+class SPRT:
+    """Generalised SPRT on the score of A, using the normal approximation.
+
+    The log-likelihood ratio of H1 (A is ``elo1`` stronger) against H0
+    (``elo0``) is ``N (s1 - s0)(2 s - s0 - s1) / (2 var)``, with ``s`` the
+    mean score and ``var`` its per-game variance.
+    """
+
+    def __init__(self, elo0: float = 0.0, elo1: float = 10.0, alpha: float = 0.05, beta: float = 0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    def llr(self, wins: int, draws: int, losses: int) -> float:
+        games = wins + draws + losses
+        if games == 0 or wins + losses == 0:
+            return 0.0
+        score = (wins + draws / 2) / games
+        var = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+        if var <= 0:
+            # Every game had the same result: use the smallest variance a mixed sample could give
+            var = 0.25 / games
+        s0, s1 = expected_score(self.elo0), expected_score(self.elo1)
+        return games * (s1 - s0) * (2 * score - s0 - s1) / (2 * var)
+
+    def status(self, wins: int, draws: int, losses: int) -> Optional[str]:
+        """'H1' or 'H0' once accepted, None while undecided."""
+        llr = self.llr(wins, draws, losses)
+        if llr >= self.upper:
+            return 'H1'
+        if llr <= self.lower:
+            return 'H0'
+        return None
+
+
+class MatchResult:
+    """Wins, draws and losses of A, plus each engine's move statistics."""
+
+    def __init__(self):
+        self.wins = self.draws = self.losses = 0
+        self.sides = {'A': {'moves': 0, 'time': 0.0, 'nodes': 0, 'search_time': 0.0},
+                      'B': {'moves': 0, 'time': 0.0, 'nodes': 0, 'search_time': 0.0}}
+        self.games: List[dict] = []
+
+    def add(self, index: int, a_black: bool, result: dict) -> None:
+        a_side, b_side = (1, 2) if a_black else (2, 1)
+        if result['winner'] == a_side:
+            self.wins += 1
+        elif result['winner'] == b_side:
+            self.losses += 1
+        else:
+            self.draws += 1
+        for name, side in (('A', a_side), ('B', b_side)):
+            for key, value in result['sides'][side].items():
+                self.sides[name][key] += value
+        self.games.append({'index': index, 'a_black': a_black, 'winner': result['winner'],
+                           'moves': result['moves']})
+
+    @property
+    def games_played(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def elo(self) -> Tuple[float, float]:
+        """Elo difference of A over B and its 95% error margin."""
+        games = self.games_played
+        if games == 0:
+            return 0.0, float('inf')
+        score = (self.wins + self.draws / 2) / games
+        var = (self.wins * (1 - score) ** 2 + self.draws * (0.5 - score) ** 2
+               + self.losses * score ** 2) / games
+        margin = 1.96 * math.sqrt(var / games)
+        low, high = elo(score - margin), elo(score + margin)
+        return elo(score), (high - low) / 2
+
+    def side_stats(self, name: str) -> dict:
+        side = self.sides[name]
+        return {
+            'moves': side['moves'],
+            'time_per_move': side['time'] / side['moves'] if side['moves'] else 0.0,
+            'nps': side['nodes'] / side['search_time'] if side['search_time'] else 0.0,
+        }
+
+    def to_dict(self) -> dict:
+        diff, margin = self.elo()
+        return {
+            'wins': self.wins, 'draws': self.draws, 'losses': self.losses,
+            'elo': diff, 'elo_margin': margin,
+            'A': self.side_stats('A'), 'B': self.side_stats('B'),
+            'games': sorted(self.games, key=lambda game: game['index']),
+        }
+
+
+def run_match(a: dict, b: dict, openings: List[List[Move]], games: int, workers: int,
+              sprt: Optional[SPRT] = None, log=print) -> Tuple[MatchResult, Optional[str]]:
+    """Play up to ``games`` games (openings repeat with colours swapped); stops on an SPRT decision."""
+    result = MatchResult()
+    decision = None
+    schedule = [(index, openings[(index // 2) % len(openings)]) for index in range(games)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_play_pair_game, index, opening, a, b) for index, opening in schedule]
+        try:
+            for future in as_completed(futures):
+                index, a_black, game = future.result()
+                result.add(index, a_black, game)
+                diff, margin = result.elo()
+                llr = sprt.llr(result.wins, result.draws, result.losses) if sprt else 0.0
+                log(f"game {index + 1:>4} A as {'black' if a_black else 'white'}: "
+                    f"{_outcome(game['winner'], a_black)} in {len(game['moves'])} moves  "
+                    f"+{result.wins} ={result.draws} -{result.losses}  "
+                    f"elo {diff:+.1f} ±{margin:.1f}" + (f"  llr {llr:.2f}" if sprt else ''))
+                if sprt is not None:
+                    decision = sprt.status(result.wins, result.draws, result.losses)
+                    if decision is not None:
+                        break
+        finally:
+            for future in futures:
+                future.cancel()
+    return result, decision
+
+
+def _outcome(winner: int, a_black: bool) -> str:
+    if winner == 0:
+        return 'draw'
+    return 'A won' if (winner == 1) == a_black else 'B won'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Engine-vs-engine match with an SPRT stop')
+    parser.add_argument('--a', default='', help='Settings of engine A, e.g. "depth=3,time_limit=1"')
+    parser.add_argument('--b', default='', help='Settings of engine B')
+    parser.add_argument('--games', type=int, default=100, help='Most games to play (pairs of colours)')
+    parser.add_argument('--openings', type=Path, default=DEFAULT_OPENINGS, help='Opening file')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel games (default: CPU count)')
+    parser.add_argument('--elo0', type=float, default=0.0, help='SPRT H0 Elo of A over B')
+    parser.add_argument('--elo1', type=float, default=10.0, help='SPRT H1 Elo of A over B')
+    parser.add_argument('--alpha', type=float, default=0.05, help='SPRT false positive rate')
+    parser.add_argument('--beta', type=float, default=0.05, help='SPRT false negative rate')
+    parser.add_argument('--no-sprt', action='store_true', help='Always play every game')
+    parser.add_argument('--out', type=Path, help='Write the result and every game to this JSON file')
+    args = parser.parse_args()
+
+    a, b = parse_engine(args.a), parse_engine(args.b)
+    openings = list(read_games(args.openings))
+    sprt = None if args.no_sprt else SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    print(f"A: {a or 'defaults'}  B: {b or 'defaults'}  {args.games} games, {len(openings)} openings"
+          + (f", SPRT [{args.elo0}, {args.elo1}]" if sprt else ''))
+    result, decision = run_match(a, b, openings, args.games, args.workers, sprt)
+
+    diff, margin = result.elo()
+    print(f"\nScore of A: +{result.wins} ={result.draws} -{result.losses} "
+          f"({result.games_played} games), Elo {diff:+.1f} ±{margin:.1f}")
+    if sprt is not None:
+        print({'H1': f"SPRT: H1 accepted, A is at least {args.elo1} Elo stronger",
+               'H0': f"SPRT: H0 accepted, A is not more than {args.elo0} Elo stronger",
+               None: "SPRT: no decision"}[decision])
+    for name in ('A', 'B'):
+        side = result.side_stats(name)
+        print(f"{name}: {side['moves']} moves, {side['time_per_move']:.3f}s per move, "
+              f"{side['nps']:.0f} nodes/s")
+    if args.out:
+        data = result.to_dict()
+        data.update({'a': a, 'b': b, 'sprt': decision})
+        with open(args.out, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Per-operation microbenchmark of the array board against the bitboard.
+
+Run with ``python -m src.gomoku.bench.microbench``.
+"""
+import argparse
+import random
+import timeit
+from typing import Callable, List, Tuple
+import numpy as np
+from ..board.board import Board
+from ..board.win_checker import WinChecker
+from ..ai.candidates import CandidateSet
+
+
+def _array_constrained_moves(board: Board) -> List[Tuple[int, int]]:
+    """The bounding-box move generator as it reads the numpy array cell by cell."""
+    min_row = max_row = min_col = max_col = None
+    for i in range(board.size):
+        for j in range(board.size):
+            if board.board[i][j] != 0:
+                if min_row is None:
+                    min_row = max_row = i
+                    min_col = max_col = j
+                else:
+                    min_row = min(min_row, i)
+                    max_row = max(max_row, i)
+                    min_col = min(min_col, j)
+                    max_col = max(max_col, j)
+    min_row = max(0, min_row - 2)
+    max_row = min(board.size - 1, max_row + 2)
+    min_col = max(0, min_col - 2)
+    max_col = min(board.size - 1, max_col + 2)
+    return [(i, j) for i in range(min_row, max_row + 1)
+            for j in range(min_col, max_col + 1)
+            if board.board[i][j] == 0]
+
+
+def _midgame_board(stones: int, seed: int) -> Board:
+    rng = random.Random(seed)
+    board = Board()
+    board.make_move(7, 7)
+    while len(board.move_history) < stones:
+        row = min(14, max(0, 7 + int(rng.gauss(0, 2.5))))
+        col = min(14, max(0, 7 + int(rng.gauss(0, 2.5))))
+        board.make_move(row, col)
+    return board
+
+
+def _time(func: Callable[[], object], number: int) -> float:
+    """Best-of-five time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def run(stones: int = 30, number: int = 2000, seed: int = 1) -> List[Tuple[str, float, float]]:
+    board = _midgame_board(stones, seed)
+    bits = board.bits
+    checker = WinChecker(board.size)
+    candidates = CandidateSet(board)
+    row, col, player = board.move_history[-1]
+    value = player.type.value
+    rng = random.Random(seed)
+    cells = [(rng.randrange(board.size), rng.randrange(board.size)) for _ in range(225)]
+    line_rows = np.array([r for r, _ in bits.lines[0]])
+    line_cols = np.array([c for _, c in bits.lines[0]])
+    empty = next(iter(bits.iter_cells(bits.empty)))
+
+    def make_undo():
+        board.make_move(*empty)
+        board.undo_move()
+
+    def array_make_undo():
+        board.board[empty[0]][empty[1]] = 1
+        board.board[empty[0]][empty[1]] = 0
+
+    def bits_make_undo():
+        bits.place(empty[0], empty[1], 1)
+        bits.remove(empty[0], empty[1], 1)
+
+    cases = [
+        ('read 225 cells',
+         lambda: [board.board[r][c] for r, c in cells],
+         lambda: [bits.get(r, c) for r, c in cells]),
+        ('win check after a move',
+         lambda: checker.check_win(board.board.tolist(), row, col, value),
+         lambda: checker.check_win(bits, row, col, value)),
+        ('five anywhere on board',
+         lambda: any(checker.check_win(board.board, r, c, v)
+                     for r, c, v in ((r, c, int(board.board[r][c]))
+                                     for r in range(board.size) for c in range(board.size)) if v),
+         lambda: bits.has_five(1) or bits.has_five(2)),
+        ('candidate move generation',
+         lambda: _array_constrained_moves(board),
+         candidates.moves),
+        ('fetch one line for evaluation',
+         lambda: board.board[line_rows, line_cols].tolist(),
+         lambda: (bits.line_bits[1][0], bits.line_bits[2][0])),
+        ('place + remove stone',
+         array_make_undo,
+         bits_make_undo),
+    ]
+    results = []
+    for name, array_op, bit_op in cases:
+        n = max(1, number // 100) if name == 'five anywhere on board' else number
+        results.append((name, _time(array_op, n), _time(bit_op, n)))
+    results.append(('Board.make_move + undo_move (all listeners)', _time(make_undo, number), float('nan')))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Array vs bitboard microbenchmark')
+    parser.add_argument('--stones', type=int, default=30, help='Stones on the benchmark board')
+    parser.add_argument('--number', type=int, default=2000, help='Calls per timing run')
+    args = parser.parse_args()
+
+    print(f"{'operation':<44}{'array us':>10}{'bits us':>10}{'speedup':>9}")
+    for name, array_us, bit_us in run(args.stones, args.number):
+        if bit_us != bit_us:  # NaN: single measurement
+            print(f"{name:<44}{array_us:>10.2f}")
+        else:
+            print(f"{name:<44}{array_us:>10.2f}{bit_us:>10.2f}{array_us / bit_us:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Node counts per iterative-deepening depth, with and without move ordering.
+
+Run with ``python -m src.gomoku.bench.nodes``. Every position has White
+(the AI) to move.
+"""
+import argparse
+import time
+from typing import Dict, List, Tuple
+from ..board.board import Board
+from ..ai.evaluator import PositionEvaluator
+from ..ai.search import MinimaxSearch
+from ..ai.candidates import CandidateSet
+from ..ai.ordering import MoveOrderer
+from ..ai.transposition import TranspositionTable
+
+POSITIONS: Dict[str, List[Tuple[int, int]]] = {
+    'opening': [(7, 7), (7, 8), (8, 8)],
+    'diagonal-three': [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9)],
+    'open-three': [(7, 6), (6, 6), (7, 7), (8, 8), (7, 8)],
+    'block-four': [(7, 5), (7, 4), (7, 6), (6, 6), (7, 7), (8, 8), (7, 8)],
+    'white-four': [(3, 3), (7, 7), (3, 5), (7, 8), (11, 11), (7, 9), (11, 3), (7, 10), (2, 12)],
+    'midgame-13': [(7, 7), (12, 6), (9, 4), (6, 6), (5, 5), (6, 7), (5, 8), (6, 0), (9, 7),
+                   (5, 7), (4, 10), (4, 7), (7, 8)],
+    'midgame-21': [(7, 7), (7, 8), (6, 7), (9, 8), (10, 5), (7, 6), (8, 12), (9, 4), (6, 10),
+                   (7, 3), (5, 5), (11, 5), (5, 7), (9, 6), (10, 4), (5, 6), (8, 8), (10, 8),
+                   (7, 10), (8, 7), (6, 6)],
+}
+
+
+def load_position(moves: List[Tuple[int, int]]) -> Board:
+    board = Board()
+    for move in moves:
+        board.make_move(*move)
+    return board
+
+
+def count_nodes(moves: List[Tuple[int, int]], max_depth: int, ordered: bool) -> List[Tuple[int, int, tuple, float]]:
+    """Iteratively deepen from depth 1 and return (depth, leaf nodes, result, seconds) per depth."""
+    board = load_position(moves)
+    evaluator = PositionEvaluator(board)
+    candidates = CandidateSet(board)
+    tt = TranspositionTable(1 << 16)
+    orderer = MoveOrderer(board) if ordered else None
+    rows = []
+    for depth in range(1, max_depth + 1):
+        start = time.time()
+        search = MinimaxSearch(board, evaluator.evaluate, depth, tt=tt,
+                               candidates=candidates, orderer=orderer)
+        result = search.search()
+        rows.append((depth, search.nodes_evaluated, result, time.time() - start))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Node counts with and without move ordering')
+    parser.add_argument('--depth', type=int, default=3, help='Deepest iteration to run')
+    args = parser.parse_args()
+
+    totals = {False: [0] * args.depth, True: [0] * args.depth}
+    print(f"{'position':<16}{'depth':>6}{'unordered':>12}{'ordered':>12}{'ratio':>8}  moves")
+    for name, moves in POSITIONS.items():
+        plain = count_nodes(moves, args.depth, ordered=False)
+        ordered = count_nodes(moves, args.depth, ordered=True)
+        for (depth, n_plain, r_plain, _), (_, n_ordered, r_ordered, _) in zip(plain, ordered):
+            totals[False][depth - 1] += n_plain
+            totals[True][depth - 1] += n_ordered
+            print(f"{name:<16}{depth:>6}{n_plain:>12}{n_ordered:>12}{n_ordered / max(1, n_plain):>8.2f}"
+                  f"  {r_plain[1]} / {r_ordered[1]}")
+    for depth in range(1, args.depth + 1):
+        n_plain, n_ordered = totals[False][depth - 1], totals[True][depth - 1]
+        print(f"{'TOTAL':<16}{depth:>6}{n_plain:>12}{n_ordered:>12}{n_ordered / max(1, n_plain):>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Fixed-depth search time for 1/2/4/8 root-parallel workers.
+
+Run with ``python -m src.gomoku.bench.parallel``.
+"""
+import argparse
+import os
+import time
+from ..ai.player import AIPlayer
+from .nodes import POSITIONS, load_position
+
+BENCH_POSITIONS = ['diagonal-three', 'midgame-13', 'block-four']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Root-parallel search speedup')
+    parser.add_argument('--depth', type=int, default=4, help='Fixed search depth')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, depth {args.depth}, positions: {', '.join(BENCH_POSITIONS)}")
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>9}  moves")
+    baseline = None
+    for workers in args.workers:
+        total = 0.0
+        moves = []
+        for name in BENCH_POSITIONS:
+            board = load_position(POSITIONS[name])
+            ai = AIPlayer(board, depth=args.depth, time_limit=float('inf'), workers=workers)
+            if workers > 1:
+                ai._get_pool()  # Exclude process start-up from the timing
+            try:
+                start = time.time()
+                _, move = ai._search_with_time_limit(args.depth)
+                total += time.time() - start
+            finally:
+                ai.close()
+            moves.append(move)
+        baseline = baseline or total
+        print(f"{workers:>8}{total:>10.2f}{baseline / total:>8.2f}x  {moves}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""Engine benchmark over a fixed position corpus, with a regression gate.
+
+Run with ``python -m src.gomoku.bench``. Every corpus position is searched
+by the AI's iterative deepening, once to a fixed depth (reporting nodes,
+nodes per second, time to each depth and the effective branching factor)
+and once per time budget (reporting the depth reached). Results are
+written as JSON; ``--baseline`` compares them against an earlier results
+file and exits non-zero when a deterministic metric (nodes to a depth, a
+solved tactical position) regressed by more than ``--threshold``, or the
+total nodes per second dropped by more than ``--nps-threshold``.
+Per-position timings vary too much between runs and machines to gate on
+and are only reported.
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..board.board import Board
+from ..ai.player import AIPlayer
+from src.gomoku.config import config
+
+BENCH_DATA = Path(__file__).parent.parent.parent.parent / 'data' / 'bench'
+DEFAULT_CORPUS = BENCH_DATA / 'corpus-v1.json'
+RESULTS_VERSION = 1
+# Deepest iteration tried under a time budget
+BUDGET_MAX_DEPTH = 20
+# Timings shorter than this are too noisy to report
+MIN_TIMED_SECONDS = 0.05
+# Default drop of the total nodes per second counted as a regression
+NPS_THRESHOLD = 0.30
+
+
+def load_corpus(path: Path) -> dict:
+    with open(path) as f:
+        corpus = json.load(f)
+    for position in corpus['positions']:
+        position['moves'] = [tuple(move) for move in position['moves']]
+        position['best'] = [tuple(move) for move in position.get('best', [])]
+    return corpus
+
+
+def load_board(moves: List[Tuple[int, int]]) -> Board:
+    board = Board(config.board_size)
+    for move in moves:
+        if not board.make_move(*move):
+            raise ValueError(f"Illegal corpus move {move}")
+    return board
+
+
+def _search(moves: List[Tuple[int, int]], depth: int,
+            time_limit: float) -> Tuple[AIPlayer, Tuple[int, int], float]:
+    """Iteratively deepen from depth 1 on a fresh AI, as a single move of a game would.
+
+    Returns the AI, its move and the seconds the whole search took.
+    """
+    board = load_board(moves)
+    ai = AIPlayer(board, depth=depth, time_limit=time_limit, ponder=False)
+    try:
+        start = time.time()
+        _, move = ai._search_with_time_limit(start_depth=1)
+        elapsed = time.time() - start
+    finally:
+        ai.close()
+    return ai, move, elapsed
+
+
+def bench_depth(moves: List[Tuple[int, int]], depth: int) -> dict:
+    """Per-depth nodes, time and branching factor of a search to ``depth``."""
+    ai, move, _ = _search(moves, depth, float('inf'))
+    rows = []
+    elapsed = 0.0
+    previous = None
+    for iteration in ai.iterations:
+        elapsed += iteration['time']
+        nodes = iteration['nodes']
+        rows.append({
+            'depth': iteration['depth'],
+            'nodes': nodes,
+            'seconds': round(iteration['time'], 4),
+            'time_to_depth': round(elapsed, 4),
+            'nps': round(nodes / iteration['time']) if iteration['time'] > 0 else None,
+            # Growth of the tree from the previous depth
+            'ebf': round(nodes / previous, 3) if previous else None,
+            'move': list(iteration['move']),
+            'score': iteration['score'],
+        })
+        previous = nodes
+    return {'depths': rows, 'move': list(move)}
+
+
+def bench_budget(moves: List[Tuple[int, int]], budget: float) -> dict:
+    """Depth reached, nodes and chosen move within a time budget."""
+    ai, move, elapsed = _search(moves, BUDGET_MAX_DEPTH, budget)
+    nodes = ai.progress.nodes_evaluated
+    seconds = sum(iteration['time'] for iteration in ai.iterations)
+    return {
+        'budget': budget,
+        'depth': ai.iterations[-1]['depth'] if ai.iterations else 0,
+        'nodes': nodes,
+        # Nodes include the depth cut off by the budget, so over the whole search
+        'nps': round(nodes / elapsed) if elapsed > 0 else None,
+        'completed_seconds': round(seconds, 4),
+        'move': list(move),
+    }
+
+
+def run(corpus: dict, depth: int, budgets: List[float], names: Optional[List[str]] = None,
+        repeat: int = 1, log=print) -> dict:
+    """Bench every corpus position; fixed-depth runs keep the fastest of ``repeat``."""
+    results = []
+    for position in corpus['positions']:
+        if names and position['name'] not in names:
+            continue
+        entry = {'name': position['name'], 'category': position['category']}
+        runs = [bench_depth(position['moves'], depth) for _ in range(repeat)]
+        entry.update(min(runs, key=lambda r: r['depths'][-1]['time_to_depth'] if r['depths'] else 0))
+        entry['budgets'] = [bench_budget(position['moves'], budget) for budget in budgets]
+        if position['best']:
+            entry['solved'] = tuple(entry['move']) in position['best']
+        results.append(entry)
+        log(_format_entry(entry))
+    return {
+        'version': RESULTS_VERSION,
+        'corpus_version': corpus['version'],
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'settings': {
+            'depth': depth,
+            'budgets': budgets,
+            'repeat': repeat,
+            'batch_eval': config.ai_batch_eval,
+            'tt_size': config.ai_tt_size,
+            'candidate_radius': config.ai_candidate_radius,
+        },
+        'positions': results,
+        'summary': summarise(results),
+    }
+
+
+def summarise(results: List[dict]) -> dict:
+    nodes = sum(entry['depths'][-1]['nodes'] for entry in results if entry['depths'])
+    seconds = sum(entry['depths'][-1]['time_to_depth'] for entry in results if entry['depths'])
+    tactical = [entry['solved'] for entry in results if 'solved' in entry]
+    return {
+        'nodes': nodes,
+        'seconds': round(seconds, 4),
+        'nps': round(nodes / seconds) if seconds else None,
+        'solved': f"{sum(tactical)}/{len(tactical)}",
+    }
+
+
+def _format_entry(entry: dict) -> str:
+    last = entry['depths'][-1] if entry['depths'] else {}
+    budgets = ' '.join(f"{b['budget']}s:d{b['depth']}" for b in entry['budgets'])
+    solved = {True: ' solved', False: ' MISSED'}.get(entry.get('solved'), '')
+    return (f"{entry['name']:<16}{entry['category']:<10}d{last.get('depth', 0)} "
+            f"{last.get('nodes', 0):>9} nodes {last.get('time_to_depth', 0):>8.3f}s "
+            f"{last.get('nps') or 0:>8} n/s  move {tuple(entry['move'])}{solved}  {budgets}")
+
+
+def compare(results: dict, baseline: dict, threshold: float,
+            nps_threshold: float = NPS_THRESHOLD) -> Tuple[List[str], List[str]]:
+    """Regressions and other differences of ``results`` against ``baseline``.
+
+    Node counts regress when they grow by more than ``threshold`` (a
+    fraction), and a solved tactical position when it is no longer solved;
+    both are the same on any machine. Of the timings only the total nodes
+    per second is gated, when it drops by more than ``nps_threshold``.
+    Per-position time to depth and nodes per second beyond ``threshold``,
+    a shallower depth within a time budget and a changed move are reported
+    as notes.
+    """
+    regressions, notes = [], []
+    if results.get('corpus_version') != baseline.get('corpus_version'):
+        notes.append(f"corpus version {baseline.get('corpus_version')} -> {results.get('corpus_version')}")
+    base_positions: Dict[str, dict] = {entry['name']: entry for entry in baseline['positions']}
+    for entry in results['positions']:
+        base = base_positions.get(entry['name'])
+        if base is None:
+            notes.append(f"{entry['name']}: not in baseline")
+            continue
+        base_depths = {row['depth']: row for row in base['depths']}
+        for row in entry['depths']:
+            old = base_depths.get(row['depth'])
+            if old is None:
+                continue
+            where = f"{entry['name']} depth {row['depth']}"
+            if old['nodes'] and row['nodes'] > old['nodes'] * (1 + threshold):
+                regressions.append(f"{where}: nodes {old['nodes']} -> {row['nodes']} "
+                                   f"(+{row['nodes'] / old['nodes'] - 1:.0%})")
+            if min(old['seconds'], row['seconds']) < MIN_TIMED_SECONDS:
+                continue
+            if old['time_to_depth'] and row['time_to_depth'] > old['time_to_depth'] * (1 + threshold):
+                notes.append(f"{where}: time to depth {old['time_to_depth']} -> {row['time_to_depth']} "
+                             f"(+{row['time_to_depth'] / old['time_to_depth'] - 1:.0%})")
+            if old['nps'] and row['nps'] is not None and row['nps'] < old['nps'] * (1 - threshold):
+                notes.append(f"{where}: nps {old['nps']} -> {row['nps']} "
+                             f"({row['nps'] / old['nps'] - 1:.0%})")
+        base_budgets = {budget['budget']: budget for budget in base.get('budgets', [])}
+        for budget in entry.get('budgets', []):
+            old = base_budgets.get(budget['budget'])
+            if old is not None and budget['depth'] < old['depth']:
+                notes.append(f"{entry['name']}: depth in {budget['budget']}s {old['depth']} -> {budget['depth']}")
+        if entry['move'] != base['move']:
+            notes.append(f"{entry['name']}: move {tuple(base['move'])} -> {tuple(entry['move'])}")
+        if base.get('solved') and entry.get('solved') is False:
+            regressions.append(f"{entry['name']}: no longer solved")
+    old_summary, new_summary = baseline['summary'], results['summary']
+    if old_summary.get('nps') and new_summary.get('nps'):
+        change = f"total nps {old_summary['nps']} -> {new_summary['nps']} " \
+                 f"({new_summary['nps'] / old_summary['nps'] - 1:+.0%})"
+        if new_summary['nps'] < old_summary['nps'] * (1 - nps_threshold):
+            regressions.append(change)
+        else:
+            notes.append(change)
+    return regressions, notes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Engine benchmark over a fixed position corpus')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS, help='Position corpus (JSON)')
+    parser.add_argument('--depth', type=int,
+                        help="Fixed search depth (default: the baseline's, else ai.max_depth)")
+    parser.add_argument('--budget', type=float, nargs='*', default=[1.0], help='Time budgets in seconds')
+    parser.add_argument('--positions', nargs='+', help='Only bench these positions')
+    parser.add_argument('--repeat', type=int, default=1, help='Fixed-depth runs per position, fastest kept')
+    parser.add_argument('--out', type=Path, help='Write the results to this JSON file')
+    parser.add_argument('--results', type=Path, help='Compare an existing results file instead of running')
+    parser.add_argument('--baseline', type=Path, help='Results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Growth of a node count counted as a regression (default 0.10)')
+    parser.add_argument('--nps-threshold', type=float, default=NPS_THRESHOLD,
+                        help=f'Drop of the total nodes per second counted as a regression (default {NPS_THRESHOLD})')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    depth = args.depth or (baseline['settings']['depth'] if baseline else config.ai_max_depth)
+    if args.results:
+        with open(args.results) as f:
+            results = json.load(f)
+    else:
+        corpus = load_corpus(args.corpus)
+        print(f"Corpus v{corpus['version']}: {len(corpus['positions'])} positions, "
+              f"depth {depth}, budgets {args.budget}")
+        results = run(corpus, depth, args.budget, args.positions, args.repeat)
+        summary = results['summary']
+        print(f"Total: {summary['nodes']} nodes in {summary['seconds']:.2f}s "
+              f"({summary['nps']} n/s), tactical solved {summary['solved']}")
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.out}")
+    if baseline is not None:
+        regressions, notes = compare(results, baseline, args.threshold, args.nps_threshold)
+        for note in notes:
+            print(f"  {note}")
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} in nodes or {args.nps_threshold:.0%} "
+              f"in total nps against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+from typing import Dict, Iterator, List, Tuple
+
+DIRECTIONS = [(1,0), (0,1), (1,1), (1,-1)]  # horizontal, vertical, diagonal
+
+
+def build_lines(size: int) -> List[List[Tuple[int, int]]]:
+    """Return every line of the board (rows, columns and both diagonals) as cell lists."""
+    lines = []
+    for dr, dc in DIRECTIONS:
+        for r in range(size):
+            for c in range(size):
+                # Only start a line at a cell whose predecessor is off the board
+                pr, pc = r - dr, c - dc
+                if 0 <= pr < size and 0 <= pc < size:
+                    continue
+                cells = []
+                rr, cc = r, c
+                while 0 <= rr < size and 0 <= cc < size:
+                    cells.append((rr, cc))
+                    rr, cc = rr + dr, cc + dc
+                lines.append(cells)
+    return lines
+
+
+class BitBoard:
+    """Compact board representation built on Python big-int bit masks.
+
+    Cell (row, col) is bit ``row * stride + col`` with ``stride = size + 1``;
+    the extra column is always empty, so shifting a mask by one step in any
+    direction can never wrap a line of stones onto the next row.
+
+    Besides the whole-board mask per player, every line of the board (see
+    ``build_lines``) is mirrored as a small per-player int whose bit ``i`` is
+    the ``i``-th cell of the line, so a line is read with one lookup.
+    """
+
+    def __init__(self, size: int = 15):
+        self.size = size
+        self.stride = size + 1
+        # Shift distance for one step along each of DIRECTIONS
+        self.shifts = (self.stride, 1, self.stride + 1, self.stride - 1)
+        self.full = 0
+        for r in range(size):
+            self.full |= ((1 << size) - 1) << (r * self.stride)
+        # masks[value] for value 1 (black) and 2 (white); index 0 is unused
+        self.masks = [0, 0, 0]
+
+        self.lines = build_lines(size)
+        self.line_lengths = [len(cells) for cells in self.lines]
+        # cell_lines[row][col] -> [(line_id, position in line)] for the four directions
+        self.cell_lines: List[List[List[Tuple[int, int]]]] = [
+            [[] for _ in range(size)] for _ in range(size)]
+        for line_id, cells in enumerate(self.lines):
+            for pos, (r, c) in enumerate(cells):
+                self.cell_lines[r][c].append((line_id, pos))
+        self.line_bits = [[0] * len(self.lines) for _ in range(3)]
+
+    def index(self, row: int, col: int) -> int:
+        """Bit index of a cell."""
+        return row * self.stride + col
+
+    def place(self, row: int, col: int, value: int) -> None:
+        """Put a stone of ``value`` on an empty cell."""
+        self.masks[value] |= 1 << (row * self.stride + col)
+        line_bits = self.line_bits[value]
+        for line_id, pos in self.cell_lines[row][col]:
+            line_bits[line_id] |= 1 << pos
+
+    def remove(self, row: int, col: int, value: int) -> None:
+        """Take a stone of ``value`` off the board."""
+        self.masks[value] &= ~(1 << (row * self.stride + col))
+        line_bits = self.line_bits[value]
+        for line_id, pos in self.cell_lines[row][col]:
+            line_bits[line_id] &= ~(1 << pos)
+
+    def clear(self) -> None:
+        self.masks = [0, 0, 0]
+        self.line_bits = [[0] * len(self.lines) for _ in range(3)]
+
+    def load(self, board) -> None:
+        """Rebuild all masks from a 2D array of cell values."""
+        self.clear()
+        for r in range(self.size):
+            for c in range(self.size):
+                value = int(board[r][c])
+                if value:
+                    self.place(r, c, value)
+
+    def get(self, row: int, col: int) -> int:
+        """Cell value: 0 empty, 1 black, 2 white."""
+        bit = 1 << (row * self.stride + col)
+        if self.masks[1] & bit:
+            return 1
+        if self.masks[2] & bit:
+            return 2
+        return 0
+
+    @property
+    def occupied(self) -> int:
+        return self.masks[1] | self.masks[2]
+
+    @property
+    def empty(self) -> int:
+        return self.full & ~(self.masks[1] | self.masks[2])
+
+    def line_values(self, line_id: int) -> List[int]:
+        """Cell values along a line, in line order."""
+        black = self.line_bits[1][line_id]
+        white = self.line_bits[2][line_id]
+        return [1 if black >> i & 1 else 2 if white >> i & 1 else 0
+                for i in range(self.line_lengths[line_id])]
+
+    def has_five(self, value: int) -> bool:
+        """Whether ``value`` has five or more in a row anywhere on the board."""
+        mask = self.masks[value]
+        for shift in self.shifts:
+            m = mask & (mask >> shift)
+            m &= m >> (2 * shift)
+            if m & (mask >> (4 * shift)):
+                return True
+        return False
+
+    def five_cells(self, value: int) -> int:
+        """Mask of the empty cells where ``value`` would complete five in a row."""
+        mask = self.masks[value]
+        cells = 0
+        for shift in self.shifts:
+            # Bit i of after[k] / before[k]: a stone k steps after / before cell i
+            a1, a2, a3, a4 = mask >> shift, mask >> 2 * shift, mask >> 3 * shift, mask >> 4 * shift
+            b1, b2, b3, b4 = mask << shift, mask << 2 * shift, mask << 3 * shift, mask << 4 * shift
+            after, before = a1 & a2, b1 & b2
+            # The cell is the 1st, 2nd, ... 5th stone of the five
+            cells |= ((after & a3 & a4) | (b1 & after & a3) | (before & after)
+                      | (before & b3 & a1) | (before & b3 & b4))
+        return cells & self.empty
+
+    def check_win(self, row: int, col: int, value: int) -> bool:
+        """Whether the stone at (row, col) is part of five or more in a row."""
+        line_bits = self.line_bits[value]
+        for line_id, _ in self.cell_lines[row][col]:
+            m = line_bits[line_id]
+            m &= m >> 1
+            m &= m >> 2
+            if m & (line_bits[line_id] >> 4):
+                return True
+        return False
+
+    def dilate(self, mask: int, radius: int = 1) -> int:
+        """Grow a mask by ``radius`` steps in all eight directions (Chebyshev distance)."""
+        for _ in range(radius):
+            grown = mask
+            for shift in self.shifts:
+                grown |= (mask << shift) | (mask >> shift)
+            mask = grown & self.full
+        return mask
+
+    def row_range_mask(self, min_row: int, max_row: int, min_col: int, max_col: int) -> int:
+        """Mask of every cell inside a rectangle (inclusive bounds)."""
+        row_mask = ((1 << (max_col - min_col + 1)) - 1) << min_col
+        mask = 0
+        for r in range(min_row, max_row + 1):
+            mask |= row_mask << (r * self.stride)
+        return mask
+
+    def bounding_box(self, mask: int) -> Tuple[int, int, int, int]:
+        """(min_row, max_row, min_col, max_col) of the set bits in a non-empty mask."""
+        min_row = ((mask & -mask).bit_length() - 1) // self.stride
+        max_row = (mask.bit_length() - 1) // self.stride
+        row_mask = (1 << self.size) - 1
+        cols = 0
+        for r in range(min_row, max_row + 1):
+            cols |= (mask >> (r * self.stride)) & row_mask
+        min_col = (cols & -cols).bit_length() - 1
+        max_col = cols.bit_length() - 1
+        return min_row, max_row, min_col, max_col
+
+    def iter_cells(self, mask: int) -> Iterator[Tuple[int, int]]:
+        """Yield (row, col) for every set bit, in row-major order."""
+        stride = self.stride
+        row_mask = (1 << self.size) - 1
+        row_bits = self._row_bits
+        row = 0
+        while mask:
+            bits = mask & row_mask
+            if bits:
+                for col in row_bits[bits]:
+                    yield row, col
+            mask >>= stride
+            row += 1
+
+    @property
+    def _row_bits(self) -> List[Tuple[int, ...]]:
+        """Column indices of the set bits for every possible row value."""
+        table = _ROW_BITS.get(self.size)
+        if table is None:
+            table = [tuple(c for c in range(self.size) if v >> c & 1)
+                     for v in range(1 << self.size)]
+            _ROW_BITS[self.size] = table
+        return table
+
+
+# Per board size: row value -> columns of its set bits
+_ROW_BITS: Dict[int, List[Tuple[int, ...]]] = {}
@@ -1,19 +1,42 @@
 import numpy as np
 from typing import Tuple, Optional
-from .player import Player, PlayerType
+from .player import Player, PlayerType, BLACK, WHITE
 from .win_checker import WinChecker
+from .zobrist import get_zobrist_table
+from .bitboard import BitBoard
 
 class Board:
     def __init__(self, size: int = 15):
         self.size = size
         self.board = np.zeros((size, size), dtype=int)
-        self.current_player = Player(PlayerType.BLACK)  # Human starts as black
+        self.current_player = BLACK  # Human starts as black
         self.move_history = []
+        # Prebuilt move_history entries, _entries[value][row][col], so push() allocates nothing
+        self._entries = [None] + [[[(r, c, player) for c in range(size)] for r in range(size)]
+                                  for player in (BLACK, WHITE)]
         # Hex mapping for coordinates (1-9, a-f)
         self.hex_map = {str(i): i-1 for i in range(1, 10)}  # 1-9
         self.hex_map.update({c: i+9 for i, c in enumerate('abcdef')})  # a-f
         self.reverse_hex_map = {v: k for k, v in self.hex_map.items()}
         self.win_checker = WinChecker(size)
+        self._listeners = []
+        # Zobrist hash of the position, maintained on every make/undo
+        self.zobrist = get_zobrist_table(size)
+        self.hash = 0
+        # Bit-mask mirror of the array used by the search hot path
+        self.bits = BitBoard(size)
+    
+    def add_listener(self, listener) -> None:
+        """Register an object notified of every placed and removed stone.
+
+        Listeners implement ``on_place(row, col, value)`` and
+        ``on_remove(row, col, value)``.
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener) -> None:
+        """Stop notifying a previously registered listener."""
+        self._listeners.remove(listener)
     
     def parse_coordinate(self, coord: str) -> int:
         """Convert hex coordinate to 0-based index."""
@@ -27,18 +50,63 @@ class Board:
         """Make a move on the board. Returns True if move is valid."""
         if not self.is_valid_move(row, col):
             return False
-            
-        # Use provided player or current player
-        player_to_use = player if player is not None else self.current_player
-            
-        # Record the move with the player
-        self.board[row][col] = player_to_use.type.value
-        self.move_history.append((row, col, player_to_use))
-        
-        # Switch player after recording the move
-        self.current_player = self.current_player.get_opponent()
+        self.push((row, col), player.value if player is not None else None)
         return True
     
+    def undo_move(self) -> Optional[Tuple[int, int, Player]]:
+        """Take back the last move. Returns the undone move, or None if there is none."""
+        if not self.move_history:
+            return None
+        return self.pop()
+    
+    def push(self, move: Tuple[int, int], value: Optional[int] = None) -> None:
+        """Play a move known to be legal, for the search: no validation and no allocation.
+
+        ``value`` places a stone of that colour instead of the side to move's;
+        the side to move switches either way. Every push must be matched by a pop.
+        """
+        row, col = move
+        if value is None:
+            value = self.current_player.value
+        self.board[row, col] = value
+        self.move_history.append(self._entries[value][row][col])
+        self.current_player = self.current_player.opponent
+        self.hash ^= self.zobrist.keys[row][col][value] ^ self.zobrist.side
+        self.bits.place(row, col, value)
+        for listener in self._listeners:
+            listener.on_place(row, col, value)
+    
+    def pop(self) -> Tuple[int, int, Player]:
+        """Take back the last pushed move exactly; returns its history entry."""
+        entry = self.move_history.pop()
+        row, col, player = entry
+        value = player.value
+        self.board[row, col] = 0
+        self.current_player = self.current_player.opponent
+        self.hash ^= self.zobrist.keys[row][col][value] ^ self.zobrist.side
+        self.bits.remove(row, col, value)
+        for listener in self._listeners:
+            listener.on_remove(row, col, value)
+        return entry
+    
+    def pass_turn(self) -> None:
+        """Give the move to the other side without placing a stone (the search's null move).
+
+        Not recorded in move_history; call it again to take the pass back.
+        """
+        self.current_player = self.current_player.opponent
+        self.hash ^= self.zobrist.side
+    
+    def recompute_hash(self) -> int:
+        """Rebuild the Zobrist hash from the board array, e.g. after direct edits."""
+        self.hash = self.zobrist.hash_board(self.board, len(self.move_history))
+        return self.hash
+    
+    def sync(self) -> None:
+        """Rebuild the hash and bitboards after the board array was edited directly."""
+        self.recompute_hash()
+        self.bits.load(self.board)
+    
     def is_valid_move(self, row: int, col: int) -> bool:
         """Check if a move is valid."""
         return (0 <= row < self.size and 
@@ -50,14 +118,14 @@ class Board:
         value = self.board[row][col]
         if value == 0:
             return None
-        return Player(PlayerType(value))
+        return BLACK if value == 1 else WHITE
     
     def check_win(self, row: int, col: int) -> bool:
         """Check if the last move resulted in a win."""
         player = self.get_piece_at(row, col)
         if not player:
             return False
-        return self.win_checker.check_win(self.board.tolist(), row, col, player.type.value)
+        return self.win_checker.check_win(self.board, row, col, player.value)
     
     def get_valid_moves(self) -> list[Tuple[int, int]]:
         """Get all valid moves on the board."""
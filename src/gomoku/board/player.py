@@ -1,19 +1,45 @@
 from enum import Enum
-from typing import Tuple
+from typing import Dict
 
 class PlayerType(Enum):
     BLACK = 1
     WHITE = 2
 
 class Player:
-    def __init__(self, player_type: PlayerType):
-        self.type = player_type
-        self.symbol = '●' if player_type == PlayerType.BLACK else '○'
+    """A side of the game. There is one instance per PlayerType, so creating
+    or switching players never allocates and players compare by identity."""
+
+    __slots__ = ('type', 'symbol', 'value', 'opponent')
+    _instances: Dict[PlayerType, 'Player'] = {}
+
+    def __new__(cls, player_type: PlayerType):
+        player = cls._instances.get(player_type)
+        if player is None:
+            player = super().__new__(cls)
+            player.type = player_type
+            player.value = player_type.value
+            player.symbol = '●' if player_type == PlayerType.BLACK else '○'
+            player.opponent = None
+            cls._instances[player_type] = player
+        return player
     
     def get_opponent(self) -> 'Player':
-        return Player(PlayerType.WHITE if self.type == PlayerType.BLACK else PlayerType.BLACK)
+        return self.opponent
     
     def __eq__(self, other):
         if not isinstance(other, Player):
             return False
-        return self.type == other.type 
\ No newline at end of file
+        return self.type == other.type
+
+    def __hash__(self):
+        return hash(self.type)
+
+    def __reduce__(self):
+        # Unpickling returns the singleton of the other process
+        return Player, (self.type,)
+
+
+BLACK = Player(PlayerType.BLACK)
+WHITE = Player(PlayerType.WHITE)
+BLACK.opponent = WHITE
+WHITE.opponent = BLACK
@@ -1,5 +1,6 @@
 from typing import Tuple
 from .player import Player
+from .bitboard import BitBoard
 
 class WinChecker:
     """Handles win detection logic for Gomoku."""
@@ -8,11 +9,11 @@ class WinChecker:
         self.size = board_size
         self.directions = [(1,0), (0,1), (1,1), (1,-1)]  # horizontal, vertical, diagonal
     
-    def check_win(self, board: list[list[int]], row: int, col: int, player_value: int) -> bool:
+    def check_win(self, board, row: int, col: int, player_value: int) -> bool:
         """Check if the last move resulted in a win.
         
         Args:
-            board: The game board as a 2D list
+            board: The game board as a 2D list, or a BitBoard
             row: Row of the last move
             col: Column of the last move
             player_value: Value representing the player (1 for black, 2 for white)
@@ -20,6 +21,8 @@ class WinChecker:
         Returns:
             bool: True if the move resulted in a win
         """
+        if isinstance(board, BitBoard):
+            return board.check_win(row, col, player_value)
         for dr, dc in self.directions:
             count = 1
             # Check forward direction
@@ -0,0 +1,36 @@
+import random
+from typing import Dict, List
+
+class ZobristTable:
+    """Random 64-bit keys for every (cell, stone) pair plus a side-to-move key."""
+
+    def __init__(self, size: int, seed: int = 0x5EED):
+        rng = random.Random(seed)
+        # keys[row][col][value]; value 0 (empty) never contributes to the hash
+        self.keys: List[List[List[int]]] = [
+            [[0, rng.getrandbits(64), rng.getrandbits(64)] for _ in range(size)]
+            for _ in range(size)
+        ]
+        self.side = rng.getrandbits(64)
+
+    def hash_board(self, board, moves_played: int) -> int:
+        """Compute the hash of a position from scratch."""
+        key = 0
+        size = len(self.keys)
+        for r in range(size):
+            for c in range(size):
+                value = int(board[r][c])
+                if value:
+                    key ^= self.keys[r][c][value]
+        if moves_played % 2:
+            key ^= self.side
+        return key
+
+
+_tables: Dict[int, ZobristTable] = {}
+
+def get_zobrist_table(size: int) -> ZobristTable:
+    """Return the shared Zobrist table for a board size."""
+    if size not in _tables:
+        _tables[size] = ZobristTable(size)
+    return _tables[size]
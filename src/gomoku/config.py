@@ -1,6 +1,7 @@
+import contextlib
 import yaml
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 
 class Config:
     _instance = None
@@ -23,6 +24,16 @@ class Config:
         """Get the time limit per player in seconds."""
         return self._config['game']['time_limit']
 
+    @property
+    def game_expected_moves(self) -> int:
+        """Get the number of moves per player the game clock is budgeted for."""
+        return self._config['game'].get('expected_moves', 30)
+
+    @property
+    def game_time_reserve(self) -> float:
+        """Get the seconds of the game clock the AI keeps in reserve."""
+        return self._config['game'].get('time_reserve', 2.0)
+
     @property
     def ai_max_depth(self) -> int:
         """Get the maximum AI search depth."""
@@ -61,5 +72,158 @@ class Config:
     def lose_score_threshold(self) -> int:
         return self._config['ai'].get('lose_score_threshold', -100000)
 
+    @property
+    def ai_incremental_eval(self) -> bool:
+        """Whether the evaluator is updated incrementally from board deltas."""
+        return self._config['ai'].get('incremental_eval', True)
+
+    @property
+    def ai_batch_eval(self) -> bool:
+        """Whether frontier nodes score their children with the batched evaluator."""
+        return self._config['ai'].get('batch_eval', True)
+
+    @property
+    def ai_tt_size(self) -> int:
+        """Get the number of transposition table buckets."""
+        return self._config['ai'].get('tt_size', 262144)
+
+    @property
+    def ai_candidate_radius(self) -> int:
+        """Get the distance from existing stones within which moves are generated."""
+        return self._config['ai'].get('candidate_radius', 2)
+
+    @property
+    def ai_workers(self) -> int:
+        """Get the number of worker processes used by the search."""
+        return self._config['ai'].get('workers', 1)
+
+    @property
+    def ai_threat_search(self) -> bool:
+        """Whether the threat-space solver runs before the main search."""
+        return self._config['ai'].get('threat_search', True)
+
+    @property
+    def ai_threat_time_limit(self) -> float:
+        """Get the threat solver's time budget per move in seconds."""
+        return self._config['ai'].get('threat_time_limit', 0.5)
+
+    @property
+    def ai_threat_max_nodes(self) -> int:
+        """Get the threat solver's node budget per move."""
+        return self._config['ai'].get('threat_max_nodes', 20000)
+
+    @property
+    def ai_threat_max_threes(self) -> int:
+        """Get the number of open threes a forcing sequence may use."""
+        return self._config['ai'].get('threat_max_threes', 1)
+
+    @property
+    def ai_quiescence_depth(self) -> int:
+        """Get the number of forcing plies searched past the horizon (0 disables quiescence)."""
+        return self._config['ai'].get('quiescence_depth', 4)
+
+    @property
+    def ai_quiescence_nodes(self) -> int:
+        """Get the quiescence node budget per horizon node."""
+        return self._config['ai'].get('quiescence_nodes', 32)
+
+    @property
+    def ai_lmr_moves(self) -> int:
+        """Get the number of moves searched to full depth before late move reductions (0 disables them)."""
+        return self._config['ai'].get('lmr_moves', 4)
+
+    @property
+    def ai_null_move_reduction(self) -> int:
+        """Get the depth reduction of null-move searches (0 disables null-move pruning)."""
+        return self._config['ai'].get('null_move_reduction', 2)
+
+    @property
+    def ai_book(self) -> bool:
+        """Whether the AI plays moves from the opening book."""
+        return self._config['ai'].get('book', True)
+
+    @property
+    def ai_book_path(self) -> Path:
+        """Get the opening book file."""
+        return self._project_path(self._config['ai'].get('book_path', 'data/opening_book.bin'))
+
+    @property
+    def ai_ponder(self) -> bool:
+        """Whether the AI searches on the opponent's time."""
+        return self._config['ai'].get('ponder', True)
+
+    @property
+    def ai_ponder_replies(self) -> int:
+        """Get the number of opponent replies searched when pondering."""
+        return self._config['ai'].get('ponder_replies', 4)
+
+    @property
+    def ai_pattern_cache(self) -> Path:
+        """Get the file caching the evaluator's pattern tables."""
+        return self._project_path(self._config['ai'].get('pattern_cache', '.cache/patterns.npz'))
+
+    @property
+    def server_workers(self) -> int:
+        """Get the number of threads searching AI moves in the web server."""
+        return self._server().get('workers', 2)
+
+    @property
+    def server_max_queue(self) -> int:
+        """Get the number of AI moves that may wait for a worker."""
+        return self._server().get('max_queue', 16)
+
+    @property
+    def server_max_sessions(self) -> int:
+        """Get the number of games the web server keeps at once."""
+        return self._server().get('max_sessions', 100)
+
+    @property
+    def server_session_timeout(self) -> float:
+        """Get the idle time in seconds after which a game is dropped."""
+        return self._server().get('session_timeout', 1800)
+
+    @property
+    def server_ponder(self) -> bool:
+        """Whether web server games ponder on the player's time."""
+        return self._server().get('ponder', False)
+
+    @property
+    def log_level(self) -> str:
+        """Get the logging level name."""
+        return (self._config.get('logging') or {}).get('level', 'INFO').upper()
+
+    def _server(self) -> Dict[str, Any]:
+        return self._config.get('server') or {}
+
+    def _project_path(self, value: str) -> Path:
+        """Resolve a configured path relative to the project root."""
+        path = Path(value)
+        return path if path.is_absolute() else Path(__file__).parent.parent.parent / path
+
 # Create a global config instance
-config = Config() 
\ No newline at end of file
+config = Config()
+
+# Engine settings that go to the AIPlayer rather than the ``ai`` section
+PLAYER_KEYS = ('depth', 'time_limit')
+
+
+def parse_engine(spec: str) -> Dict[str, Any]:
+    """Settings of an engine from ``key=value,key=value``; values are parsed as YAML scalars."""
+    settings = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        key, _, value = item.partition('=')
+        settings[key.strip()] = yaml.safe_load(value)
+    return settings
+
+
+@contextlib.contextmanager
+def engine_config(settings: Dict[str, Any]) -> Iterator[None]:
+    """Apply an engine's ``ai`` overrides to the global config for the duration of the block."""
+    ai = config._config['ai']
+    saved = dict(ai)
+    ai.update({key: value for key, value in settings.items() if key not in PLAYER_KEYS})
+    try:
+        yield
+    finally:
+        ai.clear()
+        ai.update(saved)
@@ -0,0 +1,214 @@
+"""Offline analysis of many positions with the engine.
+
+Run with ``python analyze.py``. Positions come from a file or standard
+input, either as a binary game-record file, where every position before a
+move is analysed and the move actually played is reported next to the
+engine's, or as text with one position per line: 0-based ``row,col``
+pairs, board notation (``h8 i9``) or a JSON object with ``moves`` and an
+optional ``id``. Positions are spread over worker processes with a depth
+and time budget each, and one JSON line per position is written as soon
+as it finishes. With ``--resume``, positions already in the output file
+are skipped and the new lines are appended.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+from ..board.board import Board
+from ..ai.player import AIPlayer
+from .records import MAGIC, iter_records, parse_moves
+from src.gomoku.config import config, engine_config, parse_engine
+
+logger = logging.getLogger(__name__)
+
+Move = Tuple[int, int]
+# (id, moves from Black's first, move played next in the game or None)
+Position = Tuple[str, List[Move], Optional[Move]]
+
+# Positions queued per worker, so the input is read as the analysis goes
+QUEUED_PER_WORKER = 4
+
+
+def parse_position(line: str, size: int = 15) -> Tuple[Optional[str], List[Move]]:
+    """(id or None, moves) of a text line: a JSON object, ``row,col`` pairs or board notation.
+
+    Raises ValueError for a move that is not a pair of coordinates on the board.
+    """
+    if line.startswith('{'):
+        data = json.loads(line)
+        position_id = data.get('id')
+        return (None if position_id is None else str(position_id),
+                [_check_move(move, size) for move in data['moves']])
+    if ',' in line:
+        return None, [_check_move([int(x) for x in move.split(',')], size) for move in line.split()]
+    return None, parse_moves(line, size)
+
+
+def _check_move(move, size: int) -> Move:
+    if (not isinstance(move, list) or len(move) != 2
+            or not all(type(x) is int and 0 <= x < size for x in move)):
+        raise ValueError(f"Bad move {move!r}")
+    return move[0], move[1]
+
+
+def read_positions(stream: BinaryIO, size: int = 15) -> Iterator[Position]:
+    """Positions of a record file or a text file, read lazily from a binary stream.
+
+    Text lines that cannot be parsed are logged and skipped.
+    """
+    if stream.peek(len(MAGIC))[:len(MAGIC)] == MAGIC:
+        for game, record in enumerate(iter_records(stream), 1):
+            for ply, move in enumerate(record.moves):
+                yield f"{game}:{ply}", record.moves[:ply], move
+        return
+    for number, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8'), 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            position_id, moves = parse_position(line, size)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("Skipping line %d: %s", number, e)
+            continue
+        yield position_id if position_id is not None else str(number), moves, None
+
+
+def analyze_position(position: Position, depth: int, time_limit: float,
+                     settings: Dict[str, object]) -> dict:
+    """The engine's move for one position, with its score and search statistics.
+
+    Every position gets a fresh engine, so results do not depend on the
+    order positions are analysed in.
+    """
+    position_id, moves, played = position
+    result = {'id': position_id}
+    board = Board(config.board_size)
+    for move in moves:
+        if not board.make_move(*move):
+            result['error'] = f"Illegal move {list(move)}"
+            return result
+    if (moves and board.check_win(*moves[-1])) or not board.get_valid_moves():
+        result['error'] = "Game is over"
+        return result
+    random.seed(0)
+    with engine_config(settings):
+        ai = AIPlayer(board, depth=depth, time_limit=time_limit, workers=1, ponder=False)
+        try:
+            move = ai.get_move()
+        finally:
+            ai.close()
+    stats = ai.stats
+    result.update({
+        'side': board.current_player.value,
+        'move': list(move),
+        'score': stats.score,
+        'depth': stats.depth,
+        'nodes': stats.nodes,
+        'time': round(stats.time, 4),
+        'source': stats.source,
+        'pv': [list(step) for step in ai.last_pv] if stats.source == 'search' else [list(move)],
+    })
+    if played is not None:
+        result['played'] = list(played)
+    return result
+
+
+def completed_ids(path: Path) -> Set[str]:
+    """Ids of the positions in an output file, dropping a last line cut short by an interruption."""
+    done = set()
+    with open(path, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            f.truncate(end)
+    for line in data[:end].splitlines():
+        if line.strip():
+            done.add(json.loads(line)['id'])
+    return done
+
+
+def run_analysis(positions: Iterator[Position], out: TextIO, depth: int, time_limit: float,
+                 workers: Optional[int] = None, settings: Optional[Dict[str, object]] = None,
+                 skip: Set[str] = frozenset()) -> int:
+    """Analyse ``positions`` in a process pool, writing each result to ``out`` as it finishes.
+
+    Positions whose id is in ``skip`` are not analysed. Returns the number
+    of positions analysed.
+    """
+    settings = settings or {}
+    workers = workers or os.cpu_count() or 1
+    limit = QUEUED_PER_WORKER * workers
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Dict[Future, str] = {}  # Future -> position id
+        try:
+            for position in positions:
+                if position[0] in skip:
+                    continue
+                if len(pending) >= limit:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    count += _write(done, pending, out)
+                future = executor.submit(analyze_position, position, depth, time_limit, settings)
+                pending[future] = position[0]
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                count += _write(done, pending, out)
+        finally:
+            for future in pending:
+                future.cancel()
+    return count
+
+
+def _write(futures, pending: Dict[Future, str], out: TextIO) -> int:
+    """Write the results of finished futures, an error line for a position that failed."""
+    for future in futures:
+        position_id = pending.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning("Position %s failed: %s", position_id, e)
+            result = {'id': position_id, 'error': str(e) or type(e).__name__}
+        out.write(json.dumps(result) + '\n')
+    out.flush()
+    return len(futures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyse positions or game records with the engine')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='Record file or text file of positions (default: standard input)')
+    parser.add_argument('--out', type=Path, help='JSON-lines output file (default: standard output)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip the positions already in --out and append to it')
+    parser.add_argument('--depth', type=int, default=config.ai_max_depth, help='Search depth per position')
+    parser.add_argument('--time', type=float, default=config.ai_time_limit,
+                        help='Seconds per position')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--engine', default='', help='Overrides of the ai settings, e.g. "threat_search=false"')
+    args = parser.parse_args()
+    if args.resume and args.out is None:
+        parser.error('--resume needs --out')
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    skip = completed_ids(args.out) if args.resume and args.out.exists() else set()
+    stream = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    out = open(args.out, 'a' if args.resume else 'w') if args.out else sys.stdout
+    try:
+        count = run_analysis(read_positions(stream, config.board_size), out, args.depth, args.time,
+                             args.workers, parse_engine(args.engine), skip)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    print(f"Analysed {count} positions" + (f", {len(skip)} already done" if skip else ''), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
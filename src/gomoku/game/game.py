@@ -9,8 +9,11 @@ from src.gomoku.config import config
 
 
 class Game:
-    def __init__(self):
-        """Initialize a new game with settings from config."""
+    def __init__(self, ponder: Optional[bool] = None):
+        """Initialize a new game with settings from config.
+        
+        ``ponder`` overrides whether the AI thinks on the human's time.
+        """
         self.board = Board()
         self.human_player = Player(PlayerType.BLACK)
         self.ai_player = Player(PlayerType.WHITE)
@@ -18,29 +21,50 @@ class Game:
         self.game_over = False
         self.winner = None
         
-        # Initialize AI with config values
+        # Initialize time manager with config values
+        self.time_manager = TimeManager(config.game_time_limit,
+                                        expected_moves=config.game_expected_moves,
+                                        reserve=config.game_time_reserve)
+        
+        # Initialize AI with config values; it budgets its time from the game clock
         self.ai = AIPlayer(
             self.board,
             depth=config.ai_max_depth,
-            time_limit=config.ai_time_limit
+            time_limit=config.ai_time_limit,
+            ponder=ponder,
+            clock=self.time_manager
         )
         
-        # Initialize time manager with config value
-        self.time_manager = TimeManager(config.game_time_limit)
-        
         self.formatter = BoardFormatter(self.board)
+        # State shown while the AI searches on the board
+        self._thinking_state: Optional[dict] = None
     
     def get_time_remaining(self, player: Player) -> int:
         """Get remaining time for a player in seconds."""
         if self.game_over:
-            return self.time_manager.time_remaining[player.type]
+            return int(self.time_manager.time_remaining[player.type])
         return self.time_manager.get_time_remaining(player.type)
     
     def make_move(self, row: int, col: int) -> Tuple[bool, Optional[str]]:
-        """Make a move at the specified position."""
+        """Make a move at the specified position, followed by the AI's reply."""
+        success, error = self.make_human_move(row, col)
+        if not success or self.game_over:
+            return success, error
+        return self.make_ai_move()
+    
+    def make_human_move(self, row: int, col: int) -> Tuple[bool, Optional[str]]:
+        """Play the human's move only; the AI is then to move.
+        
+        Until ``make_ai_move`` returns, ``get_game_state`` reports the
+        position after this move, since the search plays and takes back
+        moves on the board while it runs.
+        """
         if self.game_over:
             return False, "Game is already over"
         
+        if self.current_player != self.human_player:
+            return False, "Not your turn"
+        
         if not self.board.is_valid_move(row, col):
             return False, "Invalid move"
         
@@ -48,6 +72,7 @@ class Game:
         success = self.board.make_move(row, col)
         if not success:
             return False, "Invalid move"
+        self.time_manager.switch_player(self.ai_player.type)
         
         # Check if human player won
         if self.board.check_win(row, col):
@@ -55,9 +80,27 @@ class Game:
             self.winner = self.human_player
             return True, None
         
-        # Make AI's move
-        ai_row, ai_col = self.ai.get_move()
+        self.current_player = self.ai_player
+        self._thinking_state = self.get_game_state()
+        return True, None
+    
+    def undo_human_move(self) -> None:
+        """Take back a human move the AI has not replied to yet."""
+        if self.current_player == self.ai_player and not self.game_over:
+            self.board.undo_move()
+            self.time_manager.switch_player(self.human_player.type)
+            self.current_player = self.human_player
+            self._thinking_state = None
+    
+    def make_ai_move(self) -> Tuple[bool, Optional[str]]:
+        """Search and play the AI's move."""
+        try:
+            ai_row, ai_col = self.ai.get_move()
+        finally:
+            self._thinking_state = None
         success = self.board.make_move(ai_row, ai_col)
+        self.time_manager.switch_player(self.human_player.type)
+        self.current_player = self.human_player
         if not success:
             return False, "AI made an invalid move"
         
@@ -67,10 +110,14 @@ class Game:
             self.winner = self.ai_player
             return True, None
         
+        # Think about the human's reply while they do
+        self.ai.start_pondering()
         return True, None
     
     def get_game_state(self) -> dict:
         """Get current game state for web interface."""
+        if self._thinking_state is not None:
+            return dict(self._thinking_state, time_remaining=self.time_manager.get_time_state())
         # Get the last moves for display
         last_move = None
         if self.board.move_history:
@@ -0,0 +1,194 @@
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+from .game import Game
+
+
+class QueueFull(Exception):
+    """Raised when an AI move is submitted while the runner's queue is full."""
+
+
+class AIMoveJob:
+    """One AI move searched in the background, with its live progress."""
+
+    def __init__(self, game: Game, runner: 'AIMoveRunner'):
+        self.id = uuid.uuid4().hex
+        self.game = game
+        self.runner = runner
+        self.status = 'pending'  # pending, running, done or error
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.done = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def run(self) -> None:
+        self.status = 'running'
+        self.started = time.time()
+        try:
+            success, error = self.game.make_ai_move()
+            if not success:
+                self.error = error
+        except Exception as e:
+            self.error = str(e)
+        self.status = 'error' if self.error else 'done'
+        self.finish()
+
+    def add_done_callback(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` once the job has finished, right away if it already has."""
+        with self._lock:
+            if not self.done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def finish(self) -> None:
+        """Mark the job finished and run its done callbacks."""
+        self.finished = time.time()
+        with self._lock:
+            self.done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def to_dict(self) -> dict:
+        """JSON view of the job: queue position or progress, then the game state once it is done."""
+        result = {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': self.game.ai.progress.snapshot() if self.status != 'pending' else None,
+        }
+        if self.status == 'pending':
+            result['queue_position'] = self.runner.position(self)
+        elif self.status == 'error':
+            result['error'] = self.error
+        elif self.status == 'done':
+            result['state'] = self.game.get_game_state()
+        return result
+
+
+class AIMoveRunner:
+    """Runs AI moves on a fixed pool of threads so requests return right after the human move.
+
+    Jobs wait in a FIFO queue of at most ``max_queue`` entries; submitting
+    to a full queue raises QueueFull so callers can push back instead of
+    piling up work. Callers submit at most one job per game at a time, so
+    FIFO order gives every session one turn per round.
+    """
+
+    def __init__(self, workers: int = 1, max_queue: int = 16, keep: int = 100):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.keep = keep  # Finished jobs kept for clients that poll late
+        self.jobs: Dict[str, AIMoveJob] = {}
+        self.queue: Deque[AIMoveJob] = deque()
+        self.condition = threading.Condition()
+        self.stopping = False
+        self.running = 0
+        # Admission and latency counters
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.peak_queue_depth = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.threads: List[threading.Thread] = [
+            threading.Thread(target=self._work, name=f'gomoku-ai-{i}', daemon=True)
+            for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, game: Game) -> AIMoveJob:
+        """Queue the AI move of ``game``; raises QueueFull when the queue is full."""
+        with self.condition:
+            if len(self.queue) >= self.max_queue:
+                self.rejected += 1
+                raise QueueFull()
+            self._prune()
+            job = AIMoveJob(game, self)
+            self.jobs[job.id] = job
+            self.queue.append(job)
+            self.submitted += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, len(self.queue))
+            self.condition.notify()
+            return job
+
+    def get(self, job_id: str) -> Optional[AIMoveJob]:
+        with self.condition:
+            return self.jobs.get(job_id)
+
+    def position(self, job: AIMoveJob) -> Optional[int]:
+        """1-based position of a pending job in the queue, or None once it has started."""
+        with self.condition:
+            for index, queued in enumerate(self.queue):
+                if queued is job:
+                    return index + 1
+            return None
+
+    def cancel(self, job: AIMoveJob) -> bool:
+        """Drop a job that has not started yet; returns whether it was dropped."""
+        with self.condition:
+            if job not in self.queue:
+                return False
+            self.queue.remove(job)
+            del self.jobs[job.id]
+            job.status = 'error'
+            job.error = 'Cancelled'
+        job.finish()
+        return True
+
+    def _work(self) -> None:
+        while True:
+            with self.condition:
+                while not self.queue and not self.stopping:
+                    self.condition.wait()
+                if self.stopping:
+                    return
+                job = self.queue.popleft()
+                self.running += 1
+            job.run()
+            with self.condition:
+                self.running -= 1
+                self.total_wait += job.started - job.created
+                self.total_run += job.finished - job.started
+                if job.error:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+
+    def _prune(self) -> None:
+        finished = [job for job in self.jobs.values() if job.finished is not None]
+        finished.sort(key=lambda job: job.finished)
+        for job in finished[:max(0, len(finished) - self.keep)]:
+            del self.jobs[job.id]
+
+    def shutdown(self) -> None:
+        """Finish the running jobs and stop the worker threads; queued jobs are dropped."""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+    def get_stats(self) -> dict:
+        """Get the admission and queue statistics."""
+        with self.condition:
+            finished = self.completed + self.failed
+            return {
+                'workers': self.workers,
+                'running': self.running,
+                'queue_depth': len(self.queue),
+                'queue_capacity': self.max_queue,
+                'peak_queue_depth': self.peak_queue_depth,
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+                'failed': self.failed,
+                'avg_wait': self.total_wait / finished if finished else 0.0,
+                'avg_run': self.total_run / finished if finished else 0.0,
+            }
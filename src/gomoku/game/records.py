@@ -0,0 +1,404 @@
+"""Compact binary game records: an append-only file of finished games.
+
+A record file starts with a header (magic and board size) followed by one
+record per game: its result, move count and metadata length, the metadata
+as UTF-8 JSON, then one byte per move, the cell index ``row * size + col``.
+A file may end with an index footer listing the offset of every record, so
+games can be read by number; appending to the file moves the footer to the
+new end. Readers stream records one at a time from any binary stream, so
+files of millions of games are never loaded whole.
+
+Import RIF databases (renju.net XML) and RenLib-style text (``h8 i9 j10``
+per line) with ``python -m src.gomoku.game.records``.
+"""
+import argparse
+import json
+import logging
+import mmap
+import re
+import struct
+import sys
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from ..board.board import Board
+from src.gomoku.config import config
+
+logger = logging.getLogger(__name__)
+
+Move = Tuple[int, int]
+
+MAGIC = b'GMKGAME1'
+# Header: magic, board size
+HEADER = struct.Struct('<8sB')
+# Record: result, number of moves, metadata length; followed by the metadata and the moves
+RECORD = struct.Struct('<BHH')
+INDEX_MAGIC = b'GMKINDX1'
+# Footer: index magic and record count, then a 64-bit offset per record
+INDEX = struct.Struct('<8sI')
+OFFSET = struct.Struct('<Q')
+# Trailer closing the footer: offset of the footer, index magic
+TRAILER = struct.Struct('<Q8s')
+
+# Results; the winners match PlayerType values
+UNKNOWN = 0
+BLACK_WIN = 1
+WHITE_WIN = 2
+DRAW = 3
+RESULT_NAMES = {UNKNOWN: '*', BLACK_WIN: '1-0', WHITE_WIN: '0-1', DRAW: '1/2-1/2'}
+
+
+class RecordFormatError(ValueError):
+    """Raised for a file or record that is not in the expected format."""
+
+
+class GameRecord:
+    """One game: its moves from Black's first, result and free-form metadata."""
+
+    def __init__(self, moves: List[Move], result: int = UNKNOWN,
+                 metadata: Optional[Dict[str, object]] = None):
+        self.moves = moves
+        self.result = result
+        self.metadata = metadata if metadata is not None else {}
+
+    def __eq__(self, other):
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return (self.moves, self.result, self.metadata) == (other.moves, other.result, other.metadata)
+
+    def __repr__(self):
+        return f"GameRecord({len(self.moves)} moves, {RESULT_NAMES[self.result]}, {self.metadata})"
+
+    @classmethod
+    def from_board(cls, board: Board, result: Optional[int] = None, **metadata) -> 'GameRecord':
+        """Record the moves played on ``board``; the result defaults to a win by the last move, if any."""
+        moves = [(row, col) for row, col, _ in board.move_history]
+        if result is None:
+            result = UNKNOWN
+            if moves and board.check_win(*moves[-1]):
+                result = board.move_history[-1][2].value
+        return cls(moves, result, metadata)
+
+    def replay(self, size: int = 15) -> Board:
+        """A board with the record's moves played; raises RecordFormatError on an illegal move."""
+        board = Board(size)
+        for move in self.moves:
+            if not board.make_move(*move):
+                raise RecordFormatError(f"Illegal move {move} in game record")
+        return board
+
+
+def encode(record: GameRecord, size: int) -> bytes:
+    """The bytes of one record on a ``size`` board."""
+    cells = set()
+    for row, col in record.moves:
+        if not (0 <= row < size and 0 <= col < size):
+            raise RecordFormatError(f"Move {(row, col)} is off a {size}x{size} board")
+        cells.add(row * size + col)
+    if len(cells) != len(record.moves):
+        raise RecordFormatError("Game record plays a cell twice")
+    if record.result not in RESULT_NAMES:
+        raise RecordFormatError(f"Unknown result {record.result}")
+    metadata = json.dumps(record.metadata, separators=(',', ':')).encode() if record.metadata else b''
+    return (RECORD.pack(record.result, len(record.moves), len(metadata)) + metadata
+            + bytes(row * size + col for row, col in record.moves))
+
+
+def _read_exact(stream: BinaryIO, count: int) -> bytes:
+    data = stream.read(count)
+    if len(data) != count:
+        raise RecordFormatError("Truncated game record")
+    return data
+
+
+def _read_header(stream: BinaryIO) -> int:
+    data = stream.read(HEADER.size)
+    if len(data) != HEADER.size:
+        raise RecordFormatError("Not a game record file")
+    magic, size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise RecordFormatError("Not a game record file")
+    return size
+
+
+def iter_records(stream: BinaryIO) -> Iterator[GameRecord]:
+    """Stream the records of a record file open for binary reading, from its header on.
+
+    Stops at the end of the stream or at the index footer; only one record
+    is held at a time, and the stream need not be seekable.
+    """
+    size = _read_header(stream)
+    while True:
+        first = stream.read(1)
+        if not first:
+            return
+        if first[0] not in RESULT_NAMES:
+            if first + _read_exact(stream, len(INDEX_MAGIC) - 1) != INDEX_MAGIC:
+                raise RecordFormatError("Corrupt game record")
+            return
+        result, count, meta_length = RECORD.unpack(first + _read_exact(stream, RECORD.size - 1))
+        metadata = json.loads(_read_exact(stream, meta_length)) if meta_length else {}
+        cells = _read_exact(stream, count)
+        yield GameRecord([divmod(cell, size) for cell in cells], result, metadata)
+
+
+def read_records(path: Path) -> Iterator[GameRecord]:
+    """Stream the records of a record file; ``-`` reads standard input."""
+    if str(path) == '-':
+        yield from iter_records(sys.stdin.buffer)
+        return
+    with open(path, 'rb') as f:
+        yield from iter_records(f)
+
+
+def _read_footer(f: BinaryIO) -> Optional[Tuple[int, List[int]]]:
+    """(footer offset, record offsets) of a seekable record file, or None without a footer."""
+    end = f.seek(0, 2)
+    if end < HEADER.size + INDEX.size + TRAILER.size:
+        return None
+    f.seek(end - TRAILER.size)
+    start, magic = TRAILER.unpack(f.read(TRAILER.size))
+    if magic != INDEX_MAGIC:
+        return None
+    f.seek(start)
+    magic, count = INDEX.unpack(_read_exact(f, INDEX.size))
+    if magic != INDEX_MAGIC or start + INDEX.size + count * OFFSET.size + TRAILER.size != end:
+        raise RecordFormatError("Corrupt game record index")
+    data = _read_exact(f, count * OFFSET.size)
+    return start, [offset for offset, in OFFSET.iter_unpack(data)]
+
+
+class RecordWriter:
+    """Appends games to a record file, creating it when it is missing or empty.
+
+    With ``index`` set, the footer is rewritten on ``close`` to cover every
+    record, the existing ones included. Use as a context manager.
+    """
+
+    def __init__(self, path: Path, size: int = 15, index: bool = True):
+        if size * size > 256:
+            raise ValueError(f"Cells of a {size}x{size} board do not fit in one byte")
+        self.path = Path(path)
+        self.size = size
+        self.index = index
+        self.count = 0  # Records written by this writer
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        self._file.seek(0)
+        if not self._file.read(1):
+            self._file.write(HEADER.pack(MAGIC, size))
+            self.offsets: List[int] = []
+        else:
+            self._file.seek(0)
+            if _read_header(self._file) != size:
+                self._file.close()
+                raise RecordFormatError(f"{self.path} holds games on another board size")
+            self.offsets = self._existing_offsets()
+        self._file.seek(0, 2)
+
+    def _existing_offsets(self) -> List[int]:
+        """Offsets of the records already in the file, dropping its footer."""
+        footer = _read_footer(self._file)
+        if footer is not None:
+            start, offsets = footer
+            self._file.truncate(start)
+            return offsets
+        if not self.index:
+            return []
+        offsets = []
+        self._file.seek(HEADER.size)
+        while True:
+            offset = self._file.tell()
+            data = self._file.read(RECORD.size)
+            if not data:
+                return offsets
+            if len(data) != RECORD.size:
+                raise RecordFormatError("Truncated game record")
+            _, count, meta_length = RECORD.unpack(data)
+            offsets.append(offset)
+            self._file.seek(meta_length + count, 1)
+
+    def write(self, record: GameRecord) -> int:
+        """Append a record; returns its number in the file."""
+        data = encode(record, self.size)
+        self.offsets.append(self._file.tell())
+        self._file.write(data)
+        self.count += 1
+        return len(self.offsets) - 1
+
+    def write_all(self, records: Iterable[GameRecord]) -> int:
+        """Append every record; returns how many were written."""
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        if self.index:
+            start = self._file.tell()
+            self._file.write(INDEX.pack(INDEX_MAGIC, len(self.offsets)))
+            self._file.write(b''.join(OFFSET.pack(offset) for offset in self.offsets))
+            self._file.write(TRAILER.pack(start, INDEX_MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RecordFile:
+    """Random access to the games of an indexed record file by number.
+
+    The file is memory-mapped, so only the records read are paged in.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self.size = _read_header(f)
+            footer = _read_footer(f)
+        if footer is None:
+            raise RecordFormatError(f"{self.path} has no index; rewrite it with RecordWriter")
+        self.offsets = footer[1]
+        self._file = open(self.path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        offset = self.offsets[index]
+        result, count, meta_length = RECORD.unpack_from(self._data, offset)
+        start = offset + RECORD.size
+        metadata = json.loads(self._data[start:start + meta_length]) if meta_length else {}
+        cells = self._data[start + meta_length:start + meta_length + count]
+        return GameRecord([divmod(cell, self.size) for cell in cells], result, metadata)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for index in range(len(self.offsets)):
+            yield self[index]
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+
+# A move in board notation: column letter, row number counted from the bottom
+MOVE_PATTERN = re.compile(r'(?<![a-z])([a-z])(\d{1,2})(?!\d)')
+TEXT_RESULTS = {'1-0': BLACK_WIN, '0-1': WHITE_WIN, '1/2-1/2': DRAW, '0.5-0.5': DRAW, 'draw': DRAW}
+# RIF results are Black's score
+RIF_RESULTS = {'1': BLACK_WIN, '0': WHITE_WIN, '0.5': DRAW}
+
+
+def parse_moves(text: str, size: int = 15) -> List[Move]:
+    """Moves in board notation (``h8 i9``, ``h8i9``, ``1. h8 2. i9``): column a.., row 1 at the bottom."""
+    moves = []
+    for letter, number in MOVE_PATTERN.findall(text.lower()):
+        col, row = ord(letter) - ord('a'), size - int(number)
+        if not (0 <= row < size and 0 <= col < size):
+            raise RecordFormatError(f"Move {letter}{number} is off a {size}x{size} board")
+        moves.append((row, col))
+    return moves
+
+
+def format_moves(moves: Iterable[Move], size: int = 15) -> str:
+    """Moves in the board notation read by ``parse_moves``."""
+    return ' '.join(f"{chr(ord('a') + col)}{size - row}" for row, col in moves)
+
+
+def import_text(lines: Iterable[str], size: int = 15) -> Iterator[GameRecord]:
+    """Games from RenLib-style text, one per line, optionally ending in a result (``1-0``, ``0-1``, ``1/2-1/2``).
+
+    Blank lines and lines starting with ``#`` are skipped.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        result = UNKNOWN
+        words = line.split()
+        if words[-1].lower() in TEXT_RESULTS:
+            result = TEXT_RESULTS[words.pop().lower()]
+        try:
+            moves = parse_moves(' '.join(words), size)
+        except RecordFormatError as e:
+            logger.warning("Skipping line %d: %s", number, e)
+            continue
+        if len(set(moves)) != len(moves):
+            logger.warning("Skipping line %d: a cell is played twice", number)
+        elif moves:
+            yield GameRecord(moves, result, {'line': number})
+
+
+def import_rif(source, size: int = 15) -> Iterator[GameRecord]:
+    """Games from a RIF database (the renju.net XML export), streamed game by game.
+
+    Player ids are resolved to names when the players are listed before
+    the games, as in the published database; the other game attributes
+    are kept as metadata.
+    """
+    players: Dict[str, str] = {}
+    for _, element in ElementTree.iterparse(source):
+        if element.tag == 'player':
+            name = ' '.join(filter(None, (element.get('name'), element.get('surname'))))
+            players[element.get('id')] = name or element.get('id')
+            element.clear()
+        elif element.tag == 'game':
+            metadata = dict(element.attrib)
+            result = RIF_RESULTS.get(metadata.pop('bresult', None), UNKNOWN)
+            for side in ('black', 'white'):
+                if side in metadata:
+                    metadata[side] = players.get(metadata[side], metadata[side])
+            try:
+                moves = parse_moves(element.findtext('move') or '', size)
+            except RecordFormatError as e:
+                logger.warning("Skipping game %s: %s", metadata.get('id'), e)
+                moves = []
+            if len(set(moves)) != len(moves):
+                logger.warning("Skipping game %s: a cell is played twice", metadata.get('id'))
+            elif moves:
+                yield GameRecord(moves, result, metadata)
+            element.clear()
+
+
+def import_games(path: Path, size: int = 15) -> Iterator[GameRecord]:
+    """Games from a RIF (``.rif``/``.xml``) or RenLib-style text file."""
+    path = Path(path)
+    if path.suffix.lower() in ('.rif', '.xml'):
+        yield from import_rif(str(path), size)
+        return
+    with open(path, encoding='utf-8', errors='replace') as f:
+        yield from import_text(f, size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import or list game records')
+    parser.add_argument('inputs', nargs='+', type=Path,
+                        help='RIF (.rif/.xml) or RenLib-style text files to import, or a record file with --list')
+    parser.add_argument('--out', type=Path, help='Record file to append the imported games to')
+    parser.add_argument('--no-index', action='store_true', help='Do not write the index footer')
+    parser.add_argument('--list', action='store_true', help='Print the games of record files in board notation')
+    args = parser.parse_args()
+
+    size = config.board_size
+    if args.list:
+        for path in args.inputs:
+            for record in read_records(path):
+                print(f"{format_moves(record.moves, size)} {RESULT_NAMES[record.result]}")
+        return
+    if args.out is None:
+        parser.error('--out is required to import games')
+    with RecordWriter(args.out, size, index=not args.no_index) as writer:
+        for path in args.inputs:
+            count = writer.write_all(import_games(path, size))
+            print(f"Imported {count} games from {path}")
+    print(f"Wrote {writer.count} games to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
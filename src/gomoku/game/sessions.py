@@ -0,0 +1,100 @@
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+from .game import Game
+
+
+class SessionLimitReached(Exception):
+    """Raised when a new session would exceed the store's capacity."""
+
+
+class GameSession:
+    """One player's game and the AI move job it is waiting for, if any."""
+
+    def __init__(self, session_id: str, game: Game):
+        self.id = session_id
+        self.game = game
+        self.job = None  # Latest AIMoveJob of this session
+        # Held while a request checks for a running AI move and starts the next one
+        self.lock = threading.Lock()
+        self.created = time.time()
+        self.last_seen = self.created
+
+    @property
+    def busy(self) -> bool:
+        """Whether an AI move of this session is queued or running."""
+        return self.job is not None and not self.job.done.is_set()
+
+
+class SessionStore:
+    """In-memory games keyed by session ID, evicted after ``idle_timeout`` seconds.
+
+    Eviction is lazy: it runs whenever a session is looked up, so the store
+    needs no thread of its own. Sessions with an AI move in flight are
+    never evicted.
+    """
+
+    def __init__(self, game_factory: Callable[[], Game] = Game, idle_timeout: float = 1800,
+                 max_sessions: int = 100):
+        self.game_factory = game_factory
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions: Dict[str, GameSession] = {}
+        self.lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+
+    def get(self, session_id: Optional[str]) -> GameSession:
+        """The session for ``session_id``, starting a new one if it is unknown or expired."""
+        now = time.time()
+        with self.lock:
+            self._evict_idle(now)
+            session = self.sessions.get(session_id) if session_id else None
+            if session is None:
+                if len(self.sessions) >= self.max_sessions:
+                    raise SessionLimitReached()
+                session = GameSession(uuid.uuid4().hex, self.game_factory())
+                self.sessions[session.id] = session
+                self.created += 1
+            session.last_seen = now
+            return session
+
+    def restart(self, session: GameSession) -> None:
+        """Replace the session's game with a new one.
+
+        An AI move still being searched keeps the old game's AI open until
+        it finishes, and the AI is closed then.
+        """
+        with self.lock:
+            game, job = session.game, session.job
+            session.game = self.game_factory()
+            session.job = None
+        if job is not None:
+            job.add_done_callback(game.ai.close)
+        else:
+            game.ai.close()
+
+    def _evict_idle(self, now: float) -> None:
+        expired = [session for session in self.sessions.values()
+                   if now - session.last_seen > self.idle_timeout and not session.busy]
+        for session in expired:
+            del self.sessions[session.id]
+            session.game.ai.close()
+            self.evicted += 1
+
+    def close(self) -> None:
+        with self.lock:
+            for session in self.sessions.values():
+                session.game.ai.close()
+            self.sessions.clear()
+
+    def get_stats(self) -> dict:
+        """Get the session statistics."""
+        with self.lock:
+            return {
+                'active': len(self.sessions),
+                'capacity': self.max_sessions,
+                'created': self.created,
+                'evicted': self.evicted,
+            }
@@ -1,13 +1,25 @@
 import time
-from typing import Dict
+from typing import Dict, Tuple
 from ..board.player import PlayerType
 
+# Moves the clock is always split over, however late in the game
+MIN_MOVES_LEFT = 8
+# The hard budget of a move is at most this many soft budgets ...
+HARD_BUDGET_FACTOR = 5.0
+# ... and at most this share of the usable clock
+HARD_BUDGET_SHARE = 0.25
+# Budget when the clock is down to the reserve
+MIN_BUDGET = 0.05
+
 class TimeManager:
     """Manages time tracking for both players in a game, like a chess clock."""
     
-    def __init__(self, time_limit: int = 300):  # 300 seconds = 5 minutes
+    def __init__(self, time_limit: int = 300,  # 300 seconds = 5 minutes
+                 expected_moves: int = 30, reserve: float = 2.0):
         self.time_limit = time_limit
-        self.time_remaining: Dict[PlayerType, int] = {
+        self.expected_moves = expected_moves  # Moves per player in a typical game
+        self.reserve = reserve  # Seconds never budgeted, for move overhead
+        self.time_remaining: Dict[PlayerType, float] = {
             PlayerType.BLACK: time_limit,
             PlayerType.WHITE: time_limit
         }
@@ -20,20 +32,42 @@ class TimeManager:
             # Update time for the player who just finished their turn
             current_time = time.time()
             elapsed = current_time - self.last_move_time
-            self.time_remaining[self.current_player] = max(0, self.time_remaining[self.current_player] - int(elapsed))
+            self.time_remaining[self.current_player] = max(0.0, self.time_remaining[self.current_player] - elapsed)
             self.last_move_time = current_time
             self.current_player = new_player
     
     def get_time_remaining(self, player_type: PlayerType) -> int:
-        """Get remaining time for a player in seconds."""
+        """Get remaining time for a player in whole seconds, for display."""
         if player_type == self.current_player:
             # For current player, calculate time including current turn
             current_time = time.time()
             elapsed = current_time - self.last_move_time
-            return max(0, self.time_remaining[player_type] - int(elapsed))
+            return int(max(0.0, self.time_remaining[player_type] - elapsed))
         else:
             # For other player, return stored time
-            return self.time_remaining[player_type]
+            return int(self.time_remaining[player_type])
+    
+    def allocate(self, player_type: PlayerType, moves_played: int) -> Tuple[float, float]:
+        """(soft, hard) seconds to spend on ``player_type``'s current move.
+        
+        The usable clock (what is left minus the reserve) is split evenly
+        over the moves still expected, which never drop below
+        MIN_MOVES_LEFT. The soft budget is that share: a search should not
+        start a new iteration past it. The hard budget is the deadline for
+        unstable positions and stays within the usable clock, so following
+        it never runs the clock out. ``moves_played`` counts the moves
+        of both players so far.
+        """
+        remaining = self.time_remaining[player_type]
+        if player_type == self.current_player:
+            remaining -= time.time() - self.last_move_time
+        usable = remaining - self.reserve
+        if usable <= MIN_BUDGET:
+            return MIN_BUDGET, MIN_BUDGET
+        moves_left = max(MIN_MOVES_LEFT, self.expected_moves - moves_played // 2)
+        soft = usable / moves_left
+        hard = max(soft, min(soft * HARD_BUDGET_FACTOR, usable * HARD_BUDGET_SHARE))
+        return soft, hard
     
     def get_time_state(self) -> Dict[str, int]:
         """Get current time state for both players."""
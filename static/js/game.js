@@ -98,6 +98,10 @@ function makeMove(row, col) {
         body: JSON.stringify({row: row, col: col})
     })
     .then(response => {
+        // A busy server answers with an error message to show
+        if (response.status === 429 || response.status === 503) {
+            return response.json();
+        }
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -122,20 +126,12 @@ function makeMove(row, col) {
             return;
         }
         
-        updateBoard(data);
-        updateStatus(data);
-        if (data.last_move) {
-            updateLastMove(data.last_move);
-        }
-        if (data.game_over) {
-            setTimeout(() => {
-                alert(data.winner === 'B' ? 'You won!' : 'AI won!');
-            }, 100);
-        }
+        showMoveResult(data);
         
-        // Re-enable cells if game is not over
-        if (!data.game_over) {
-            document.querySelectorAll('.cell').forEach(c => c.style.pointerEvents = 'auto');
+        // The AI's reply is searched in the background
+        if (data.job_id) {
+            showQueuePosition(data.queue_position);
+            followAIMove(data.job_id);
         }
     })
     .catch(error => {
@@ -149,6 +145,94 @@ function makeMove(row, col) {
     });
 }
 
+function showMoveResult(data) {
+    updateBoard(data);
+    updateStatus(data);
+    if (data.last_move) {
+        updateLastMove(data.last_move);
+    }
+    if (data.game_over) {
+        setTimeout(() => {
+            alert(data.winner === 1 ? 'You won!' : 'AI won!');
+        }, 100);
+    }
+    
+    // Re-enable cells once it is the human's turn again
+    if (!data.game_over && !data.job_id) {
+        document.querySelectorAll('.cell').forEach(c => c.style.pointerEvents = 'auto');
+    }
+}
+
+function showAIProgress(progress) {
+    if (!progress || progress.depth === 0) {
+        return;
+    }
+    const status = document.getElementById('status');
+    let text = `AI is thinking... depth ${progress.depth}`;
+    if (progress.best_move) {
+        const [row, col] = progress.best_move;
+        text += `, best (${row + 1}, ${col + 1})`;
+    }
+    text += `, ${progress.nodes_per_second.toLocaleString()} nodes/s`;
+    status.textContent = text;
+}
+
+function showQueuePosition(position) {
+    if (position) {
+        document.getElementById('status').textContent = `Waiting for the AI (position ${position} in queue)`;
+    }
+}
+
+function handleAIJob(job) {
+    if (job.status === 'done') {
+        showMoveResult(job.state);
+        return true;
+    }
+    if (job.status === 'error' || job.error) {
+        alert(`AI error: ${job.error}`);
+        document.querySelectorAll('.cell').forEach(c => c.style.pointerEvents = 'auto');
+        return true;
+    }
+    if (job.status === 'pending') {
+        showQueuePosition(job.queue_position);
+    } else {
+        showAIProgress(job.progress);
+    }
+    return false;
+}
+
+function followAIMove(jobId) {
+    // Stream progress with Server-Sent Events, falling back to polling
+    if (window.EventSource) {
+        const source = new EventSource(`/ai_move/${jobId}/events`);
+        source.onmessage = event => {
+            if (handleAIJob(JSON.parse(event.data))) {
+                source.close();
+            }
+        };
+        source.onerror = () => {
+            source.close();
+            pollAIMove(jobId);
+        };
+    } else {
+        pollAIMove(jobId);
+    }
+}
+
+function pollAIMove(jobId) {
+    fetch(`/ai_move/${jobId}`)
+        .then(response => response.json())
+        .then(job => {
+            if (!handleAIJob(job)) {
+                setTimeout(() => pollAIMove(jobId), 500);
+            }
+        })
+        .catch(error => {
+            console.error('Error polling AI move:', error);
+            setTimeout(() => pollAIMove(jobId), 1000);
+        });
+}
+
 function updateBoard(data) {
     console.log('updateBoard called with data:', data);
     
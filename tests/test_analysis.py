@@ -0,0 +1,68 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.gomoku.game.analysis import (analyze_position, completed_ids, parse_position, read_positions,
+                                      run_analysis)
+from src.gomoku.game.records import GameRecord, RecordWriter
+
+
+class TestAnalysis(unittest.TestCase):
+    def test_parse_position(self):
+        self.assertEqual(parse_position('7,7 7,8'), (None, [(7, 7), (7, 8)]))
+        self.assertEqual(parse_position('h8 i9'), (None, [(7, 7), (6, 8)]))
+        self.assertEqual(parse_position('{"id": 4, "moves": [[7, 7]]}'), ('4', [(7, 7)]))
+        for line in ('{"moves": [[7, 7, 1]]}', '{"moves": [[1]]}', '{"moves": [[7, true]]}',
+                     '{"moves": [[7, 15]]}', '7,7,1', '7,-1'):
+            with self.assertRaises(ValueError, msg=line):
+                parse_position(line)
+
+    def test_read_positions(self):
+        text = b'# comment\n7,7 7,8\nx,y\n{"id": "a", "moves": []}\n'
+        positions = list(read_positions(io.BufferedReader(io.BytesIO(text))))
+        self.assertEqual(positions, [('2', [(7, 7), (7, 8)], None), ('a', [], None)])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'games.gmk'
+            with RecordWriter(path) as writer:
+                writer.write(GameRecord([(7, 7), (7, 8)]))
+            with open(path, 'rb') as f:
+                positions = list(read_positions(f))
+        self.assertEqual(positions, [('1:0', [], (7, 7)), ('1:1', [(7, 7)], (7, 8))])
+
+    def test_analyze_position(self):
+        result = analyze_position(('p', [(7, 7), (7, 8), (8, 8)], (6, 6)), 2, 5.0, {'book': False})
+        self.assertEqual(result['side'], 2)
+        self.assertEqual(result['depth'], 2)
+        self.assertGreater(result['nodes'], 0)
+        self.assertEqual(result['played'], [6, 6])
+        self.assertEqual(result['pv'][0], result['move'])
+        self.assertIn('error', analyze_position(('q', [(7, 7), (7, 7)], None), 2, 5.0, {}))
+
+    def test_resume_skips_finished_positions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'out.jsonl'
+            path.write_text('{"id": "1", "move": [6, 6]}\n{"id": "2", "mo')
+            done = completed_ids(path)
+            self.assertEqual(done, {'1'})
+            self.assertEqual(path.read_text(), '{"id": "1", "move": [6, 6]}\n')
+        positions = [('1', [(7, 7)], None), ('2', [(7, 7), (6, 6)], None)]
+        out = io.StringIO()
+        count = run_analysis(iter(positions), out, 1, 5.0, workers=1, settings={'book': False}, skip=done)
+        self.assertEqual(count, 1)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line['id'] for line in lines], ['2'])
+
+    def test_failed_position_is_written_as_an_error(self):
+        positions = [('bad', [(7,)], None), ('good', [(7, 7)], None)]
+        out = io.StringIO()
+        with self.assertLogs('src.gomoku.game.analysis', 'WARNING'):
+            count = run_analysis(iter(positions), out, 1, 5.0, workers=1, settings={'book': False})
+        self.assertEqual(count, 2)
+        lines = {line['id']: line for line in map(json.loads, out.getvalue().splitlines())}
+        self.assertIn('error', lines['bad'])
+        self.assertIn('move', lines['good'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+from src.gomoku.board.board import Board
+from src.gomoku.ai.evaluator import PositionEvaluator
+from src.gomoku.ai.batch_eval import BatchEvaluator
+from src.gomoku.ai.candidates import CandidateSet
+from src.gomoku.ai.search import MinimaxSearch
+from src.gomoku.bench.suite import DEFAULT_CORPUS, load_corpus
+
+class TestBatchEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.evaluator = PositionEvaluator(self.board)
+        self.batch = BatchEvaluator(self.board, self.evaluator)
+
+    def scalar_children(self, moves):
+        scores = []
+        for move in moves:
+            self.board.make_move(*move)
+            scores.append(self.evaluator.evaluate_full())
+            self.board.undo_move()
+        return scores
+
+    def test_matches_scalar_evaluator(self):
+        rng = random.Random(11)
+        for _ in range(40):
+            self.board.make_move(*rng.choice(self.board.get_valid_moves()))
+            moves = self.board.get_valid_moves()
+            player = self.board.current_player.type.value
+            self.assertEqual(self.batch.evaluate_children(moves, player).tolist(),
+                             self.scalar_children(moves))
+
+    def test_edge_moves(self):
+        for move in [(0, 0), (14, 14), (0, 1), (1, 0)]:
+            self.board.make_move(*move)
+        moves = [(0, 2), (2, 0), (14, 13), (13, 14), (1, 1)]
+        player = self.board.current_player.type.value
+        self.assertEqual(self.batch.evaluate_children(moves, player).tolist(),
+                         self.scalar_children(moves))
+
+    def test_search_result_unchanged(self):
+        for move in [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9)]:
+            self.board.make_move(*move)
+        candidates = CandidateSet(self.board)
+        plain = MinimaxSearch(self.board, self.evaluator.evaluate, 3, candidates=candidates).search()
+        batched = MinimaxSearch(self.board, self.evaluator.evaluate, 3, candidates=candidates,
+                                batch_evaluator=self.batch).search()
+        self.assertEqual(plain, batched)
+
+    def test_search_result_unchanged_with_quiescence(self):
+        for position in load_corpus(DEFAULT_CORPUS)['positions']:
+            results = []
+            for batch in (False, True):
+                board = Board()
+                for move in position['moves']:
+                    board.make_move(*move)
+                evaluator = PositionEvaluator(board)
+                search = MinimaxSearch(board, evaluator.evaluate, 2, candidates=CandidateSet(board),
+                                       batch_evaluator=BatchEvaluator(board, evaluator) if batch else None,
+                                       quiescence_depth=4, quiescence_nodes=5000)
+                results.append(search.search())
+            self.assertEqual(results[0], results[1], position['name'])
+
+if __name__ == '__main__':
+    unittest.main()
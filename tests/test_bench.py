@@ -0,0 +1,51 @@
+import copy
+import unittest
+from src.gomoku.board.player import PlayerType
+from src.gomoku.bench.suite import DEFAULT_CORPUS, compare, load_board, load_corpus, run
+
+
+class TestBenchSuite(unittest.TestCase):
+    def test_corpus_positions_have_white_to_move(self):
+        corpus = load_corpus(DEFAULT_CORPUS)
+        self.assertEqual(corpus['version'], 1)
+        for position in corpus['positions']:
+            board = load_board(position['moves'])
+            self.assertEqual(board.current_player.type, PlayerType.WHITE, position['name'])
+            if position['category'] == 'tactical':
+                self.assertTrue(position['best'], position['name'])
+            for move in position['best']:
+                self.assertTrue(board.is_valid_move(*move), position['name'])
+
+    def test_compare_flags_regressions(self):
+        corpus = load_corpus(DEFAULT_CORPUS)
+        baseline = run(corpus, 2, [], names=['block-four'], log=lambda _: None)
+        entry = baseline['positions'][0]
+        self.assertEqual([row['depth'] for row in entry['depths']], [1, 2])
+        self.assertTrue(entry['solved'])
+        self.assertEqual(compare(baseline, baseline, 0.1), ([], [f"total nps {baseline['summary']['nps']} -> "
+                                                                  f"{baseline['summary']['nps']} (+0%)"]))
+
+        results = copy.deepcopy(baseline)
+        row = results['positions'][0]['depths'][-1]
+        row['nodes'] = int(row['nodes'] * 1.5)
+        results['positions'][0]['move'] = [0, 0]
+        results['positions'][0]['solved'] = False
+        regressions, notes = compare(results, baseline, 0.1)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn('nodes', regressions[0])
+        self.assertIn('no longer solved', regressions[1])
+        self.assertIn('block-four: move (7, 9) -> (0, 0)', notes)
+
+        # Timings are only gated on the total nodes per second
+        results = copy.deepcopy(baseline)
+        row = results['positions'][0]['depths'][-1]
+        row['seconds'] = row['time_to_depth'] = 1.0
+        row['nps'] = 1
+        results['summary']['nps'] = int(baseline['summary']['nps'] * 0.8)
+        self.assertEqual(compare(results, baseline, 0.1)[0], [])
+        results['summary']['nps'] = int(baseline['summary']['nps'] * 0.5)
+        self.assertIn('total nps', compare(results, baseline, 0.1)[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
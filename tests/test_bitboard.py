@@ -0,0 +1,55 @@
+import random
+import unittest
+from src.gomoku.board.board import Board
+from src.gomoku.board.bitboard import BitBoard
+from src.gomoku.board.win_checker import WinChecker
+
+class TestBitBoard(unittest.TestCase):
+    def setUp(self):
+        self.bits = BitBoard(15)
+
+    def test_place_and_remove(self):
+        self.bits.place(3, 4, 1)
+        self.assertEqual(self.bits.get(3, 4), 1)
+        self.assertEqual(self.bits.get(4, 3), 0)
+        self.bits.remove(3, 4, 1)
+        self.assertEqual(self.bits.occupied, 0)
+        self.assertEqual(sum(self.bits.line_bits[1]), 0)
+
+    def test_five_does_not_wrap_rows(self):
+        for col in range(12, 15):
+            self.bits.place(5, col, 2)
+        for col in range(0, 2):
+            self.bits.place(6, col, 2)
+        self.assertFalse(self.bits.has_five(2))
+        self.assertFalse(self.bits.check_win(6, 0, 2))
+
+    def test_five_in_every_direction(self):
+        for dr, dc in [(1, 0), (0, 1), (1, 1), (1, -1)]:
+            bits = BitBoard(15)
+            for k in range(5):
+                bits.place(5 + dr * k, 7 + dc * k, 1)
+            self.assertTrue(bits.has_five(1))
+            self.assertTrue(bits.check_win(5 + dr * 2, 7 + dc * 2, 1))
+            self.assertFalse(bits.has_five(2))
+
+    def test_dilate_stays_on_board(self):
+        self.bits.place(0, 14, 1)
+        cells = set(self.bits.iter_cells(self.bits.dilate(self.bits.occupied)))
+        self.assertEqual(cells, {(0, 13), (0, 14), (1, 13), (1, 14)})
+
+    def test_matches_array_board(self):
+        rng = random.Random(7)
+        board = Board()
+        checker = WinChecker(board.size)
+        for _ in range(80):
+            board.make_move(*rng.choice(board.get_valid_moves()))
+            row, col, player = board.move_history[-1]
+            self.assertEqual(checker.check_win(board.board.tolist(), row, col, player.type.value),
+                             checker.check_win(board.bits, row, col, player.type.value))
+        for r in range(board.size):
+            for c in range(board.size):
+                self.assertEqual(board.bits.get(r, c), board.board[r][c])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import tracemalloc
 import unittest
 from src.gomoku.board.board import Board
 from src.gomoku.board.player import Player, PlayerType
@@ -22,5 +23,47 @@ class TestBoard(unittest.TestCase):
             self.board.board[7][i] = PlayerType.BLACK.value
         self.assertTrue(self.board.check_win(7, 4))
 
+    def test_players_are_singletons(self):
+        black = Player(PlayerType.BLACK)
+        self.assertIs(black, Player(PlayerType.BLACK))
+        self.assertIs(black.get_opponent(), Player(PlayerType.WHITE))
+        self.assertIs(self.board.current_player, black)
+
+    def test_pass_turn(self):
+        self.board.make_move(7, 7)
+        key = self.board.hash
+        self.board.pass_turn()
+        self.assertIs(self.board.current_player, Player(PlayerType.BLACK))
+        self.assertNotEqual(self.board.hash, key)
+        self.board.pass_turn()
+        self.assertEqual(self.board.hash, key)
+        self.assertEqual(len(self.board.move_history), 1)
+
+    def test_push_pop_is_exact_and_allocation_free(self):
+        self.board.make_move(7, 7)
+        before = (self.board.board.copy(), list(self.board.move_history),
+                  self.board.current_player, self.board.hash, list(self.board.bits.masks))
+        moves = [(r, c) for r in range(5, 10) for c in range(5, 10) if (r, c) != (7, 7)]
+        for move in moves:  # Warm up
+            self.board.push(move)
+        for _ in moves:
+            self.board.pop()
+        tracemalloc.start()
+        try:
+            for _ in range(200):
+                for move in moves:
+                    self.board.push(move)
+                for _ in moves:
+                    self.board.pop()
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(current, 4096)
+        self.assertTrue((self.board.board == before[0]).all())
+        self.assertEqual(self.board.move_history, before[1])
+        self.assertIs(self.board.current_player, before[2])
+        self.assertEqual(self.board.hash, before[3])
+        self.assertEqual(self.board.bits.masks, before[4])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
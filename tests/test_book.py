@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.gomoku.board.board import Board
+from src.gomoku.ai.book import BookBuilder, OpeningBook, SearchBookGenerator, symmetry_maps
+from src.gomoku.ai.search import MinimaxSearch
+
+def position(moves):
+    board = Board()
+    for move in moves:
+        board.make_move(*move)
+    return board
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'book.bin'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookup_under_every_symmetry(self):
+        moves = [(7, 7), (7, 8), (9, 6)]
+        builder = BookBuilder()
+        builder.add(position(moves), (6, 8))
+        self.assertEqual(builder.write(self.path), 1)
+        book = OpeningBook(self.path)
+        try:
+            for cells in symmetry_maps(15):
+                board = position([cells[r][c] for r, c in moves])
+                self.assertEqual(book.lookup(board), cells[6][8])
+            self.assertIsNone(book.lookup(position([(7, 7), (7, 8), (9, 5)])))
+        finally:
+            book.close()
+
+    def test_weights_and_games(self):
+        builder = BookBuilder()
+        builder.add_game([(7, 7), (7, 8), (8, 8)])
+        builder.add_game([(7, 7), (8, 8), (6, 6)], winner=1)
+        builder.add_game([(7, 7), (8, 8)])
+        builder.add_game([(7, 7), (8, 8)], winner=2)
+        builder.write(self.path)
+        book = OpeningBook(self.path)
+        try:
+            # Games with a winner only record the winner's moves
+            self.assertEqual(book.moves(Board()), [((7, 7), 3)])
+            # (8, 8) was recorded twice and (7, 8) once
+            self.assertEqual(book.lookup(position([(7, 7)])), (8, 8))
+            self.assertEqual(len(book.moves(position([(7, 7)]))), 2)
+        finally:
+            book.close()
+
+    def test_extend_existing_book(self):
+        builder = BookBuilder()
+        builder.add(position([(7, 7)]), (7, 8))
+        builder.write(self.path)
+        book = OpeningBook(self.path)
+        extended = BookBuilder()
+        extended.add_book(book)
+        book.close()
+        extended.add(position([(7, 7)]), (7, 8))
+        extended.write(self.path)
+        book = OpeningBook(self.path)
+        try:
+            self.assertEqual(book.moves(position([(7, 7)])), [((7, 8), 2)])
+        finally:
+            book.close()
+
+    def test_restricted_moves_are_searched_as_root_moves(self):
+        generator = SearchBookGenerator(BookBuilder(), depth=2)
+        generator.board.make_move(7, 7)
+        moves = [(6, 6), (6, 7), (7, 8)]
+        with mock.patch.object(MinimaxSearch, 'negamax', autospec=True,
+                               side_effect=MinimaxSearch.negamax) as negamax:
+            move = generator.search_move(moves)
+        self.assertIn(move, moves)
+        # The reply to the first move is searched one ply below the root, not as a new root
+        _, depth, _, _, ply = negamax.call_args_list[0][0]
+        self.assertEqual((depth, ply), (1, 1))
+        self.assertEqual(len(generator.board.move_history), 1)
+
+if __name__ == '__main__':
+    unittest.main()
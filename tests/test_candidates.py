@@ -0,0 +1,38 @@
+import random
+import unittest
+from src.gomoku.board.board import Board
+from src.gomoku.ai.candidates import CandidateSet
+from src.gomoku.ai.rules import GameRules
+
+class TestCandidateSet(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+
+    def test_neighbourhood_of_single_stone(self):
+        candidates = CandidateSet(self.board, radius=1)
+        self.board.make_move(0, 0)
+        self.assertEqual(candidates.moves(), [(0, 1), (1, 0), (1, 1)])
+        self.assertNotIn((0, 0), candidates)
+
+    def test_matches_recomputed_neighbourhood(self):
+        rng = random.Random(3)
+        candidates = CandidateSet(self.board, radius=2)
+        for _ in range(40):
+            self.board.make_move(*rng.choice(self.board.get_valid_moves()))
+            self.assertEqual(candidates.moves(), GameRules(self.board)._get_constrained_moves())
+
+    def test_undo_is_exact(self):
+        rng = random.Random(5)
+        candidates = CandidateSet(self.board, radius=2)
+        history = []
+        for _ in range(25):
+            self.board.make_move(*rng.choice(self.board.get_valid_moves()))
+            history.append(candidates.mask)
+        while history:
+            self.assertEqual(candidates.mask, history.pop())
+            self.board.undo_move()
+        self.assertEqual(candidates.mask, 0)
+        self.assertEqual(len(candidates), 0)
+
+if __name__ == '__main__':
+    unittest.main()
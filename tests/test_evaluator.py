@@ -0,0 +1,127 @@
+import random
+import unittest
+from functools import lru_cache
+from src.gomoku.board.board import Board
+from src.gomoku.board.player import PlayerType
+from src.gomoku.ai.evaluator import PositionEvaluator
+from src.gomoku.ai.patterns import (FIVE, FOUR, NONE, OPEN_FOUR, OPEN_THREE, OPEN_TWO, STONE_SCORES, THREE,
+                                    TWO)
+
+
+@lru_cache(maxsize=None)
+def _line_class(cells: str) -> int:
+    """Class of the stone at the centre of ``cells`` ('x' own, '.' empty, 'o' blocked).
+
+    Straight from the definition: five, else how many moves the stone is
+    from five and how many cells would complete it.
+    """
+    left, right = cells[:len(cells) // 2], cells[len(cells) // 2 + 1:]
+    if 1 + len(left) - len(left.rstrip('x')) + len(right) - len(right.lstrip('x')) >= 5:
+        return FIVE
+    completions = 0
+    best = NONE
+    for k, cell in enumerate(cells):
+        if cell != '.':
+            continue
+        after = _line_class(cells[:k] + 'x' + cells[k + 1:])
+        if after == FIVE:
+            completions += 1
+        else:
+            best = max(best, after)
+    if completions:
+        return OPEN_FOUR if completions >= 2 else FOUR
+    return {OPEN_FOUR: OPEN_THREE, FOUR: THREE, OPEN_THREE: OPEN_TWO, THREE: TWO}.get(best, NONE)
+
+
+def _line_scan_score(board: Board) -> int:
+    """Reference score from White's point of view, scanning the board array cell by cell.
+
+    Shares only the stone scores with the evaluator: no bitboard lines,
+    window keys or pattern table.
+    """
+    size = board.size
+    grid = board.board.tolist()
+    score = 0
+    for r in range(size):
+        for c in range(size):
+            owner = grid[r][c]
+            if not owner:
+                continue
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = ''
+                for k in range(-4, 5):
+                    rr, cc = r + k * dr, c + k * dc
+                    if not (0 <= rr < size and 0 <= cc < size):
+                        cells += 'o'
+                    else:
+                        cells += '.' if grid[rr][cc] == 0 else 'x' if grid[rr][cc] == owner else 'o'
+                stone = STONE_SCORES[_line_class(cells)]
+                score += stone if owner == PlayerType.WHITE.value else -stone
+    return score
+
+
+class TestPositionEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.evaluator = PositionEvaluator(self.board)
+
+    def test_empty_board(self):
+        self.assertEqual(self.evaluator.evaluate(), 0)
+        self.assertTrue(self.evaluator.verify())
+
+    def test_incremental_matches_full_scan(self):
+        rng = random.Random(1234)
+        for _ in range(60):
+            moves = self.board.get_valid_moves()
+            self.board.make_move(*rng.choice(moves))
+            self.assertEqual(self.evaluator.evaluate(), self.evaluator.evaluate_full())
+
+    def test_matches_line_scan_oracle(self):
+        for seed in range(4):
+            rng = random.Random(seed)
+            board = Board()
+            evaluator = PositionEvaluator(board)
+            for _ in range(80):
+                board.make_move(*rng.choice(board.get_valid_moves()))
+                expected = _line_scan_score(board)
+                self.assertEqual(evaluator.evaluate(), expected, board.move_history)
+                self.assertEqual(evaluator.evaluate_full(), expected, board.move_history)
+            # Dense local play makes fours, split shapes and fives
+            board = Board()
+            evaluator = PositionEvaluator(board)
+            for _ in range(40):
+                board.make_move(*rng.choice([(r, c) for r, c in board.get_valid_moves()
+                                             if 4 <= r <= 10 and 4 <= c <= 10]))
+                self.assertEqual(evaluator.evaluate(), _line_scan_score(board), board.move_history)
+                self.assertEqual(evaluator.evaluate_full(), _line_scan_score(board), board.move_history)
+
+    def test_undo_restores_score(self):
+        rng = random.Random(99)
+        scores = [self.evaluator.evaluate()]
+        for _ in range(30):
+            self.board.make_move(*rng.choice(self.board.get_valid_moves()))
+            scores.append(self.evaluator.evaluate())
+        while self.board.move_history:
+            scores.pop()
+            self.board.undo_move()
+            self.assertEqual(self.evaluator.evaluate(), scores[-1])
+        self.assertEqual(self.evaluator.evaluate(), 0)
+
+    def test_resync_after_direct_edit(self):
+        for i in range(5):
+            self.board.board[7][i] = PlayerType.WHITE.value
+        self.evaluator.resync()
+        self.assertEqual(self.evaluator.evaluate(), 5 * 100000)
+        self.assertTrue(self.evaluator.verify())
+
+    def test_shapes_count_once(self):
+        # An open three scores as one shape whether solid or split
+        for cols in [(5, 6, 7), (5, 7, 8)]:
+            board = Board()
+            for col in cols:
+                board.board[7][col] = PlayerType.WHITE.value
+            evaluator = PositionEvaluator(board)
+            self.assertEqual(evaluator.evaluate(), 1200)
+
+if __name__ == '__main__':
+    unittest.main()
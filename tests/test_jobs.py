@@ -0,0 +1,71 @@
+import unittest
+from src.gomoku.game.game import Game
+from src.gomoku.game.jobs import AIMoveRunner, QueueFull
+
+
+class TestAIMoveRunner(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.game.ai.depth = 2
+        self.game.ai.book = None
+        self.game.ai.ponderer = None
+        self.runner = AIMoveRunner()
+        for move in [(7, 7), (7, 8), (8, 8)]:
+            self.game.board.make_move(*move)
+
+    def tearDown(self):
+        self.runner.shutdown()
+        self.game.ai.close()
+
+    def test_human_move_returns_before_the_ai_moves(self):
+        success, error = self.game.make_human_move(6, 6)
+        self.assertTrue(success, error)
+        state = self.game.get_game_state()
+        self.assertEqual(state['current_player'], 2)
+        self.assertEqual(len(self.game.board.move_history), 4)
+        # Moves are refused until the AI has replied
+        self.assertEqual(self.game.make_human_move(5, 5), (False, "Not your turn"))
+
+        job = self.runner.submit(self.game)
+        self.assertIs(self.runner.get(job.id), job)
+        self.assertTrue(job.done.wait(30))
+        result = job.to_dict()
+        self.assertEqual(result['status'], 'done')
+        self.assertEqual(result['state']['current_player'], 1)
+        self.assertEqual(len(self.game.board.move_history), 5)
+        progress = result['progress']
+        self.assertGreaterEqual(progress['depth'], 2)
+        self.assertGreater(progress['nodes'], 0)
+        self.assertIsNotNone(progress['best_move'])
+
+    def test_finished_jobs_are_pruned(self):
+        self.runner.keep = 1
+        self.game.make_human_move(6, 6)
+        first = self.runner.submit(self.game)
+        first.done.wait(30)
+        self.game.make_human_move(5, 5)
+        second = self.runner.submit(self.game)
+        second.done.wait(30)
+        self.game.make_human_move(4, 4)
+        self.runner.submit(self.game).done.wait(30)
+        self.assertIsNone(self.runner.get(first.id))
+        self.assertIsNotNone(self.runner.get(second.id))
+
+
+    def test_full_queue_refuses_jobs(self):
+        runner = AIMoveRunner(workers=0, max_queue=2)  # Nothing is ever started
+        first = runner.submit(self.game)
+        second = runner.submit(self.game)
+        self.assertEqual(runner.position(second), 2)
+        self.assertEqual(second.to_dict()['queue_position'], 2)
+        with self.assertRaises(QueueFull):
+            runner.submit(self.game)
+        self.assertTrue(runner.cancel(first))
+        self.assertTrue(first.done.is_set())
+        self.assertEqual(runner.position(second), 1)
+        stats = runner.get_stats()
+        self.assertEqual((stats['submitted'], stats['rejected'], stats['queue_depth']), (2, 1, 1))
+        runner.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
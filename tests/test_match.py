@@ -0,0 +1,37 @@
+import unittest
+from src.gomoku.bench.match import DEFAULT_OPENINGS, SPRT, MatchResult, elo, play_game
+from src.gomoku.ai.book import read_games
+from src.gomoku.config import config, parse_engine
+
+
+class TestMatch(unittest.TestCase):
+    def test_parse_engine(self):
+        self.assertEqual(parse_engine('depth=3, time_limit=0.5,batch_eval=false'),
+                         {'depth': 3, 'time_limit': 0.5, 'batch_eval': False})
+        self.assertEqual(parse_engine(''), {})
+
+    def test_elo_and_sprt(self):
+        self.assertAlmostEqual(elo(0.5), 0.0)
+        self.assertAlmostEqual(elo(0.75), 190.85, places=2)
+        sprt = SPRT(0, 10)
+        self.assertIsNone(sprt.status(5, 0, 5))
+        self.assertEqual(sprt.status(300, 100, 100), 'H1')
+        self.assertEqual(sprt.status(100, 100, 300), 'H0')
+
+    def test_game_between_shallow_engines(self):
+        opening = next(iter(read_games(DEFAULT_OPENINGS)))
+        batch_eval = config.ai_batch_eval
+        result = play_game(opening, {'depth': 1, 'batch_eval': False}, {'depth': 2}, seed=1)
+        self.assertEqual(config.ai_batch_eval, batch_eval)
+        self.assertEqual(result['moves'][:len(opening)], list(opening))
+        self.assertIn(result['winner'], (0, 1, 2))
+        self.assertGreater(result['sides'][2]['nodes'], 0)
+
+        match = MatchResult()
+        match.add(0, True, result)
+        self.assertEqual(match.games_played, 1)
+        self.assertEqual(match.side_stats('B')['moves'], result['sides'][2]['moves'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from src.gomoku.board.board import Board
+from src.gomoku.ai.ordering import MoveOrderer
+
+class TestMoveOrderer(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.orderer = MoveOrderer(self.board)
+
+    def play(self, moves):
+        for move in moves:
+            self.board.make_move(*move)
+
+    def test_winning_move_before_block(self):
+        # White (to move) has four on row 7; Black has four on row 3
+        self.play([(3, 3), (7, 7), (3, 4), (7, 8), (3, 5), (7, 9), (3, 6), (7, 10), (0, 0)])
+        moves = [(3, 2), (5, 5), (7, 11), (3, 7)]
+        ordered = self.orderer.order(moves, 0)
+        self.assertEqual(ordered[0], (7, 11))
+        self.assertEqual(set(ordered[1:3]), {(3, 2), (3, 7)})
+        self.assertEqual(ordered[3], (5, 5))
+
+    def test_tt_move_comes_first(self):
+        self.play([(3, 3), (7, 7), (3, 4), (7, 8), (3, 5), (7, 9), (3, 6), (7, 10), (0, 0)])
+        ordered = self.orderer.order([(3, 2), (5, 5), (7, 11)], 0, tt_move=(5, 5))
+        self.assertEqual(ordered[0], (5, 5))
+
+    def test_killers_and_history(self):
+        self.play([(7, 7)])
+        moves = [(6, 6), (6, 8), (8, 6), (8, 8)]
+        self.orderer.record_cutoff((8, 8), 1, 3)
+        self.assertEqual(self.orderer.order(moves, 1)[0], (8, 8))
+        # Other plies only see the history credit
+        self.orderer.record_cutoff((6, 8), 2, 1)
+        self.assertEqual(self.orderer.order(moves, 3)[:2], [(8, 8), (6, 8)])
+        self.orderer.new_search()
+        self.assertEqual(self.orderer.killers[1], [None, None])
+        self.assertEqual(self.orderer.history[2][8][8], 4)
+
+if __name__ == '__main__':
+    unittest.main()
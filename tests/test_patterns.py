@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from src.gomoku.ai import patterns
+from src.gomoku.ai.patterns import get_pattern_table
+
+def classes(line):
+    """Pattern names of the X stones of a line written as 'X', 'O' and '.'."""
+    own = sum(1 << i for i, cell in enumerate(line) if cell == 'X')
+    opponent = sum(1 << i for i, cell in enumerate(line) if cell == 'O')
+    found = get_pattern_table().line_classes(own, opponent, len(line))
+    return {patterns.PATTERN_NAMES[shape] for _, shape in found}
+
+class TestPatternTable(unittest.TestCase):
+    def test_solid_shapes(self):
+        self.assertEqual(classes('...XXXXX...'), {'five'})
+        self.assertEqual(classes('...XXXX....'), {'open four'})
+        self.assertEqual(classes('..OXXXX....'), {'four'})
+        self.assertEqual(classes('...XXX.....'), {'open three'})
+        self.assertEqual(classes('..OXXX.....'), {'three'})
+        self.assertEqual(classes('....XX.....'), {'open two'})
+
+    def test_split_shapes(self):
+        self.assertEqual(classes('...X.XX....'), {'open three'})
+        self.assertEqual(classes('...XX.XX...'), {'four'})
+        self.assertEqual(classes('..X.X.X....'), {'three'})
+
+    def test_board_edge_blocks(self):
+        self.assertEqual(classes('XXXX....'), {'four'})
+        self.assertEqual(classes('.XXX.O'), {'three'})
+
+    def test_disk_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'cache' / 'patterns.npz'
+            built = patterns.load_tables(path)
+            self.assertTrue(path.exists())
+            loaded = patterns.load_tables(path)
+            np.testing.assert_array_equal(built['classes'], loaded['classes'])
+            np.testing.assert_array_equal(built['key_classes'], loaded['key_classes'])
+
+if __name__ == '__main__':
+    unittest.main()
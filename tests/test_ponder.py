@@ -0,0 +1,54 @@
+import time
+import unittest
+from src.gomoku.board.board import Board
+from src.gomoku.ai.player import AIPlayer
+from src.gomoku.ai.ponder import Ponderer
+from src.gomoku.ai.transposition import TranspositionTable
+
+OPENING = [(7, 7), (7, 8), (8, 8), (6, 6), (8, 7)]
+
+class TestPonderer(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        for move in OPENING:
+            self.board.make_move(*move)
+
+    def test_ponders_on_a_private_board(self):
+        ponderer = Ponderer(TranspositionTable(), depth=2, replies=2)
+        ponderer.start(self.board)
+        ponderer._thread.join()
+        self.assertEqual(len(ponderer.results), 2)
+        self.assertEqual(len(self.board.move_history), len(OPENING))
+        for depth, _, move, ranking in ponderer.results.values():
+            self.assertEqual(depth, 2)
+            self.assertEqual(ranking[0], move)
+
+    def test_stop_cancels_the_search(self):
+        ponderer = Ponderer(TranspositionTable(), depth=8, replies=8)
+        ponderer.start(self.board)
+        time.sleep(0.2)
+        start = time.time()
+        ponderer.stop()
+        self.assertLess(time.time() - start, 1.0)
+        self.assertFalse(ponderer.running)
+
+    def test_get_move_uses_the_pondered_reply(self):
+        ai = AIPlayer(self.board, depth=2, time_limit=5.0)
+        ai.book = None
+        ai.threat_solver = None
+        ai.start_pondering()
+        ai.ponderer._thread.join()
+        # Play a pondered reply: the stored move comes back without a new search
+        for move in ai.candidates.moves():
+            self.board.make_move(*move)
+            if self.board.hash in ai.ponderer.results:
+                break
+            self.board.undo_move()
+        expected = ai.ponderer.results[self.board.hash][2]
+        self.assertEqual(ai.get_move(), expected)
+        self.assertEqual(ai.ponderer.hits, 1)
+        ai.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from src.gomoku.board.board import Board
+from src.gomoku.game.records import (BLACK_WIN, DRAW, UNKNOWN, WHITE_WIN, GameRecord, RecordFile,
+                                     RecordFormatError, RecordWriter, format_moves, import_rif,
+                                     import_text, iter_records, parse_moves, read_records)
+
+RIF = b"""<?xml version="1.0" encoding="UTF-8"?>
+<database>
+  <players>
+    <player id="1" name="Ann" surname="Lee"/>
+    <player id="2" name="Bo" surname="Kim"/>
+  </players>
+  <games>
+    <game id="10" black="1" white="2" bresult="0" rule="1">
+      <move>h8 i9 h10</move>
+    </game>
+    <game id="11" black="2" white="1" bresult="0.5">
+      <move>h8 h8</move>
+    </game>
+    <game id="12" black="2" white="1" bresult="1">
+      <move>h8i9j10</move>
+    </game>
+  </games>
+</database>
+"""
+
+
+class TestGameRecords(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / 'games.gmk'
+        self.games = [
+            GameRecord([(7, 7), (7, 8), (8, 8)], BLACK_WIN, {'event': 'test', 'round': 1}),
+            GameRecord([(0, 0)], UNKNOWN),
+            GameRecord([(14, 14), (0, 14), (14, 0)], DRAW, {'player': 'Zoë'}),
+        ]
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip_is_one_byte_per_move(self):
+        with RecordWriter(self.path, index=False) as writer:
+            writer.write_all(self.games)
+        self.assertEqual(list(read_records(self.path)), self.games)
+        bare = Path(self.dir.name) / 'bare.gmk'
+        with RecordWriter(bare, index=False) as writer:
+            writer.write(GameRecord([(7, 7)] + [(r, 0) for r in range(10)]))
+        # Header, a 5-byte record header and 11 moves
+        self.assertEqual(os.path.getsize(bare), 9 + 5 + 11)
+
+    def test_appending_keeps_the_index_at_the_end(self):
+        with RecordWriter(self.path) as writer:
+            writer.write_all(self.games[:2])
+        with RecordWriter(self.path) as writer:
+            self.assertEqual(writer.write(self.games[2]), 2)
+        self.assertEqual(list(read_records(self.path)), self.games)
+        records = RecordFile(self.path)
+        try:
+            self.assertEqual(len(records), 3)
+            self.assertEqual(records[2], self.games[2])
+            self.assertEqual(records[0], self.games[0])
+        finally:
+            records.close()
+        # Streams need not be seekable
+        self.assertEqual(list(iter_records(io.BytesIO(self.path.read_bytes()))), self.games)
+
+    def test_rejects_bad_input(self):
+        with RecordWriter(self.path, index=False) as writer:
+            with self.assertRaises(RecordFormatError):
+                writer.write(GameRecord([(7, 7), (7, 7)]))
+            with self.assertRaises(RecordFormatError):
+                writer.write(GameRecord([(15, 0)]))
+            writer.write(self.games[0])
+        with self.assertRaises(RecordFormatError):
+            list(iter_records(io.BytesIO(b'not a record file')))
+        with self.assertRaises(RecordFormatError):
+            list(iter_records(io.BytesIO(self.path.read_bytes()[:-1])))
+        with self.assertRaises(RecordFormatError):
+            RecordFile(self.path)
+
+    def test_from_board(self):
+        board = Board()
+        for move in [(7, 7), (0, 0), (7, 8), (0, 1), (7, 9), (0, 2), (7, 10), (0, 3), (7, 11)]:
+            board.make_move(*move)
+        record = GameRecord.from_board(board, event='test')
+        self.assertEqual(record.result, BLACK_WIN)
+        self.assertEqual(record.metadata, {'event': 'test'})
+        self.assertEqual(record.replay().move_history, board.move_history)
+
+
+class TestImport(unittest.TestCase):
+    def test_board_notation(self):
+        self.assertEqual(parse_moves('h8 i9 j10'), [(7, 7), (6, 8), (5, 9)])
+        self.assertEqual(parse_moves('1. h8 2. i9 3. j10'), parse_moves('h8i9j10'))
+        self.assertEqual(parse_moves(format_moves([(0, 0), (14, 14)])), [(0, 0), (14, 14)])
+        with self.assertRaises(RecordFormatError):
+            parse_moves('a16')
+
+    def test_text(self):
+        lines = ['# header', '', 'h8 i9 j10 0-1', 'h8 z99', 'a1 b2 draw']
+        records = list(import_text(lines))
+        self.assertEqual([record.result for record in records], [WHITE_WIN, DRAW])
+        self.assertEqual(records[0].moves, [(7, 7), (6, 8), (5, 9)])
+        self.assertEqual(records[1].metadata, {'line': 5})
+
+    def test_rif(self):
+        records = list(import_rif(io.BytesIO(RIF)))
+        self.assertEqual(len(records), 2)  # The game playing h8 twice is skipped
+        first, second = records
+        self.assertEqual(first.moves, [(7, 7), (6, 8), (5, 7)])
+        self.assertEqual(first.result, WHITE_WIN)
+        self.assertEqual(first.metadata, {'id': '10', 'black': 'Ann Lee', 'white': 'Bo Kim', 'rule': '1'})
+        self.assertEqual(second.result, BLACK_WIN)
+        self.assertEqual(second.moves, [(7, 7), (6, 8), (5, 9)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import random
+import time
+import unittest
+from unittest import mock
+from src.gomoku.board.board import Board
+from src.gomoku.ai.evaluator import PositionEvaluator
+from src.gomoku.ai.search import MATE_SCORE, MinimaxSearch, SearchTimeout, mate_score
+from src.gomoku.ai.batch_eval import BatchEvaluator
+from src.gomoku.ai.candidates import CandidateSet
+from src.gomoku.ai.transposition import TranspositionTable
+from src.gomoku.ai.player import AIPlayer
+from src.gomoku.bench.suite import DEFAULT_CORPUS, bench_depth, load_corpus
+from src.gomoku.config import config
+
+class TestMinimaxSearch(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        for move in [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9)]:
+            self.board.make_move(*move)
+        self.evaluator = PositionEvaluator(self.board)
+        self.candidates = CandidateSet(self.board)
+
+    def test_expired_deadline_restores_board(self):
+        history = list(self.board.move_history)
+        score = self.evaluator.evaluate()
+        search = MinimaxSearch(self.board, self.evaluator.evaluate, 3,
+                               candidates=self.candidates, deadline=time.time() - 1)
+        with self.assertRaises(SearchTimeout):
+            search.search()
+        self.assertEqual(self.board.move_history, history)
+        self.assertEqual(self.evaluator.evaluate(), score)
+
+    def test_root_order_and_pv(self):
+        tt = TranspositionTable(1 << 12)
+        first = MinimaxSearch(self.board, self.evaluator.evaluate, 2, tt=tt, candidates=self.candidates)
+        score, move = first.search()
+        self.assertEqual(first.best_root, (score, move))
+        self.assertEqual(first.get_pv()[0], move)
+        order = sorted(first.root_scores, key=first.root_scores.get, reverse=True)
+        self.assertEqual(order[0], move)
+        second = MinimaxSearch(self.board, self.evaluator.evaluate, 2, candidates=self.candidates)
+        self.assertEqual(second.search(order), (score, move))
+
+    def test_window_bounds(self):
+        score, move = MinimaxSearch(self.board, self.evaluator.evaluate, 3, candidates=self.candidates).search()
+        search = MinimaxSearch(self.board, self.evaluator.evaluate, 3, candidates=self.candidates)
+        self.assertEqual(search.search(alpha=score - 10, beta=score + 10), (score, move))
+        self.assertLessEqual(search.search(alpha=score + 1, beta=score + 100)[0], score + 1)
+        self.assertGreaterEqual(search.search(alpha=score - 100, beta=score - 1)[0], score - 1)
+        self.assertEqual(len(self.board.move_history), 5)
+
+    def test_aspiration_researches(self):
+        ai = AIPlayer(self.board, depth=3, time_limit=60, ponder=False)
+        expected = ai._search_with_time_limit(1)
+        with mock.patch('src.gomoku.ai.player.ASPIRATION_WINDOW', 1):
+            ai = AIPlayer(self.board, depth=3, time_limit=60, ponder=False)
+            self.assertEqual(ai._search_with_time_limit(1)[0], expected[0])
+        self.assertGreater(ai.stats.researches, 0)
+
+    def test_pruning_keeps_tactics(self):
+        positions = {p['name']: p for p in load_corpus(DEFAULT_CORPUS)['positions']}
+        stats = {}
+        for name in ('diagonal-three', 'open-three', 'block-four'):
+            position = positions[name]
+            board = Board()
+            for move in position['moves']:
+                board.make_move(*move)
+            ai = AIPlayer(board, depth=5, time_limit=60, ponder=False)
+            _, move = ai._search_with_time_limit(1)
+            if position['best']:
+                self.assertIn(move, position['best'], name)
+            self.assertEqual(len(board.move_history), len(position['moves']))
+            stats[name] = ai.stats
+        # Both reach depth 5, deep enough for late move reductions
+        self.assertGreater(stats['open-three'].lmr_reductions, 0)
+        self.assertGreater(stats['block-four'].lmr_reductions, 0)
+        # Null moves cut off in a quiet opening, where passing is safe
+        board = Board()
+        for move in [(7, 7), (7, 8), (8, 7), (6, 9), (9, 6)]:
+            board.make_move(*move)
+        ai = AIPlayer(board, depth=4, time_limit=60, ponder=False)
+        ai._search_with_time_limit(1)
+        self.assertGreater(ai.stats.null_cutoffs, 0)
+        ai.close()
+        # Black's four is on the board, so White never passes there
+        board = Board()
+        for move in positions['block-four']['moves']:
+            board.make_move(*move)
+        search = MinimaxSearch(board, PositionEvaluator(board).evaluate, 5,
+                               candidates=CandidateSet(board), null_move_reduction=2)
+        self.assertFalse(search._try_null_move(3, -10 ** 6, -10 ** 6 + 1, 1, board.current_player.value))
+        board.make_move(7, 9)
+        board.make_move(0, 0)
+        self.assertTrue(search._try_null_move(3, -10 ** 6, -10 ** 6 + 1, 1, board.current_player.value))
+
+    def test_large_null_move_reduction_stops_at_the_horizon(self):
+        positions = {p['name']: p for p in load_corpus(DEFAULT_CORPUS)['positions']}
+        board = Board()
+        for move in positions['open-three']['moves']:
+            board.make_move(*move)
+        evaluator = PositionEvaluator(board)
+        # Without the clamp the reply is searched at a negative depth that never reaches the horizon
+        search = MinimaxSearch(board, evaluator.evaluate, 4, candidates=CandidateSet(board),
+                               tt=TranspositionTable(1 << 12), null_move_reduction=5,
+                               deadline=time.time() + 30)
+        search.search()
+        self.assertGreater(search.null_tries, 0)
+
+    def test_expired_budget_still_plays_a_legal_move(self):
+        # A crowded board with (7, 7) taken, where no root move finishes before the deadline
+        rng = random.Random(1)
+        board = Board()
+        board.make_move(7, 7)
+        while len(board.move_history) < 30:
+            move = rng.choice(board.get_valid_moves())
+            board.make_move(*move)
+            if board.check_win(*move):
+                board.undo_move()
+        for root_order in (None, [(5, 5), (6, 7)]):
+            ai = AIPlayer(board, depth=4, time_limit=0.0, ponder=False)
+            ai.book = None
+            with self.assertLogs('src.gomoku.ai.player', 'WARNING'):
+                _, move = ai._search_with_time_limit(4, time_limit=0.0, root_order=root_order)
+            ai.close()
+            self.assertTrue(board.is_valid_move(*move))
+            if root_order:
+                # The earlier ranking's best move comes first
+                self.assertEqual(move, root_order[0])
+
+    def test_ai_respects_time_limit(self):
+        ai = AIPlayer(self.board, depth=10, time_limit=0.5)
+        start = time.time()
+        move = ai.get_move()
+        self.assertLess(time.time() - start, 1.0)
+        self.assertTrue(self.board.is_valid_move(*move))
+
+
+class TestTerminalWins(unittest.TestCase):
+    # White has four in a row on row 7 with both ends open; Black's stones are scattered
+    WHITE_FOUR = [(0, 0), (7, 3), (0, 2), (7, 4), (0, 4), (7, 5), (14, 14), (7, 6)]
+
+    def _search(self, moves, depth, batch=True, quiescence_depth=0):
+        board = Board()
+        for move in moves:
+            board.make_move(*move)
+        evaluator = PositionEvaluator(board)
+        search = MinimaxSearch(board, evaluator.evaluate, depth, tt=TranspositionTable(1 << 12),
+                               candidates=CandidateSet(board),
+                               batch_evaluator=BatchEvaluator(board, evaluator) if batch else None,
+                               quiescence_depth=quiescence_depth, quiescence_nodes=5000)
+        result = search.search()
+        self.assertEqual(len(board.move_history), len(moves))
+        return result, search
+
+    def test_takes_the_fastest_win(self):
+        for batch in (True, False):
+            (score, move), search = self._search(self.WHITE_FOUR + [(14, 12)], 3, batch)
+            self.assertEqual(score, MATE_SCORE - 1)
+            self.assertIn(move, [(7, 2), (7, 7)])
+            # The search stops at the winning root move
+            self.assertEqual(len(search.root_scores), 1)
+
+    def test_loss_is_scored_by_distance(self):
+        for depth in (2, 4):
+            (score, _), _ = self._search(self.WHITE_FOUR, depth)
+            self.assertEqual(score, mate_score(2, 2))
+
+    def test_quiescence_sees_past_the_horizon(self):
+        # Depth 1 stops right after Black's move; only quiescence sees White's five
+        (score, _), _ = self._search(self.WHITE_FOUR, 1, batch=False)
+        self.assertLess(score, MATE_SCORE // 2)
+        (score, _), search = self._search(self.WHITE_FOUR, 1, batch=False, quiescence_depth=4)
+        self.assertEqual(score, mate_score(2, 2))
+        self.assertGreater(search.qnodes, 0)
+
+    def test_quiescence_blocks_open_threes(self):
+        # White is to move at the horizon against Black's open three on row 7
+        three = [(7, 6), (0, 0), (7, 7), (0, 14), (7, 8)]
+        (static, _), _ = self._search(three, 0)
+        (score, _), _ = self._search(three, 0, quiescence_depth=4)
+        (blocked, _), _ = self._search(three + [(7, 5)], 0, quiescence_depth=4)
+        # Standing pat is not allowed; blocking an end is the best answer
+        self.assertEqual(score, blocked)
+        self.assertGreater(score, static)
+        # A second open three cannot be blocked in time
+        (score, _), _ = self._search(three + [(14, 0), (9, 3), (14, 14), (10, 3), (14, 7), (11, 3)], 0,
+                                     quiescence_depth=4)
+        self.assertEqual(score, mate_score(1, 4))
+
+    def test_quiescence_finds_the_deeper_move(self):
+        # The corpus VCF position: depth 3 plus quiescence plays the depth-5 move
+        position = next(p for p in load_corpus(DEFAULT_CORPUS)['positions'] if p['name'] == 'white-vcf')
+        self.assertEqual(config.ai_quiescence_depth, 4)
+        self.assertEqual(position['best'], [(6, 3)])
+        self.assertIn(tuple(bench_depth(position['moves'], 3)['move']), position['best'])
+
+
+class TestParallelRootSearch(unittest.TestCase):
+    def test_matches_serial_search(self):
+        results = {}
+        for workers in (1, 2):
+            board = Board()
+            for move in [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9)]:
+                board.make_move(*move)
+            ai = AIPlayer(board, depth=2, time_limit=60, workers=workers)
+            try:
+                results[workers] = ai._search_with_time_limit(2)
+            finally:
+                ai.close()
+            self.assertEqual(len(board.move_history), 5)
+        self.assertEqual(results[1], results[2])
+
+if __name__ == '__main__':
+    unittest.main()
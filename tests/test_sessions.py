@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+from src.gomoku.game.game import Game
+from src.gomoku.game.jobs import AIMoveJob
+from src.gomoku.game.sessions import SessionStore, SessionLimitReached
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.store = SessionStore(lambda: Game(ponder=False), idle_timeout=60, max_sessions=2)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_sessions_keep_separate_games(self):
+        first = self.store.get(None)
+        second = self.store.get('unknown')
+        self.assertNotEqual(first.id, second.id)
+        first.game.make_human_move(7, 7)
+        self.assertIs(self.store.get(first.id), first)
+        self.assertEqual(len(second.game.board.move_history), 0)
+        with self.assertRaises(SessionLimitReached):
+            self.store.get(None)
+
+    def test_idle_sessions_are_evicted(self):
+        idle = self.store.get(None)
+        idle.last_seen -= 120
+        fresh = self.store.get(None)
+        self.assertNotIn(idle.id, self.store.sessions)
+        self.assertIn(fresh.id, self.store.sessions)
+        self.assertEqual(self.store.get_stats()['evicted'], 1)
+        # An expired ID starts a new game
+        self.assertNotEqual(self.store.get(idle.id).id, idle.id)
+
+    def test_restart_closes_the_ai_after_its_running_move(self):
+        session = self.store.get(None)
+        game = session.game
+        job = session.job = AIMoveJob(game, runner=None)
+        with mock.patch.object(game.ai, 'close') as close:
+            self.store.restart(session)
+            self.assertIsNot(session.game, game)
+            self.assertIsNone(session.job)
+            close.assert_not_called()
+            job.finish()
+            close.assert_called_once_with()
+        # Without a move in flight the AI is closed right away
+        game = session.game
+        with mock.patch.object(game.ai, 'close') as close:
+            self.store.restart(session)
+            close.assert_called_once_with()
+
+    def test_closed_ai_stops_following_its_board(self):
+        session = self.store.get(None)
+        game = session.game
+        self.store.restart(session)
+        game.board.make_move(7, 7)
+        self.assertEqual(game.ai.candidates.moves(), [])
+        self.assertEqual(game.ai.evaluator.total, 0)
+        game.ai.close()  # Closing twice is harmless
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from src.gomoku.board.board import Board
+from src.gomoku.ai.player import AIPlayer
+from src.gomoku.ai.stats import MoveMetrics, SearchStats
+
+
+class TestSearchStats(unittest.TestCase):
+    def test_search_fills_the_move_stats(self):
+        board = Board()
+        for move in [(7, 7), (12, 6), (9, 4), (6, 6), (5, 5), (6, 7), (5, 8)]:
+            board.make_move(*move)
+        ai = AIPlayer(board, depth=3, time_limit=30.0, ponder=False)
+        ai.book = None
+        ai.threat_solver = None
+        move = ai.get_move()
+        stats = ai.stats
+        self.assertEqual((stats.source, stats.move), ('search', move))
+        self.assertEqual(stats.depth, 3)
+        self.assertEqual([depth for depth, _ in stats.depth_times], [2, 3])
+        self.assertGreater(stats.nodes, stats.cutoffs)
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertLessEqual(stats.first_move_cutoffs, stats.cutoffs)
+        self.assertGreater(stats.tt_probes, 0)
+        self.assertTrue(0 < stats.eval_share < 1)
+        ai.close()
+
+    def test_threat_solver_misses_are_recorded(self):
+        board = Board()
+        for move in [(7, 7), (12, 6), (9, 4), (6, 6), (5, 5), (6, 7), (5, 8)]:
+            board.make_move(*move)
+        ai = AIPlayer(board, depth=2, time_limit=30.0, ponder=False)
+        ai.book = None
+        ai.get_move()
+        stats = ai.stats
+        self.assertEqual(stats.source, 'search')
+        self.assertEqual((stats.threat_calls, stats.threat_hits), (1, 0))
+        self.assertGreater(stats.threat_nodes, 0)
+        self.assertGreater(stats.to_dict()['threat_time'], 0)
+        self.assertIn('threats 0/1 proved', stats.summary())
+        metrics = MoveMetrics()
+        metrics.observe(stats)
+        self.assertIn('gomoku_ai_threat_calls_total 1', metrics.render())
+        ai.close()
+
+    def test_metrics_render_latency(self):
+        metrics = MoveMetrics(window=10)
+        for seconds in [0.02, 0.2, 3.0]:
+            stats = SearchStats()
+            stats.time = seconds
+            stats.nodes = 100
+            metrics.observe(stats)
+        self.assertEqual(metrics.quantile(0.5), 0.2)
+        self.assertEqual(metrics.quantile(0.99), 3.0)
+        text = metrics.render()
+        self.assertIn('gomoku_ai_moves_total{source="search"} 3', text)
+        self.assertIn('gomoku_ai_nodes_total 300', text)
+        self.assertIn('gomoku_ai_move_seconds_bucket{le="0.25"} 2', text)
+        self.assertIn('gomoku_ai_move_seconds_count 3', text)
+        self.assertIn('gomoku_ai_move_latency_seconds{quantile="0.99"} 3.0', text)
+        self.assertIn('gomoku_ai_move_latency_seconds_count 3', text)
+        # The summary's sum and count cover the same window as its quantiles
+        for seconds in [0.5] * 10:
+            stats = SearchStats()
+            stats.time = seconds
+            metrics.observe(stats)
+        text = metrics.render()
+        self.assertIn('gomoku_ai_move_latency_seconds{quantile="0.99"} 0.5', text)
+        self.assertIn('gomoku_ai_move_latency_seconds_sum 5.0', text)
+        self.assertIn('gomoku_ai_move_latency_seconds_count 10', text)
+        self.assertIn('gomoku_ai_move_seconds_count 13', text)
+        self.assertIn('gomoku_ai_move_latency_seconds_count 0', MoveMetrics().render())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from src.gomoku.board.board import Board
+from src.gomoku.board.player import Player, PlayerType
+from src.gomoku.ai.threats import ThreatSolver
+from src.gomoku.ai.player import AIPlayer
+
+# White to move wins with a sequence of fours the depth-3 search cannot see
+VCF_POSITION = [(5, 10, 1), (6, 7, 2), (10, 7, 1), (8, 5, 2), (10, 5, 1), (7, 4, 2), (8, 6, 1),
+                (9, 6, 2), (7, 10, 1), (10, 6, 2), (7, 8, 1), (10, 4, 2), (8, 9, 1), (6, 5, 2),
+                (7, 9, 1), (4, 5, 2), (7, 5, 1)]
+
+def load(moves):
+    board = Board()
+    for row, col, value in moves:
+        board.make_move(row, col, Player(PlayerType(value)))
+    return board
+
+class TestThreatSolver(unittest.TestCase):
+    def test_finds_vcf(self):
+        board = load(VCF_POSITION)
+        solver = ThreatSolver(board, max_threes=0)
+        line = solver.find_win(2)
+        self.assertEqual(len(line), 7)
+        # Every defender reply is forced and the last attacker move leaves two fives
+        for i, move in enumerate(line):
+            if i % 2:
+                self.assertEqual(solver.five_cells(2), [move])
+            board.make_move(*move, Player(PlayerType(2 if i % 2 == 0 else 1)))
+        self.assertGreaterEqual(len(solver.five_cells(2)), 2)
+        self.assertEqual(len(board.move_history), len(VCF_POSITION) + 7)
+
+    def test_solve_win_and_defence(self):
+        board = load(VCF_POSITION)
+        solver = ThreatSolver(board)
+        self.assertEqual(solver.solve(5.0), ('win', (6, 3)))
+        self.assertEqual(len(board.move_history), len(VCF_POSITION))
+        # Black four on row 3: White must block
+        board = load([(3, 3, 1), (9, 9, 2), (3, 4, 1), (9, 11, 2), (3, 5, 1), (3, 2, 2), (3, 6, 1)])
+        self.assertEqual(ThreatSolver(board).solve(5.0), ('defence', (3, 7)))
+
+    def test_quiet_position(self):
+        board = load([(7, 7, 1), (7, 8, 2), (8, 8, 1)])
+        solver = ThreatSolver(board)
+        self.assertIsNone(solver.solve(5.0))
+        self.assertEqual(solver.get_stats()['calls'], 1)
+        self.assertEqual(solver.get_stats()['hits'], 0)
+
+    def test_ai_plays_forced_win(self):
+        board = load(VCF_POSITION)
+        ai = AIPlayer(board, depth=3, time_limit=5.0)
+        self.assertEqual(ai.get_move(), (6, 3))
+        self.assertEqual(ai.threat_solver.get_stats()['hits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
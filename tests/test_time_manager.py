@@ -0,0 +1,101 @@
+import time
+import unittest
+from unittest import mock
+from src.gomoku.board.player import PlayerType
+from src.gomoku.game.game import Game
+from src.gomoku.game.time_manager import MIN_BUDGET, MIN_MOVES_LEFT, TimeManager
+from src.gomoku.ai.player import FORCED_TIME_SCALE, STABLE_TIME_SCALE
+
+
+class TestTimeAllocation(unittest.TestCase):
+    def test_clock_is_split_over_the_moves_left(self):
+        clock = TimeManager(300, expected_moves=30, reserve=2.0)
+        soft, hard = clock.allocate(PlayerType.BLACK, 0)
+        self.assertAlmostEqual(soft, 298 / 30, places=1)
+        self.assertGreater(hard, soft)
+        self.assertLessEqual(hard, 298)
+        # Late in the game the clock left is split over MIN_MOVES_LEFT moves
+        clock.time_remaining[PlayerType.WHITE] = 50
+        soft, hard = clock.allocate(PlayerType.WHITE, 100)
+        self.assertAlmostEqual(soft, 48 / MIN_MOVES_LEFT)
+        self.assertLessEqual(hard, 48)
+
+    def test_never_budgets_the_reserve(self):
+        clock = TimeManager(300, reserve=2.0)
+        clock.time_remaining[PlayerType.BLACK] = 1
+        self.assertEqual(clock.allocate(PlayerType.BLACK, 40), (MIN_BUDGET, MIN_BUDGET))
+        # Time spent on the current move counts against the budget
+        clock.time_remaining[PlayerType.BLACK] = 12
+        clock.last_move_time = time.time() - 9
+        soft, hard = clock.allocate(PlayerType.BLACK, 40)
+        self.assertLessEqual(hard, 1.0)
+
+    def test_fractions_of_a_second_are_charged(self):
+        clock = TimeManager(300)
+        for _ in range(3):
+            clock.last_move_time -= 0.6
+            clock.switch_player(PlayerType.WHITE)
+            clock.switch_player(PlayerType.BLACK)
+        self.assertAlmostEqual(clock.time_remaining[PlayerType.BLACK], 298.2, places=1)
+        self.assertIsInstance(clock.get_time_state()['black'], int)
+
+
+class TestGameClock(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(ponder=False)
+        self.game.ai.depth = 2
+        self.game.ai.book = None
+
+    def tearDown(self):
+        self.game.ai.close()
+
+    def test_moves_switch_the_clock(self):
+        clock = self.game.time_manager
+        clock.last_move_time -= 5
+        self.assertTrue(self.game.make_move(7, 7)[0])
+        self.assertEqual(clock.current_player, PlayerType.BLACK)
+        self.assertAlmostEqual(clock.time_remaining[PlayerType.BLACK], clock.time_limit - 5, delta=0.5)
+        self.assertEqual(len(self.game.board.move_history), 2)
+
+    def test_budget_is_capped_at_the_move_time_limit(self):
+        self.game.ai.time_limit = 1.0
+        soft, hard = self.game.ai.time_budget()
+        self.assertLessEqual(soft, hard)
+        self.assertEqual(hard, 1.0)
+
+    def test_ai_search_stays_within_the_clock(self):
+        for move in [(7, 7), (7, 8), (8, 8)]:
+            self.game.board.make_move(*move)
+        clock = self.game.time_manager
+        clock.switch_player(PlayerType.WHITE)
+        clock.time_remaining[PlayerType.WHITE] = 4
+        self.game.ai.depth = 10
+        start = time.time()
+        self.game.ai.get_move()
+        self.assertLess(time.time() - start, 2.0)
+
+
+class TestTimeScale(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(ponder=False)
+        self.ai = self.game.ai
+        self.search = mock.Mock(maximizing=True, root_scores={})
+
+    def tearDown(self):
+        self.ai.close()
+
+    def test_unstable_best_move_gets_more_time(self):
+        self.ai.iterations = [{'move': (1, 1)}, {'move': (2, 2)}, {'move': (1, 1)}]
+        self.assertGreater(self.ai._time_scale(self.search), 2.0)
+        self.ai.iterations = [{'move': (1, 1)}] * 3
+        self.assertEqual(self.ai._time_scale(self.search), STABLE_TIME_SCALE)
+
+    def test_forced_reply_gets_less_time(self):
+        for move in [(7, 7), (0, 0), (7, 8), (0, 2), (7, 9), (0, 4), (7, 10)]:
+            self.game.board.make_move(*move)
+        self.ai.iterations = [{'move': (1, 1)}, {'move': (2, 2)}]
+        self.assertEqual(self.ai._time_scale(self.search), FORCED_TIME_SCALE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from src.gomoku.board.board import Board
+from src.gomoku.ai.evaluator import PositionEvaluator
+from src.gomoku.ai.search import MinimaxSearch
+from src.gomoku.ai.transposition import TranspositionTable, EXACT, LOWER
+
+class TestZobristHash(unittest.TestCase):
+    def test_hash_follows_make_and_undo(self):
+        board = Board()
+        self.assertEqual(board.hash, 0)
+        board.make_move(7, 7)
+        board.make_move(7, 8)
+        self.assertEqual(board.hash, board.zobrist.hash_board(board.board, 2))
+        board.undo_move()
+        board.undo_move()
+        self.assertEqual(board.hash, 0)
+
+    def test_transpositions_share_hash(self):
+        a, b = Board(), Board()
+        for move in [(7, 7), (7, 8), (8, 8), (6, 6)]:
+            a.make_move(*move)
+        for move in [(8, 8), (6, 6), (7, 7), (7, 8)]:
+            b.make_move(*move)
+        self.assertEqual(a.hash, b.hash)
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_store_and_probe(self):
+        tt = TranspositionTable(16)
+        self.assertIsNone(tt.probe(12345))
+        tt.store(12345, 3, 50, EXACT, (7, 7))
+        self.assertEqual(tt.probe(12345), (12345, 3, 50, EXACT, (7, 7)))
+        self.assertEqual(tt.hit_rate, 0.5)
+
+    def test_depth_preferred_slot_survives_shallow_store(self):
+        tt = TranspositionTable(1)
+        tt.store(1, 5, 10, EXACT, (1, 1))
+        tt.store(2, 1, 20, LOWER, (2, 2))
+        self.assertEqual(tt.probe(1)[1], 5)
+        self.assertEqual(tt.probe(2)[1], 1)
+
+    def test_search_result_unchanged(self):
+        board = Board()
+        for move in [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9)]:
+            board.make_move(*move)
+        evaluator = PositionEvaluator(board)
+        plain = MinimaxSearch(board, evaluator.evaluate, 2).search()
+        tt = TranspositionTable(1 << 12)
+        MinimaxSearch(board, evaluator.evaluate, 1, tt=tt).search()
+        cached = MinimaxSearch(board, evaluator.evaluate, 2, tt=tt).search()
+        self.assertEqual(plain[0], cached[0])
+
+if __name__ == '__main__':
+    unittest.main()
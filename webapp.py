@@ -1,20 +1,56 @@
-from flask import Flask, render_template, request, jsonify, make_response, url_for
+from flask import Flask, render_template, request, jsonify, make_response, url_for, Response, stream_with_context, g
 from src.gomoku.game.game import Game
+from src.gomoku.game.jobs import AIMoveRunner, QueueFull
+from src.gomoku.game.sessions import SessionStore, SessionLimitReached
+from src.gomoku.ai.stats import move_metrics, format_metric
+from src.gomoku.config import config
 import webbrowser
+import json
 import threading
 import os
 import logging
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=config.log_level, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
 # Reduce Flask's logging level to WARNING to hide request logs
 logging.getLogger('werkzeug').setLevel(logging.WARNING)
 
 app = Flask(__name__, static_folder='static')
-game = Game()  # Initialize with default config values
+# One game per browser, identified by a session cookie
+sessions = SessionStore(lambda: Game(ponder=config.server_ponder),
+                        idle_timeout=config.server_session_timeout,
+                        max_sessions=config.server_max_sessions)
+# AI moves of all sessions share a bounded pool; clients follow them by polling or SSE
+ai_runner = AIMoveRunner(workers=config.server_workers, max_queue=config.server_max_queue)
+SESSION_COOKIE = 'gomoku_session'
+PROGRESS_INTERVAL = 0.25  # Seconds between progress events
+RETRY_AFTER = 2  # Seconds clients are asked to wait when the server is saturated
+
+@app.before_request
+def load_session():
+    if request.endpoint in ('static', 'metrics', 'metrics_json'):
+        return None
+    try:
+        g.session = sessions.get(request.cookies.get(SESSION_COOKIE))
+    except SessionLimitReached:
+        return _busy('Too many games in progress, please try again later', 503)
+
+@app.after_request
+def save_session(response):
+    session = g.get('session')
+    if session is not None and request.cookies.get(SESSION_COOKIE) != session.id:
+        response.set_cookie(SESSION_COOKIE, session.id, httponly=True, samesite='Lax')
+    return response
+
+def _busy(message: str, status: int = 429):
+    response = jsonify({'error': message, 'retry_after': RETRY_AFTER})
+    response.status_code = status
+    response.headers['Retry-After'] = str(RETRY_AFTER)
+    return response
 
 @app.route('/')
 def index():
+    game = g.session.game
     response = make_response(render_template('game.html', board=game.board.board))
     response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
     response.headers['Pragma'] = 'no-cache'
@@ -23,6 +59,7 @@ def index():
 
 @app.route('/make_move', methods=['POST'])
 def make_move():
+    session = g.session
     data = request.get_json()
     row = data.get('row')
     col = data.get('col')
@@ -30,38 +67,101 @@ def make_move():
     if row is None or col is None:
         return jsonify({'error': 'Invalid move coordinates'})
     
-    success, error = game.make_move(row, col)
-    if not success:
-        return jsonify({'error': error})
+    # Concurrent requests of one session must not both pass the busy check
+    with session.lock:
+        game = session.game
+        if session.busy:
+            return jsonify({'error': 'AI is still thinking'})
+        
+        success, error = game.make_human_move(row, col)
+        if not success:
+            return jsonify({'error': error})
+        
+        # The AI replies in the background; the client follows the job
+        state = game.get_game_state()
+        if not game.game_over:
+            try:
+                session.job = ai_runner.submit(game)
+            except QueueFull:
+                # Take the move back so the player can retry it
+                game.undo_human_move()
+                return _busy('Server busy, please try again shortly')
+            state['job_id'] = session.job.id
+            state['queue_position'] = ai_runner.position(session.job)
+    return jsonify(state)
+
+@app.route('/ai_move/<job_id>')
+def ai_move(job_id):
+    """Poll an AI move: its progress, then the game state once it is played."""
+    job = ai_runner.get(job_id)
+    if job is None or job.game is not g.session.game:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(_job_state(job))
+
+@app.route('/ai_move/<job_id>/events')
+def ai_move_events(job_id):
+    """Server-Sent Events stream of an AI move's progress, ending with its result."""
+    job = ai_runner.get(job_id)
+    if job is None or job.game is not g.session.game:
+        return jsonify({'error': 'Unknown job'}), 404
     
-    # Get the last moves for display
-    last_move = None
-    if game.board.move_history:
-        last_row, last_col, player = game.board.move_history[-1]
-        last_move = [last_row, last_col]  # Send as array for consistency
+    def events():
+        while True:
+            finished = job.done.wait(PROGRESS_INTERVAL)
+            yield f"data: {json.dumps(_job_state(job))}\n\n"
+            if finished:
+                break
     
-    return jsonify({
-        'board': game.board.board.tolist(),
-        'current_player': game.current_player.type.value,
-        'game_over': game.game_over,
-        'winner': game.winner.type.value if game.winner else None,
-        'time_remaining': {
-            'black': game.get_time_remaining(game.human_player),
-            'white': game.get_time_remaining(game.ai_player)
-        },
-        'last_move': last_move,
-        'ai_score': game.ai.last_score if hasattr(game.ai, 'last_score') else None
-    })
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+def _job_state(job) -> dict:
+    result = job.to_dict()
+    if 'state' in result:
+        result['state']['ai_score'] = job.game.ai.last_score
+    return result
 
 @app.route('/game_state')
 def game_state():
-    return jsonify(game.get_game_state())
+    return jsonify(g.session.game.get_game_state())
 
 @app.route('/restart', methods=['POST'])
 def restart():
-    global game
-    game = Game()  # Initialize with default config values
-    return jsonify(game.get_game_state())
+    with g.session.lock:
+        if g.session.job is not None:
+            ai_runner.cancel(g.session.job)
+        sessions.restart(g.session)
+        return jsonify(g.session.game.get_game_state())
+
+@app.route('/metrics')
+def metrics():
+    """AI move, admission, queue and session metrics in the Prometheus text format."""
+    ai = ai_runner.get_stats()
+    session_stats = sessions.get_stats()
+    lines = []
+    for name, kind, help_text, value in [
+            ('gomoku_jobs_submitted_total', 'counter', 'AI moves admitted to the queue', ai['submitted']),
+            ('gomoku_jobs_rejected_total', 'counter', 'AI moves refused with a full queue', ai['rejected']),
+            ('gomoku_jobs_completed_total', 'counter', 'AI moves played', ai['completed']),
+            ('gomoku_jobs_failed_total', 'counter', 'AI moves that failed', ai['failed']),
+            ('gomoku_jobs_running', 'gauge', 'AI moves being searched', ai['running']),
+            ('gomoku_queue_depth', 'gauge', 'AI moves waiting for a worker', ai['queue_depth']),
+            ('gomoku_queue_capacity', 'gauge', 'Queue length at which moves are refused', ai['queue_capacity']),
+            ('gomoku_queue_peak_depth', 'gauge', 'Longest queue seen', ai['peak_queue_depth']),
+            ('gomoku_queue_wait_seconds_avg', 'gauge', 'Average time a move waited for a worker', ai['avg_wait']),
+            ('gomoku_workers', 'gauge', 'AI worker threads', ai['workers']),
+            ('gomoku_sessions_active', 'gauge', 'Games in memory', session_stats['active']),
+            ('gomoku_sessions_capacity', 'gauge', 'Games the server keeps at most', session_stats['capacity']),
+            ('gomoku_sessions_created_total', 'counter', 'Games started', session_stats['created']),
+            ('gomoku_sessions_evicted_total', 'counter', 'Games dropped after idling', session_stats['evicted'])]:
+        lines += format_metric(name, kind, help_text, [({}, value)])
+    body = move_metrics.render() + '\n'.join(lines) + '\n'
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/metrics.json')
+def metrics_json():
+    """The admission, queue and session counters as JSON."""
+    return jsonify({'ai': ai_runner.get_stats(), 'sessions': sessions.get_stats()})
 
 def open_browser():
     webbrowser.open_new('http://127.0.0.1:5000/')